@@ -2,7 +2,8 @@
 gcm.analysis
 ============
 Pipelines reprodutíveis para varreduras em ε, comparação com fronteiras analíticas,
-salvamento de CSVs e geração de figuras.
+salvamento de CSVs e geração de figuras (as funções `plot_*` vivem em
+`gcm.plotting` e só importam `matplotlib` quando usadas).
 
 Foco da Semana 1:
 - Reproduzir/verificar fronteiras de sincronização (teóricas) e detectar escape.
@@ -14,25 +15,68 @@ T_burn e T_meas devem ser ajustados conscientemente.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import functools
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
 
 import numpy as np
-import matplotlib.pyplot as plt
 
-from .core import Config, GloballyCoupledMaps
+from . import profiling as _profiling
+from .backends import get_backend
+from .core import Config, GloballyCoupledMaps, GloballyCoupledMapsBatch
 from .maps import sync_boundaries, escape_boundaries
-from .metrics import sigma as sigma_metric
+from .meanfield import MeanFieldDensity
+from .metrics import RunningStats
+from .profiling import profiling
+from .store import ResultsStore, open_store, result_key
+from .observers import (
+    EscapeObserver,
+    MagnetizationObserver,
+    PersistenceObserver,
+    SigmaObserver,
+    StopCriteria,
+    notify_start,
+    notify_update,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 __all__ = [
     "ScanResult",
     "theory_boundaries",
+    "spawn_seeds",
+    "point_seeds",
     "scan_eps",
+    "scan_eps_adaptive",
+    "scan_eps_meanfield",
+    "EnsembleResult",
+    "ENSEMBLE_QUANTITIES",
+    "scan_eps_ensemble",
     "save_scan_to_csv",
     "plot_sigma_vs_eps",
+    "PHASE_LABELS",
+    "PhaseDiagramResult",
+    "phase_diagram",
+    "RampResult",
+    "ramp",
+    "plot_phase_diagram",
+    "plot_spin_raster",
 ]
 
+# Rótulos de regime do diagrama (μ, ε), na ordem dos códigos inteiros
+PHASE_LABELS = ("sync_stat", "sync_chaos", "nonsync", "escape")
+PHASE_COLORS = {
+    "nonsync": "#e09f3e",
+    "sync_stat": "#335c67",
+    "sync_chaos": "#9fd356",
+    "escape": "#9e2a2b",
+}
+
 
 @dataclass
 class ScanResult:
@@ -61,6 +105,100 @@ class ScanResult:
     meta: Dict[str, Any]
 
 
+@dataclass
+class PhaseDiagramResult:
+    """Classificação de regimes em uma grade (μ, ε).
+
+    Atributos
+    ---------
+    mu_grid : np.ndarray, shape (M,)
+    eps_grid : np.ndarray, shape (K,)
+    labels : np.ndarray[str], shape (M, K)
+        Um de `PHASE_LABELS` por ponto.
+    codes : np.ndarray[int], shape (M, K)
+        Índice do rótulo em `PHASE_LABELS`.
+    sigma_mean : np.ndarray, shape (M, K)
+        σ̄ na janela de medição (NaN/inf em pontos que escaparam).
+    x_abs_final : np.ndarray, shape (M, K)
+        mean(|x|) no estado final (separa síncrono estacionário x→0 de caótico).
+    meta : dict
+        Metadados (N, T_burn, T_meas, init, seed_base, tol_sigma, tol_x0).
+    """
+
+    mu_grid: np.ndarray
+    eps_grid: np.ndarray
+    labels: np.ndarray
+    codes: np.ndarray
+    sigma_mean: np.ndarray
+    x_abs_final: np.ndarray
+    meta: Dict[str, Any]
+
+
+@dataclass
+class RampResult:
+    """Rampas de histerese ε↑ e ε↓ (protocolo do notebook 03).
+
+    Atributos
+    ---------
+    mu : float
+    eps_up, eps_down : np.ndarray, shape (K,)
+        Cronogramas de ε de cada ramo (`eps_down = eps_up[::-1]`).
+    up, down : dict[str, np.ndarray]
+        Métricas por degrau, cada uma com shape (K,) (ou (K, R) para R sementes):
+        - "sigma_bar": σ̄ na janela de medição;
+        - "M_bar": |<M>| na janela de medição;
+        - "p_rampa": persistência acumulada desde o início do ramo;
+        - "p_janela": persistência apenas dentro da janela de medição;
+        - "x_final_mean_abs": mean(|x|) ao fim do degrau;
+        - "escaped_frac": fração de sítios com |x| > 1 ao fim do degrau.
+    meta : dict
+        Metadados (N, T_burn_block, T_meas_block, init, seed).
+    """
+
+    mu: float
+    eps_up: np.ndarray
+    eps_down: np.ndarray
+    up: Dict[str, np.ndarray]
+    down: Dict[str, np.ndarray]
+    meta: Dict[str, Any]
+
+
+# Grandezas medidas por realização em `scan_eps_ensemble`
+ENSEMBLE_QUANTITIES = ("sigma_bar", "M_bar", "escaped_frac", "persistence")
+
+
+@dataclass
+class EnsembleResult:
+    """Varredura em ε com várias realizações (sementes) por ponto e barras de erro.
+
+    Atributos
+    ---------
+    mu : float
+    eps_grid : np.ndarray, shape (K,)
+    n_seeds : np.ndarray[int], shape (K,)
+        Realizações simuladas por ponto.
+    mean, std, ci : dict[str, np.ndarray]
+        Por grandeza de `ENSEMBLE_QUANTITIES`, shape (K,): média entre realizações,
+        desvio padrão amostral e meia-largura do intervalo de confiança da média.
+        "sigma_bar", "M_bar" (|<M>|) e "persistence" usam só realizações sem
+        escape; "escaped_frac" usa todas.
+    converged : np.ndarray[bool], shape (K,)
+        True se o ponto parou por atingir a largura alvo (False = `max_seeds`).
+    meta : dict
+        Metadados (N, T_burn, T_meas, init, seed_base, confidence, ci_atol,
+        ci_rtol, targets, min_seeds, batch_size, max_seeds, n_rounds, n_escaped).
+    """
+
+    mu: float
+    eps_grid: np.ndarray
+    n_seeds: np.ndarray
+    mean: Dict[str, np.ndarray]
+    std: Dict[str, np.ndarray]
+    ci: Dict[str, np.ndarray]
+    converged: np.ndarray
+    meta: Dict[str, Any]
+
+
 def theory_boundaries(mu: float) -> dict:
     """Coleta as fronteiras teóricas úteis para sobreposição em gráficos.
 
@@ -86,6 +224,203 @@ def _ensure_parent(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+def spawn_seeds(seed_base: int | Sequence[int] | None, K: int) -> List[int | None]:
+    """Deriva K sementes independentes de `seed_base` via `np.random.SeedSequence.spawn`.
+
+    Diferente de `seed_base + k`, varreduras com `seed_base` distintos não
+    compartilham sementes. Cada semente é um inteiro de 64 bits (serializável em
+    `Config`/metadados). `seed_base` pode ser uma sequência de inteiros (entropia
+    composta, p.ex. `[seed_base, rodada]`). Com `seed_base=None`, devolve K vezes
+    None (entropia do SO).
+    """
+    if seed_base is None:
+        return [None] * K
+    entropy = int(seed_base) if np.isscalar(seed_base) else [int(v) for v in seed_base]
+    children = np.random.SeedSequence(entropy).spawn(K)
+    return [int(c.generate_state(1, dtype=np.uint64)[0]) for c in children]
+
+
+def _point_entropy(seed_base: int, mu: float, eps: float) -> List[int]:
+    """Entropia `[seed_base, bits(μ), bits(ε)]` de um ponto (bits do float64; -0.0 vira 0.0)."""
+    bits = np.array([mu, eps], dtype=np.float64) + 0.0
+    return [int(seed_base), *(int(b) for b in bits.view(np.uint64))]
+
+
+def point_seeds(seed_base: int | None, mu: float, eps_values: Sequence[float]) -> List[int | None]:
+    """Semente de cada ponto (μ, ε) derivada de `SeedSequence([seed_base, μ, ε])`.
+
+    A semente depende só de `seed_base` e dos parâmetros do ponto, não da posição
+    na grade: refinar ou estender uma grade reaproveita os pontos já medidos (no
+    `store`/checkpoint) e pontos iguais de varreduras diferentes coincidem. Com
+    `seed_base=None`, devolve None (entropia do SO) para cada ponto.
+    """
+    if seed_base is None:
+        return [None] * len(eps_values)
+    return [
+        int(np.random.SeedSequence(_point_entropy(seed_base, mu, eps)).generate_state(1, dtype=np.uint64)[0])
+        for eps in eps_values
+    ]
+
+
+def _scan_point(task: tuple) -> tuple[float, float, str, int]:
+    """Mede um ponto ε (função de nível de módulo para poder ir a processos filhos).
+
+    Retorna (σ̄, fração de escape, razão de término, passos executados).
+    """
+    mu, eps, N, seed, init, T_burn, T_meas, backend, stop, dtype = task
+    cfg = Config(N=N, eps=float(eps), mu=float(mu), seed=seed, dtype=dtype)
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset(init="half_half" if init == "half_half" else "uniform")
+    # Burn-in + medição (σ_t e escape por passo)
+    be = get_backend(backend)
+    prof = _profiling._ACTIVE
+    if prof is None:
+        sigma_bar, escaped_frac = be.burn_and_measure(sys, T_burn, T_meas, stop)
+    else:
+        with prof.timer("scan_eps.measure"):
+            sigma_bar, escaped_frac = be.burn_and_measure(sys, T_burn, T_meas, stop)
+        if be.name != "numpy":  # laço compilado: sem `step` para contar
+            prof.count("steps", sys.last_run_steps)
+    reason = sys.last_stop_reason or "completed"
+    return float(sigma_bar), float(escaped_frac), reason, int(sys.last_run_steps)
+
+
+def _scan_point_profiled(task: tuple) -> tuple[tuple, dict]:
+    """`_scan_point` sob um `Profiler` próprio (também em processos filhos)."""
+    with profiling() as prof:
+        with prof.timer("scan_eps.point"):
+            res = _scan_point(task)
+    return res, prof.report()
+
+
+def _run_scan_points(tasks: list, n_workers: int | None, executor: Executor | None) -> list:
+    """`_scan_point` em todas as tarefas; com instrumentação ativa, junta os relatórios."""
+    prof = _profiling._ACTIVE
+    if prof is None:
+        return _map_points(_scan_point, tasks, n_workers, executor)
+    out = _map_points(_scan_point_profiled, tasks, n_workers, executor)
+    for _, rep in out:
+        prof.merge(rep)
+    return [res for res, _ in out]
+
+
+def _map_points(fn, tasks: list, n_workers: int | None, executor: Executor | None) -> list:
+    """Executa `fn` nas tarefas, em série ou num pool de processos.
+
+    A ordem do resultado segue a de `tasks`, independentemente do escalonamento.
+    `fn` deve ser uma função de nível de módulo (picklável).
+    """
+    if executor is not None:
+        return list(executor.map(fn, tasks))
+    if n_workers is not None and n_workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(tasks) // (4 * n_workers))
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            return list(pool.map(fn, tasks, chunksize=chunksize))
+    return [fn(t) for t in tasks]
+
+
+def _scan_point_record(task: tuple) -> tuple[Config, dict]:
+    """(Config, parâmetros do protocolo) de uma tarefa de `_scan_point`, para o store."""
+    mu, eps, N, seed, init, T_burn, T_meas, backend, stop, dtype = task
+    cfg = Config(N=N, eps=float(eps), mu=float(mu), seed=seed, dtype=dtype)
+    params = dict(
+        T_burn=T_burn, T_meas=T_meas, init=init, backend=backend,
+        stop=None if stop is None else asdict(stop),
+    )
+    return cfg, params
+
+
+def _scan_points(
+    tasks: list,
+    n_workers: int | None,
+    executor: Executor | None,
+    store: ResultsStore | None,
+) -> tuple[list, int]:
+    """`_scan_point` em todas as tarefas, reaproveitando resultados de `store`.
+
+    Só os pontos ausentes são simulados (e então gravados). Pontos com semente
+    None não são reprodutíveis e nunca passam pelo store.
+
+    Retorna (resultados na ordem de `tasks`, nº de pontos lidos do store).
+    """
+    if store is None:
+        return _run_scan_points(tasks, n_workers, executor), 0
+    prof = _profiling._ACTIVE
+    t0 = time.perf_counter()
+    records = [_scan_point_record(t) for t in tasks]
+    keys = [None if cfg.seed is None else result_key("scan_eps_point", cfg, params) for cfg, params in records]
+    found = store.get_many(k for k in keys if k is not None)
+    if prof is not None:
+        prof.add_time("scan_eps.store", time.perf_counter() - t0)
+    out: list = [None] * len(tasks)
+    missing = []
+    for i, key in enumerate(keys):
+        if key in found:
+            v = found[key]["values"]
+            out[i] = (float(v["sigma_mean"]), float(v["escaped_frac"]), v["stop_reason"], int(v["steps_run"]))
+        else:
+            missing.append(i)
+    computed = _run_scan_points([tasks[i] for i in missing], n_workers, executor)
+    t0 = time.perf_counter()
+    for i, res in zip(missing, computed):
+        out[i] = res
+        if keys[i] is not None:
+            cfg, params = records[i]
+            values = dict(sigma_mean=res[0], escaped_frac=res[1], stop_reason=res[2], steps_run=res[3])
+            store.put("scan_eps_point", cfg, params, values)
+    if prof is not None:
+        prof.add_time("scan_eps.store", time.perf_counter() - t0)
+    return out, len(tasks) - len(missing)
+
+
+def _load_scan_checkpoint(path: Path, signature: dict) -> Dict[int, tuple]:
+    """Itens já concluídos de um checkpoint de varredura ({} se o arquivo não existe).
+
+    Levanta ValueError se o checkpoint for de outra varredura (assinatura diferente).
+    """
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data["signature"] != json.loads(json.dumps(signature)):
+        raise ValueError(f"checkpoint {path} pertence a outra varredura (parâmetros diferentes).")
+    return {int(i): tuple(v) for i, v in data["done"].items()}
+
+
+def _save_scan_checkpoint(path: Path, signature: dict, done: Dict[int, tuple]) -> None:
+    """Grava o checkpoint de forma atômica (arquivo temporário + rename)."""
+    t0 = time.perf_counter()
+    _ensure_parent(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(signature=signature, done={str(i): list(v) for i, v in sorted(done.items())}), f)
+    os.replace(tmp, path)
+    if _profiling._ACTIVE is not None:
+        _profiling._ACTIVE.add_time("scan_eps.checkpoint", time.perf_counter() - t0)
+
+
+def _profiled_driver(name: str):
+    """Com `gcm.profiling.profiling()` ativo, mede o driver num `Profiler` próprio,
+    anexa o relatório em `meta["profile"]` e soma tudo ao profiler externo."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            parent = _profiling._ACTIVE
+            if parent is None:
+                return fn(*args, **kwargs)
+            with profiling(track_alloc=parent.track_alloc) as prof:
+                with prof.timer(name):
+                    res = fn(*args, **kwargs)
+            parent.merge(prof)
+            res.meta["profile"] = prof.report()
+            return res
+        return wrapper
+    return deco
+
+
+@_profiled_driver("scan_eps")
 def scan_eps(
     mu: float,
     eps_grid: np.ndarray,
@@ -96,11 +431,19 @@ def scan_eps(
     init: str = "half_half",
     seed_base: int | None = 12345,
     tol_sync: float = 1e-7,
+    backend: str = "numpy",
+    n_workers: int | None = None,
+    executor: Executor | None = None,
+    stop: StopCriteria | None = None,
+    store: ResultsStore | str | Path | None = None,
+    checkpoint: str | Path | None = None,
+    checkpoint_every: int = 10,
+    dtype: str = "float64",
 ) -> ScanResult:
     """Varre ε e mede <σ>, escape e sincronização para μ fixo.
 
-    Procedimento (para cada ε):
-    - Cria sistema GCM(N, ε, μ).
+    Procedimento (para cada ε, de forma independente):
+    - Cria sistema GCM(N, ε, μ) com a semente `point_seeds(seed_base, μ, [ε])`.
     - reset(init="half_half") (exige 1 < |μ| < 2) ou "uniform".
     - Roda T_burn passos sem registrar.
     - Roda T_meas passos medindo σ_t e se houve escape.
@@ -120,43 +463,89 @@ def scan_eps(
     init : {"half_half", "uniform"}, padrão "half_half"
         Modo de ICs.
     seed_base : int | None, padrão 12345
-        Semente base; variamos por índice de ε para reprodutibilidade.
+        Semente base; cada ε recebe a semente de `SeedSequence([seed_base, μ, ε])`
+        (ver `point_seeds`), independente da posição na grade. O resultado é
+        idêntico bit a bit para qualquer `n_workers`/ordem de execução.
     tol_sync : float, padrão 1e-7
         Limiar para marcar sincronização via σ̄.
+    backend : str, padrão "numpy"
+        Backend do laço burn-in + medição (ver `gcm.backends`). "numba" roda o
+        laço inteiro compilado; sem `numba` instalado, cai para "numpy".
+    n_workers : int | None, padrão None
+        Se > 1, distribui os pontos ε entre `n_workers` processos
+        (`ProcessPoolExecutor`). None/1 roda em série.
+    executor : concurrent.futures.Executor | None, padrão None
+        Executor externo (tem precedência sobre `n_workers`), p.ex. um pool reutilizado.
+    stop : gcm.observers.StopCriteria | None, padrão None
+        Parada antecipada por ponto (sincronizado, estacionário ou escapado). Os
+        passos de medição restantes são preenchidos analiticamente
+        (`gcm.backends.fill_after_stop`); pontos escapados ficam com σ̄ = NaN.
+    store : gcm.store.ResultsStore | str | Path | None, padrão None
+        Repositório de resultados (ou caminho do SQLite). Pontos já medidos com a
+        mesma configuração/protocolo/versão são lidos dele; os demais são
+        simulados e gravados.
+    checkpoint : str | Path | None, padrão None
+        Arquivo JSON de progresso. Os pontos concluídos são gravados (de forma
+        atômica) a cada `checkpoint_every` pontos; se o arquivo já existe, a
+        varredura retoma dele e só simula os pontos restantes. Como cada ponto tem
+        semente própria, o resultado retomado é idêntico bit a bit ao contínuo.
+        Um checkpoint de outra varredura (parâmetros diferentes) levanta ValueError.
+    checkpoint_every : int, padrão 10
+        Pontos por lote entre gravações do checkpoint.
+    dtype : {"float64", "float32"}, padrão "float64"
+        Precisão do estado (ver `Config.dtype`). Em float32, σ̄ de estados
+        sincronizados fica no piso de arredondamento (≲ 2e-7, tipicamente ~2e-8)
+        em vez de ~1e-17: use `tol_sync` >= 1e-6 nesse modo.
 
     Retorna
     -------
     ScanResult
-        Estrutura com arrays por ε e metadados.
+        Estrutura com arrays por ε e metadados. `meta["stop_reason"]` traz, por ε,
+        "completed", "synced", "stationary" ou "escaped"; `meta["steps_run"]`, os
+        passos efetivamente simulados; `meta["store_hits"]`, os pontos lidos do store;
+        `meta["resumed_points"]`, os pontos lidos do checkpoint. Com
+        `gcm.profiling.profiling()` ativo, `meta["profile"]` traz o relatório de
+        tempos da varredura.
     """
     eps_grid = np.asarray(eps_grid, dtype=float)
     K = eps_grid.size
 
-    sigma_mean_arr = np.empty(K, dtype=float)
-    escaped_frac_arr = np.empty(K, dtype=float)
-    is_synced_arr = np.empty(K, dtype=bool)
+    be = get_backend(backend)
+    seeds = point_seeds(seed_base, mu, eps_grid)
+    init = "half_half" if init == "half_half" else "uniform"
+    dtype = np.dtype(dtype).name
 
-    for k, eps in enumerate(eps_grid):
-        seed = None if seed_base is None else (int(seed_base) + k)
-        cfg = Config(N=N, eps=float(eps), mu=float(mu), seed=seed)
-        sys = GloballyCoupledMaps(cfg)
-        sys.reset(init="half_half" if init == "half_half" else "uniform")
-
-        # Burn-in
-        sys.run(T_burn, track=False)
-
-        # Medição
-        escaped_count = 0
-        sigmas = np.empty(T_meas, dtype=float)
-        for t in range(T_meas):
-            sys.step()
-            sigmas[t] = sigma_metric(sys.x)
-            if sys.last_escaped_mask is not None and sys.last_escaped_mask.any():
-                escaped_count += 1
-
-        sigma_mean_arr[k] = float(sigmas.mean())
-        escaped_frac_arr[k] = escaped_count / float(T_meas)
-        is_synced_arr[k] = sigma_mean_arr[k] < tol_sync
+    tasks = [(mu, eps, N, seed, init, T_burn, T_meas, be.name, stop, dtype) for eps, seed in zip(eps_grid, seeds)]
+    done: Dict[int, tuple] = {}
+    if checkpoint is not None:
+        if checkpoint_every <= 0:
+            raise ValueError("checkpoint_every deve ser positivo.")
+        checkpoint = Path(checkpoint)
+        signature = dict(
+            mu=float(mu), eps_grid=eps_grid.tolist(), N=N, T_burn=T_burn, T_meas=T_meas, init=init,
+            seeds=seeds, backend=be.name, stop=None if stop is None else asdict(stop), dtype=dtype,
+        )
+        done = _load_scan_checkpoint(checkpoint, signature)
+    resumed = len(done)
+    pending = [i for i in range(K) if i not in done]
+    chunk = len(pending) if checkpoint is None else checkpoint_every
+    hits = 0
+    st = open_store(store)
+    try:
+        for a in range(0, len(pending), max(chunk, 1)):
+            idx = pending[a:a + chunk]
+            res, n_hit = _scan_points([tasks[i] for i in idx], n_workers, executor, st)
+            hits += n_hit
+            done.update(zip(idx, res))
+            if checkpoint is not None:
+                _save_scan_checkpoint(checkpoint, signature, done)
+    finally:
+        if st is not None and st is not store:
+            st.close()
+    out = [done[i] for i in range(K)]
+    sigma_mean_arr = np.array([o[0] for o in out], dtype=float)
+    escaped_frac_arr = np.array([o[1] for o in out], dtype=float)
+    is_synced_arr = sigma_mean_arr < tol_sync
 
     meta = dict(
         N=N,
@@ -165,6 +554,15 @@ def scan_eps(
         init=init,
         seed_base=seed_base,
         tol_sync=tol_sync,
+        backend=be.name,
+        seeds=seeds,
+        n_workers=n_workers,
+        stop=None if stop is None else asdict(stop),
+        stop_reason=[o[2] for o in out],
+        steps_run=[o[3] for o in out],
+        store_hits=hits,
+        resumed_points=resumed,
+        dtype=dtype,
     )
     return ScanResult(
         mu=float(mu),
@@ -176,6 +574,563 @@ def scan_eps(
     )
 
 
+def scan_eps_meanfield(
+    mu: float,
+    eps_grid: np.ndarray,
+    *,
+    T_burn: int = 2_000,
+    T_meas: int = 2_000,
+    init: str = "half_half",
+    n_bins: int = 3_000,
+    tol_sync: float | None = None,
+    escape_tol: float = 1e-12,
+) -> ScanResult:
+    """Curva de referência N → ∞ de `scan_eps`, via `gcm.meanfield.MeanFieldDensity`.
+
+    Mesmo protocolo (burn-in + medição) aplicado à densidade, com custo
+    independente de N e sem sementes.
+
+    Parâmetros
+    ----------
+    mu : float
+    eps_grid : np.ndarray, shape (K,)
+    T_burn, T_meas : int, padrão 2000
+    init : {"half_half", "uniform"}, padrão "half_half"
+    n_bins : int, padrão 3000
+        Resolução da densidade (múltiplo de 6).
+    tol_sync : float | None, padrão None
+        Limiar de sincronização. None deriva o limiar da difusão numérica do
+        esquema: com contração transversa c = |1 - ε|·μ por passo, a largura
+        estacionária de um estado sincronizado é ~ (h/√12)/√(1 - c²), e o limiar
+        é 3·(h/√12)/√max(1 - c², h) para c < 1 (2·h/√12 para c ≥ 1, onde a
+        sincronização é instável).
+    escape_tol : float, padrão 1e-12
+        Massa de escape por passo acima da qual o passo conta como "com escape".
+
+    Retorna
+    -------
+    ScanResult
+        `escaped_frac` é a fração de passos de medição com escape; `meta` traz
+        "engine"="meanfield", "n_bins", "tol_sync" (limiar por ε), "M_mean"
+        (M médio por ε) e "escape_mass" (massa total perdida por ε).
+    """
+    eps_grid = np.asarray(eps_grid, dtype=float)
+    K = eps_grid.size
+    sigma_mean_arr = np.empty(K)
+    escaped_frac_arr = np.empty(K)
+    M_mean = np.empty(K)
+    escape_mass = np.empty(K)
+    floor = 0.0
+    for k, eps in enumerate(eps_grid):
+        mf = MeanFieldDensity(eps=float(eps), mu=mu, n_bins=n_bins)
+        mf.reset(init=init)
+        floor = mf.sigma_floor
+        if T_burn > 0:
+            mf.run(T_burn)
+        series = mf.run(T_meas, track=True)
+        with np.errstate(invalid="ignore"):
+            sigma_mean_arr[k] = np.mean(series["sigma"])
+            M_mean[k] = np.mean(series["M"])
+        escaped_frac_arr[k] = np.mean(series["escape_mass"] > escape_tol)
+        escape_mass[k] = mf.escape_mass
+    if tol_sync is None:
+        # difusão numérica: var* ≈ (h²/12)/(1 - c²) perto da borda da banda (c → 1)
+        c = np.abs(1.0 - eps_grid) * abs(mu)
+        h = 2.0 / (-(-n_bins // 6) * 6)
+        tol_sync = np.where(c < 1.0, 3.0 * floor / np.sqrt(np.maximum(1.0 - c**2, h)), 2.0 * floor)
+
+    meta = dict(
+        engine="meanfield",
+        T_burn=T_burn,
+        T_meas=T_meas,
+        init=init,
+        n_bins=int(-(-n_bins // 6) * 6),
+        tol_sync=np.broadcast_to(np.asarray(tol_sync, dtype=float), (K,)).copy(),
+        M_mean=M_mean,
+        escape_mass=escape_mass,
+    )
+    return ScanResult(
+        mu=float(mu),
+        eps_grid=eps_grid,
+        sigma_mean=sigma_mean_arr,
+        escaped_frac=escaped_frac_arr,
+        is_synced=sigma_mean_arr < tol_sync,
+        meta=meta,
+    )
+
+
+@_profiled_driver("scan_eps_adaptive")
+def scan_eps_adaptive(
+    mu: float,
+    eps_min: float,
+    eps_max: float,
+    N: int,
+    *,
+    n_initial: int = 9,
+    eps_tol: float = 1e-3,
+    sigma_jump: float = 0.1,
+    max_points: int = 200,
+    T_burn: int = 2_000,
+    T_meas: int = 2_000,
+    init: str = "half_half",
+    seed_base: int | None = 12345,
+    tol_sync: float = 1e-7,
+    backend: str = "numpy",
+    n_workers: int | None = None,
+    executor: Executor | None = None,
+    stop: StopCriteria | None = None,
+    store: ResultsStore | str | Path | None = None,
+    checkpoint: str | Path | None = None,
+    checkpoint_every: int = 10,
+    dtype: str = "float64",
+) -> ScanResult:
+    """Varredura adaptativa em ε: grade grossa + refino por bissecção nas transições.
+
+    Procedimento:
+    - Grade inicial: `linspace(eps_min, eps_max, n_initial)` mais, para cada fronteira
+      de `sync_boundaries(μ)`/`escape_boundaries(μ)` dentro do intervalo, os pontos
+      b ± h/2 (h = espaçamento da grade), que já nascem como colchetes da transição.
+    - A cada rodada, um intervalo [ε_a, ε_b] entre pontos vizinhos é refinado (ponto
+      médio) se tiver largura > `eps_tol` e:
+        * `is_synced` muda entre as pontas; ou
+        * "houve escape" (`escaped_frac > 0`) muda entre as pontas; ou
+        * |Δσ̄| > `sigma_jump` · (amplitude de σ̄ já observada).
+    - Termina quando nenhum intervalo precisa de refino ou `max_points` é atingido.
+
+    Cada ponto é medido exatamente como em `scan_eps` (mesmo backend/protocolo e
+    mesma semente `point_seeds(seed_base, μ, [ε])`), então pontos já medidos por
+    `scan_eps` ou por outra rodada são lidos do `store`.
+
+    Parâmetros
+    ----------
+    mu : float
+    eps_min, eps_max : float
+        Intervalo de ε.
+    N : int
+    n_initial : int, padrão 9
+        Pontos da grade grossa.
+    eps_tol : float, padrão 1e-3
+        Largura final desejada para os colchetes de transição.
+    sigma_jump : float, padrão 0.1
+        Variação relativa de σ̄ que dispara refino.
+    max_points : int, padrão 200
+        Orçamento máximo de simulações.
+    T_burn, T_meas, init, seed_base, tol_sync, backend, n_workers, executor, stop, store, dtype
+        Como em `scan_eps`.
+    checkpoint, checkpoint_every
+        Como em `scan_eps`. Ao retomar, as rodadas são refeitas na mesma ordem e
+        só os pontos ausentes do checkpoint são simulados, então o resultado é
+        idêntico ao da execução contínua.
+
+    Retorna
+    -------
+    ScanResult
+        Pontos ordenados por ε. `meta["transitions"]` lista os colchetes
+        (ε_a, ε_b, tipo) com tipo ∈ {"sync", "escape", "sigma"}; `meta["n_rounds"]`
+        e `meta["n_points"]` registram o custo; `meta["resumed_points"]`, os pontos
+        lidos do checkpoint.
+    """
+    if eps_max <= eps_min:
+        raise ValueError("eps_max deve ser maior que eps_min.")
+    if n_initial < 2:
+        raise ValueError("n_initial deve ser >= 2.")
+    be = get_backend(backend)
+    init = "half_half" if init == "half_half" else "uniform"
+    dtype = np.dtype(dtype).name
+
+    h = (eps_max - eps_min) / (n_initial - 1)
+    grid = list(np.linspace(eps_min, eps_max, n_initial))
+    bounds = theory_boundaries(mu)
+    for b in (*bounds["eps_sync"], *bounds["eps_escape"]):
+        for e in (b - h / 2, b + h / 2):
+            if eps_min < e < eps_max:
+                grid.append(e)
+
+    points: Dict[float, tuple] = {}
+    # checkpoint: {ordem de conclusão: (ε, *resultado)}; `saved` guarda os pontos de uma execução anterior
+    done: Dict[int, tuple] = {}
+    if checkpoint is not None:
+        if checkpoint_every <= 0:
+            raise ValueError("checkpoint_every deve ser positivo.")
+        checkpoint = Path(checkpoint)
+        signature = dict(
+            mu=float(mu), eps_min=float(eps_min), eps_max=float(eps_max), N=N, n_initial=n_initial,
+            eps_tol=eps_tol, sigma_jump=sigma_jump, max_points=max_points, T_burn=T_burn, T_meas=T_meas,
+            init=init, seed_base=seed_base, tol_sync=tol_sync, backend=be.name,
+            stop=None if stop is None else asdict(stop), dtype=dtype,
+        )
+        done = _load_scan_checkpoint(checkpoint, signature)
+    saved = {float(v[0]): tuple(v[1:]) for v in done.values()}
+    st = open_store(store)
+    hits = 0
+    resumed = 0
+
+    def _evaluate(eps_values: list) -> None:
+        nonlocal hits, resumed
+        eps_values = [float(e) for e in eps_values if float(e) not in points]
+        eps_values = eps_values[: max(0, max_points - len(points))]
+        for e in [e for e in eps_values if e in saved]:
+            points[e] = saved[e]
+            resumed += 1
+        eps_values = [e for e in eps_values if e not in points]
+        chunk = len(eps_values) if checkpoint is None else checkpoint_every
+        for a in range(0, len(eps_values), max(chunk, 1)):
+            part = eps_values[a:a + chunk]
+            seeds = point_seeds(seed_base, mu, part)
+            tasks = [(mu, e, N, seed, init, T_burn, T_meas, be.name, stop, dtype) for e, seed in zip(part, seeds)]
+            results, n_hit = _scan_points(tasks, n_workers, executor, st)
+            hits += n_hit
+            for e, res in zip(part, results):
+                points[e] = res
+                done[len(done)] = (e, *res)
+            if checkpoint is not None:
+                _save_scan_checkpoint(checkpoint, signature, done)
+
+    def _flag(a: tuple, b: tuple, sigma_scale: float) -> str | None:
+        # escape primeiro: pontos escapados podem ter σ̄ = NaN (parada antecipada)
+        if (a[1] > 0.0) != (b[1] > 0.0):
+            return "escape"
+        if (a[0] < tol_sync) != (b[0] < tol_sync):
+            return "sync"
+        if np.isfinite(a[0]) and np.isfinite(b[0]) and abs(a[0] - b[0]) > sigma_jump * sigma_scale:
+            return "sigma"
+        return None
+
+    try:
+        level = 0
+        _evaluate(grid)
+        transitions: list = []
+        while True:
+            eps_sorted = sorted(points)
+            sig = np.array([points[e][0] for e in eps_sorted])
+            finite = sig[np.isfinite(sig)]
+            sigma_scale = float(finite.max() - finite.min()) if finite.size else 0.0
+            transitions = []
+            to_refine = []
+            for ea, eb in zip(eps_sorted[:-1], eps_sorted[1:]):
+                kind = _flag(points[ea], points[eb], sigma_scale)
+                if kind is None:
+                    continue
+                transitions.append((ea, eb, kind))
+                if eb - ea > eps_tol:
+                    to_refine.append(0.5 * (ea + eb))
+            if not to_refine or len(points) >= max_points:
+                break
+            level += 1
+            _evaluate(to_refine)
+    finally:
+        if st is not None and st is not store:
+            st.close()
+
+    eps_grid = np.array(sorted(points), dtype=float)
+    sigma_mean_arr = np.array([points[e][0] for e in eps_grid], dtype=float)
+    escaped_frac_arr = np.array([points[e][1] for e in eps_grid], dtype=float)
+    meta = dict(
+        N=N,
+        T_burn=T_burn,
+        T_meas=T_meas,
+        init=init,
+        seed_base=seed_base,
+        tol_sync=tol_sync,
+        backend=be.name,
+        n_workers=n_workers,
+        adaptive=True,
+        eps_tol=eps_tol,
+        sigma_jump=sigma_jump,
+        transitions=transitions,
+        n_rounds=level + 1,
+        n_points=len(points),
+        stop=None if stop is None else asdict(stop),
+        stop_reason=[points[e][2] for e in eps_grid],
+        steps_run=[points[e][3] for e in eps_grid],
+        store_hits=hits,
+        resumed_points=resumed,
+        dtype=dtype,
+    )
+    return ScanResult(
+        mu=float(mu),
+        eps_grid=eps_grid,
+        sigma_mean=sigma_mean_arr,
+        escaped_frac=escaped_frac_arr,
+        is_synced=sigma_mean_arr < tol_sync,
+        meta=meta,
+    )
+
+
+def _ensemble_block(task: tuple) -> np.ndarray:
+    """Simula B realizações de um ponto ε num lote (B, N).
+
+    Retorna array (B, 4) com as grandezas de `ENSEMBLE_QUANTITIES` por
+    realização; em realizações que escaparam, σ̄, M̄ e persistência são NaN.
+    """
+    mu, eps, N, seeds, init, T_burn, T_meas, dtype = task
+    batch = GloballyCoupledMapsBatch(N=N, eps=eps, mu=mu, seeds=seeds, dtype=dtype)
+    batch.reset(init=init)
+    sig, mag, esc, per = SigmaObserver(), MagnetizationObserver(), EscapeObserver(), PersistenceObserver()
+    with np.errstate(over="ignore", invalid="ignore"):
+        batch.run(T_burn + T_meas, discard=T_burn, observers=[sig, mag, esc, per])
+        escaped = (np.atleast_1d(esc.escaped_steps) > 0) | ~np.isfinite(batch.x).all(axis=1)
+    out = np.column_stack([
+        np.atleast_1d(sig.mean), np.atleast_1d(mag.order_param), np.atleast_1d(esc.frac), np.atleast_1d(per.p),
+    ]).astype(float)
+    out[escaped, 0] = out[escaped, 1] = out[escaped, 3] = np.nan
+    return out
+
+
+@_profiled_driver("scan_eps_ensemble")
+def scan_eps_ensemble(
+    mu: float,
+    eps_grid: np.ndarray,
+    N: int,
+    *,
+    T_burn: int = 2_000,
+    T_meas: int = 2_000,
+    init: str = "half_half",
+    seed_base: int | None = 12345,
+    targets: Sequence[str] = ("sigma_bar",),
+    ci_atol: float = 1e-3,
+    ci_rtol: float = 0.05,
+    confidence: float = 0.95,
+    min_seeds: int = 8,
+    batch_size: int = 8,
+    max_seeds: int = 128,
+    n_workers: int | None = None,
+    executor: Executor | None = None,
+    dtype: str = "float64",
+) -> EnsembleResult:
+    """Varre ε com realizações sequenciais por ponto até o IC atingir a largura alvo.
+
+    Cada ponto ε roda primeiro `min_seeds` realizações; a cada rodada seguinte,
+    só os pontos ainda não resolvidos recebem mais `batch_size` realizações
+    (um lote `GloballyCoupledMapsBatch` por ponto, em paralelo entre pontos).
+    Média e variância de cada grandeza são mantidas online (`RunningStats`).
+    Um ponto para quando, para toda grandeza em `targets`,
+
+        meia-largura do IC <= max(ci_atol, ci_rtol·|média|),
+
+    ou ao chegar a `max_seeds`. Assim o custo se concentra nos pontos ruidosos
+    (perto das transições); pontos sincronizados (σ̄ ≈ 0 em todas as sementes)
+    param em `min_seeds`. Uma grandeza sem amostras finitas (todas as
+    realizações escaparam) não impede a parada.
+
+    Parâmetros
+    ----------
+    mu : float
+    eps_grid : np.ndarray, shape (K,)
+    N : int
+    T_burn, T_meas : int, padrão 2000
+    init : {"half_half", "uniform"}, padrão "half_half"
+    seed_base : int | None, padrão 12345
+        A realização j do ponto ε usa `spawn_seeds([seed_base, μ, ε], max_seeds)[j]`
+        (μ e ε pelos bits do float64), logo os valores por realização não dependem
+        da grade, de `batch_size`, da ordem nem de `n_workers`.
+    targets : sequência de str, padrão ("sigma_bar",)
+        Grandezas (de `ENSEMBLE_QUANTITIES`) cujo IC decide a parada.
+    ci_atol, ci_rtol : float, padrão 1e-3 e 0.05
+        Meia-largura alvo absoluta e relativa à média.
+    confidence : float, padrão 0.95
+        Nível do IC (t de Student).
+    min_seeds : int, padrão 8
+        Realizações iniciais por ponto (>= 4).
+    batch_size : int, padrão 8
+        Realizações acrescentadas por rodada a cada ponto não resolvido.
+    max_seeds : int, padrão 128
+    n_workers, executor
+        Como em `scan_eps` (paralelismo entre pontos ε de uma rodada).
+    dtype : {"float64", "float32"}, padrão "float64"
+
+    Retorna
+    -------
+    EnsembleResult
+    """
+    eps_grid = np.atleast_1d(np.asarray(eps_grid, dtype=float))
+    K = eps_grid.size
+    targets = tuple(targets)
+    unknown = [q for q in targets if q not in ENSEMBLE_QUANTITIES]
+    if unknown:
+        raise ValueError(f"targets desconhecidos: {unknown}; disponíveis: {ENSEMBLE_QUANTITIES}")
+    if min_seeds < 4 or batch_size <= 0 or max_seeds < min_seeds:
+        raise ValueError("exige min_seeds >= 4, batch_size > 0 e max_seeds >= min_seeds.")
+    init = "half_half" if init == "half_half" else "uniform"
+    dtype = np.dtype(dtype).name
+    seeds = [spawn_seeds(None if seed_base is None else _point_entropy(seed_base, mu, eps), max_seeds) for eps in eps_grid]
+    cols = [ENSEMBLE_QUANTITIES.index(q) for q in targets]
+
+    stats = [RunningStats(len(ENSEMBLE_QUANTITIES)) for _ in range(K)]
+    n = np.zeros(K, dtype=np.int64)
+    n_escaped = np.zeros(K, dtype=np.int64)
+    converged = np.zeros(K, dtype=bool)
+    active = list(range(K))
+    n_rounds = 0
+    while active:
+        tasks = []
+        for k in active:
+            b = min(min_seeds if n[k] == 0 else batch_size, max_seeds - n[k])
+            tasks.append((float(mu), float(eps_grid[k]), N, seeds[k][n[k]:n[k] + b], init, T_burn, T_meas, dtype))
+        for k, block in zip(active, _map_points(_ensemble_block, tasks, n_workers, executor)):
+            stats[k].update(block)
+            n[k] += block.shape[0]
+            n_escaped[k] += int(np.isnan(block[:, 0]).sum())
+            h = stats[k].ci_halfwidth(confidence)[cols]
+            m = stats[k].mean[cols]
+            empty = stats[k].n[cols] == 0
+            converged[k] = bool(np.all(empty | (h <= np.maximum(ci_atol, ci_rtol * np.abs(m)))))
+        active = [k for k in active if not converged[k] and n[k] < max_seeds]
+        n_rounds += 1
+
+    def per_point(values) -> Dict[str, np.ndarray]:
+        arr = np.array(values, dtype=float)
+        return {q: arr[:, i] for i, q in enumerate(ENSEMBLE_QUANTITIES)}
+
+    meta = dict(
+        N=N,
+        T_burn=T_burn,
+        T_meas=T_meas,
+        init=init,
+        seed_base=seed_base,
+        targets=list(targets),
+        ci_atol=ci_atol,
+        ci_rtol=ci_rtol,
+        confidence=confidence,
+        min_seeds=min_seeds,
+        batch_size=batch_size,
+        max_seeds=max_seeds,
+        n_rounds=n_rounds,
+        n_escaped=n_escaped.tolist(),
+        n_workers=n_workers,
+        dtype=dtype,
+    )
+    return EnsembleResult(
+        mu=float(mu),
+        eps_grid=eps_grid,
+        n_seeds=n,
+        mean=per_point([np.where(st.n > 0, st.mean, np.nan) for st in stats]),
+        std=per_point([np.sqrt(st.var) for st in stats]),
+        ci=per_point([st.ci_halfwidth(confidence) for st in stats]),
+        converged=converged,
+        meta=meta,
+    )
+
+
+def ramp(
+    mu: float,
+    eps_schedule: np.ndarray,
+    N: int,
+    *,
+    T_burn_block: int = 5_000,
+    T_meas_block: int = 5_000,
+    init: str = "half_half",
+    seed: int | Sequence[int] | None = 31415,
+    store: ResultsStore | str | Path | None = None,
+) -> RampResult:
+    """Rampas de histerese ε↑ e ε↓ (protocolo do notebook 03) sem recriar sistemas.
+
+    O ramo ε↑ percorre `eps_schedule` a partir da condição inicial (`seed`) e o
+    ramo ε↓ continua do estado final do ramo ε↑, percorrendo `eps_schedule[::-1]`
+    (metaestabilidade preservada). Em cada degrau:
+    - ε é trocado in-place (`set_eps`), preservando o estado;
+    - T_burn_block passos de transiente, depois T_meas_block passos de medição;
+    - σ̄, |<M>| e p_janela são medidos por observadores na janela de medição;
+    - p_rampa usa um bitset acumulado desde o início do ramo (burn-in incluso),
+      com referência nos spins do primeiro passo de cada ramo.
+
+    Com uma sequência de sementes, as R realizações rodam juntas em um lote
+    (R, N). Memória O(R·N).
+
+    Parâmetros
+    ----------
+    mu : float
+    eps_schedule : np.ndarray, shape (K,)
+        Cronograma crescente do ramo ε↑.
+    N : int
+    T_burn_block, T_meas_block : int, padrão 5000
+        Passos de transiente e de medição por degrau.
+    init : {"half_half", "uniform"}, padrão "half_half"
+    seed : int | Sequence[int] | None, padrão 31415
+        Semente da condição inicial; uma sequência roda uma realização por semente.
+    store : gcm.store.ResultsStore | str | Path | None, padrão None
+        Como em `scan_eps` (protocolo "ramp", chave inclui o cronograma inteiro).
+
+    Retorna
+    -------
+    RampResult
+        Métricas com shape (K,) para semente escalar e (K, R) para uma sequência.
+    """
+    eps_up = np.asarray(eps_schedule, dtype=float)
+    eps_down = eps_up[::-1].copy()
+    if T_meas_block <= 0 or T_burn_block < 0:
+        raise ValueError("T_meas_block deve ser positivo e T_burn_block não negativo.")
+    batched = seed is not None and not isinstance(seed, (int, np.integer))
+    seeds = [None if s is None else int(s) for s in seed] if batched else [seed]
+    meta = dict(N=N, T_burn_block=T_burn_block, T_meas_block=T_meas_block, init=init, seed=seeds if batched else seed)
+
+    st = open_store(store) if all(s is not None for s in seeds) else None
+    cfg = Config(N=N, eps=float(eps_up[0]), mu=float(mu), seed=None if batched else seed)
+    params = dict(T_burn_block=T_burn_block, T_meas_block=T_meas_block, init=init, eps_schedule=eps_up)
+    if batched:
+        params["seeds"] = seeds
+    try:
+        rec = st.get(result_key("ramp", cfg, params)) if st is not None else None
+        if rec is not None:
+            arrays = rec["arrays"]
+            return RampResult(
+                mu=float(mu),
+                eps_up=eps_up,
+                eps_down=eps_down,
+                up={k[3:]: v for k, v in arrays.items() if k.startswith("up_")},
+                down={k[5:]: v for k, v in arrays.items() if k.startswith("down_")},
+                meta=dict(meta, store_hits=1),
+            )
+        up, down = _ramp_run(mu, eps_up, eps_down, N, T_burn_block, T_meas_block, init, seeds)
+        if not batched:
+            up, down = ({k: v[:, 0].copy() for k, v in d.items()} for d in (up, down))
+        result = RampResult(mu=float(mu), eps_up=eps_up, eps_down=eps_down, up=up, down=down, meta=dict(meta, store_hits=0))
+        if st is not None:
+            arrays = {**{f"up_{k}": v for k, v in result.up.items()}, **{f"down_{k}": v for k, v in result.down.items()}}
+            st.put("ramp", cfg, params, {}, arrays)
+        return result
+    finally:
+        if st is not None and st is not store:
+            st.close()
+
+
+def _ramp_run(mu, eps_up, eps_down, N, T_burn_block, T_meas_block, init, seeds) -> tuple[dict, dict]:
+    """Simulação de `ramp` (sem consulta ao store); métricas com shape (K, R)."""
+    batch = GloballyCoupledMapsBatch(N=N, eps=eps_up[0], mu=mu, seeds=seeds)
+    batch.reset(init=init)
+    keys = ("sigma_bar", "M_bar", "p_rampa", "p_janela", "x_final_mean_abs", "escaped_frac")
+
+    def run_branch(schedule: np.ndarray) -> dict:
+        p_ramp = PersistenceObserver()
+        p_ramp.start(batch.x)
+        out = {k: np.empty((schedule.size, batch.R), dtype=float) for k in keys}
+        for k, eps in enumerate(schedule):
+            batch.set_eps(eps)
+            for _ in range(T_burn_block):
+                batch.step()
+                p_ramp.update(batch.x, batch.last_escaped_mask)
+
+            window = [SigmaObserver(), MagnetizationObserver(), PersistenceObserver()]
+            notify_start(window, batch.x)
+            for _ in range(T_meas_block):
+                batch.step()
+                p_ramp.update(batch.x, batch.last_escaped_mask)
+                notify_update(window, batch.x, batch.last_escaped_mask)
+
+            sig, mag, p_win = window
+            out["sigma_bar"][k] = sig.mean
+            out["M_bar"][k] = mag.order_param
+            out["p_rampa"][k] = p_ramp.p
+            out["p_janela"][k] = p_win.p
+            out["x_final_mean_abs"][k] = np.abs(batch.x).mean(axis=1)
+            out["escaped_frac"][k] = (~(np.abs(batch.x) <= 1.0)).mean(axis=1)
+        return out
+
+    up = run_branch(eps_up)
+    # ε↓ continua do topo do ramo ε↑ (mesmo lote, estado preservado)
+    return up, run_branch(eps_down)
+
+
 def save_scan_to_csv(result: ScanResult, path: str | Path) -> Path:
     """Salva o resultado de `scan_eps` em CSV com colunas amigáveis.
 
@@ -220,57 +1175,188 @@ def save_scan_to_csv(result: ScanResult, path: str | Path) -> Path:
     return path
 
 
-def plot_sigma_vs_eps(
-    result: ScanResult,
+def _phase_row(task: tuple) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Simula uma linha μ do diagrama (todos os ε de uma vez em um lote)."""
+    mu, eps_grid, N, seeds, init, T_burn, T_meas = task
+    batch = GloballyCoupledMapsBatch(N=N, eps=eps_grid, mu=mu, seeds=seeds)
+    batch.reset(init=init)
+    sig = SigmaObserver()
+    esc = EscapeObserver()
+    with np.errstate(over="ignore", invalid="ignore"):
+        batch.run(T_burn + T_meas, discard=T_burn, observers=[sig, esc])
+        x_abs_final = np.abs(batch.x).mean(axis=1)
+    escaped = (esc.escaped_steps > 0) | ~np.isfinite(batch.x).all(axis=1)
+    return sig.mean, x_abs_final, escaped
+
+
+def phase_diagram(
+    mu_grid: np.ndarray,
+    eps_grid: np.ndarray,
+    N: int,
     *,
-    outpath: str | Path | None = None,
-    show: bool = False,
-) -> Path | None:
-    """Gera o gráfico σ̄(ε) com linhas verticais nas fronteiras teóricas.
+    T_burn: int = 1_000,
+    T_meas: int = 1_000,
+    init: str = "uniform",
+    seed_base: int | None = 10_000,
+    tol_sigma: float = 1e-3,
+    tol_x0: float = 1e-2,
+    n_workers: int | None = None,
+    executor: Executor | None = None,
+    store: ResultsStore | str | Path | None = None,
+    checkpoint: str | Path | None = None,
+    checkpoint_every: int = 4,
+) -> PhaseDiagramResult:
+    """Classifica pontos (μ, ε) em `sync_stat` / `sync_chaos` / `nonsync` / `escape`.
+
+    Versão de biblioteca do `classify_point` do notebook 02, sem trajetórias:
+    - cada linha μ roda todos os ε juntos em um `GloballyCoupledMapsBatch`;
+    - σ̄ e escape são medidos por observadores (memória O(K·N));
+    - as linhas μ podem rodar em paralelo (`n_workers`/`executor`).
+
+    Regras (na ordem):
+    - "escape": algum |x_i| > 1 durante a medição, ou estado final não finito;
+    - "sync_stat": σ̄ < tol_sigma e mean(|x_final|) < tol_x0 (x → 0);
+    - "sync_chaos": σ̄ < tol_sigma;
+    - "nonsync": caso contrário.
 
     Parâmetros
     ----------
-    result : ScanResult
-    outpath : str | Path | None, padrão None
-        Se fornecido, salva a figura em `outpath`. Diretórios pais serão criados.
-    show : bool, padrão False
-        Se True, exibe a figura (bloqueante em alguns ambientes locais).
+    mu_grid : np.ndarray, shape (M,)
+    eps_grid : np.ndarray, shape (K,)
+    N : int
+    T_burn, T_meas : int, padrão 1000
+    init : {"uniform", "half_half"}, padrão "uniform"
+        "half_half" exige 1 < |μ| < 2 em toda a grade.
+    seed_base : int | None, padrão 10000
+        Semente de cada ponto via `point_seeds(seed_base, μ, [ε])` (não depende da grade).
+    tol_sigma : float, padrão 1e-3
+    tol_x0 : float, padrão 1e-2
+    n_workers, executor
+        Como em `scan_eps` (paralelismo por linha μ).
+    store : gcm.store.ResultsStore | str | Path | None, padrão None
+        Como em `scan_eps` (protocolo "phase_point"); cada linha μ simula só os ε
+        ausentes do store.
+    checkpoint : str | Path | None, padrão None
+        Como em `scan_eps`, com granularidade de linha μ: as linhas concluídas são
+        gravadas a cada `checkpoint_every` linhas e, ao retomar, só as restantes
+        são simuladas. Um checkpoint de outro diagrama levanta ValueError.
+    checkpoint_every : int, padrão 4
+        Linhas μ por lote entre gravações do checkpoint.
 
     Retorna
     -------
-    Path | None
-        Caminho salvo, se `outpath` não for None.
+    PhaseDiagramResult
+        `meta["store_hits"]` conta os pontos lidos do store e
+        `meta["resumed_rows"]`, as linhas μ lidas do checkpoint.
     """
-    bounds = theory_boundaries(result.mu)
-    eps_sync_inf, eps_sync_sup = bounds["eps_sync"]
-    eps_esc_low, eps_esc_high = bounds["eps_escape"]
-
-    fig, ax = plt.subplots(figsize=(7.5, 4.5))
-    ax.plot(result.eps_grid, result.sigma_mean, marker="o", lw=1.5, ms=4, label=r"$\overline{\sigma}$")
-    ax.set_xlabel(r"$\varepsilon$")
-    ax.set_ylabel(r"$\overline{\sigma}$")
-    ax.grid(True, alpha=0.25)
-
-    # Linhas de referência (sincronização e escape)
-    for x, ls, lab in [
-        (eps_sync_inf, "--", "sync (inf)"),
-        (eps_sync_sup, "--", "sync (sup)"),
-        (eps_esc_low, ":", "escape (low)"),
-        (eps_esc_high, ":", "escape (high)"),
-    ]:
-        if np.isfinite(x):
-            ax.axvline(x, linestyle=ls, alpha=0.7, label=lab)
-
-    ax.legend(loc="best", frameon=True)
-
-    saved_path: Path | None = None
-    if outpath is not None:
-        saved_path = Path(outpath)
-        _ensure_parent(saved_path)
-        fig.tight_layout()
-        fig.savefig(saved_path, dpi=200)
-    if show:
-        plt.show()
-    plt.close(fig)
-    return saved_path
+    mu_grid = np.atleast_1d(np.asarray(mu_grid, dtype=float))
+    eps_grid = np.atleast_1d(np.asarray(eps_grid, dtype=float))
+    M, K = mu_grid.size, eps_grid.size
+    seeds = [seed for mu in mu_grid for seed in point_seeds(seed_base, mu, eps_grid)]
+
+    sigma_mean = np.empty((M, K), dtype=float)
+    x_abs_final = np.empty((M, K), dtype=float)
+    escaped = np.zeros((M, K), dtype=bool)
+    todo = np.ones((M, K), dtype=bool)
+    keys: Dict[tuple, str] = {}
+    params = dict(T_burn=T_burn, T_meas=T_meas, init=init)
+    done: Dict[int, tuple] = {}
+    if checkpoint is not None:
+        if checkpoint_every <= 0:
+            raise ValueError("checkpoint_every deve ser positivo.")
+        checkpoint = Path(checkpoint)
+        signature = dict(
+            mu_grid=mu_grid.tolist(), eps_grid=eps_grid.tolist(), N=N, T_burn=T_burn, T_meas=T_meas,
+            init=init, seeds=seeds,
+        )
+        done = _load_scan_checkpoint(checkpoint, signature)
+        for i, (sig, xabs, esc) in done.items():
+            sigma_mean[i], x_abs_final[i], escaped[i] = sig, xabs, esc
+            todo[i] = False
+    resumed = len(done)
+    st = open_store(store)
+    try:
+        if st is not None:
+            for i, mu in enumerate(mu_grid):
+                if i in done:
+                    continue
+                for j, eps in enumerate(eps_grid):
+                    seed = seeds[i * K + j]
+                    if seed is not None:
+                        keys[i, j] = result_key("phase_point", Config(N, float(eps), float(mu), seed), params)
+            found = st.get_many(keys.values())
+            for (i, j), key in keys.items():
+                if key in found:
+                    v = found[key]["values"]
+                    sigma_mean[i, j], x_abs_final[i, j], escaped[i, j] = v["sigma_mean"], v["x_abs_final"], v["escaped"]
+                    todo[i, j] = False
+        hits = int((~todo).sum()) - resumed * K
+
+        row_ids = [i for i in range(M) if i not in done]
+        chunk = len(row_ids) if checkpoint is None else checkpoint_every
+        for a in range(0, len(row_ids), max(chunk, 1)):
+            ids = [i for i in row_ids[a:a + chunk] if todo[i].any()]
+            tasks = [
+                (float(mu_grid[i]), eps_grid[todo[i]], N,
+                 [seeds[i * K + j] for j in np.flatnonzero(todo[i])], init, T_burn, T_meas)
+                for i in ids
+            ]
+            for i, (sig, xabs, esc) in zip(ids, _map_points(_phase_row, tasks, n_workers, executor)):
+                cols = np.flatnonzero(todo[i])
+                sigma_mean[i, cols], x_abs_final[i, cols], escaped[i, cols] = sig, xabs, esc
+                for j in cols:
+                    if (i, j) in keys:
+                        cfg = Config(N, float(eps_grid[j]), float(mu_grid[i]), seeds[i * K + j])
+                        values = dict(sigma_mean=sigma_mean[i, j], x_abs_final=x_abs_final[i, j], escaped=escaped[i, j])
+                        st.put("phase_point", cfg, params, values)
+            if checkpoint is not None:
+                done.update(
+                    (i, (sigma_mean[i].tolist(), x_abs_final[i].tolist(), escaped[i].tolist()))
+                    for i in row_ids[a:a + chunk]
+                )
+                _save_scan_checkpoint(checkpoint, signature, done)
+    finally:
+        if st is not None and st is not store:
+            st.close()
+
+    codes = np.full((M, K), PHASE_LABELS.index("nonsync"), dtype=np.int8)
+    with np.errstate(invalid="ignore"):
+        synced = sigma_mean < tol_sigma
+    codes[synced] = PHASE_LABELS.index("sync_chaos")
+    codes[synced & (x_abs_final < tol_x0)] = PHASE_LABELS.index("sync_stat")
+    codes[escaped] = PHASE_LABELS.index("escape")
+    labels = np.asarray(PHASE_LABELS)[codes]
+
+    meta = dict(
+        N=N,
+        T_burn=T_burn,
+        T_meas=T_meas,
+        init=init,
+        seed_base=seed_base,
+        tol_sigma=tol_sigma,
+        tol_x0=tol_x0,
+        n_workers=n_workers,
+        store_hits=hits,
+        resumed_rows=resumed,
+    )
+    return PhaseDiagramResult(
+        mu_grid=mu_grid,
+        eps_grid=eps_grid,
+        labels=labels,
+        codes=codes,
+        sigma_mean=sigma_mean,
+        x_abs_final=x_abs_final,
+        meta=meta,
+    )
+
+
+_PLOTTING = ("plot_sigma_vs_eps", "plot_phase_diagram", "plot_spin_raster")
+
+
+def __getattr__(name: str):
+    # gráficos sob demanda: importar gcm.analysis não carrega matplotlib
+    if name in _PLOTTING:
+        from . import plotting
 
+        return getattr(plotting, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
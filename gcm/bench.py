@@ -0,0 +1,341 @@
+"""
+gcm.bench
+=========
+Benchmarks do motor, das métricas e dos drivers de varredura, com saída JSON e
+comparação contra uma linha de base (detecção de regressões).
+
+Casos (cada um medido para N ∈ `N_grid` e T passos):
+- "bistable_map": `bistable_map(x, mu, out=buf)` (chamadas/s);
+- "step": `GloballyCoupledMaps.step()` (passos/s);
+- "run": `run(T)` sem registro; "run_tracked": `run(T, track=True)` (passos/s);
+- "scan_eps": `scan_eps` com 4 pontos ε e T_burn = T_meas = T/2 (passos/s somados);
+- "spins", "magnetization": uma chamada por estado (chamadas/s);
+- "persistence_curve": série de spins (T, N) (linhas/s).
+
+Casos que materializam (T, N) usam T' = min(T, 2**24 // N) linhas (≤ 128 MB em
+float64); o T efetivo fica no registro. O tempo é o melhor de `repeats`
+execuções; o pico de memória vem de `tracemalloc` (alocações do NumPy incluídas)
+numa execução extra, já aquecida (não conta a preparação nem buffers reutilizados).
+
+Uso
+---
+    python -m gcm.bench run -o bench/baseline.json
+    python -m gcm.bench run -o bench/new.json --quick
+    python -m gcm.bench compare bench/baseline.json bench/new.json --threshold 0.2
+
+`compare` termina com código 1 se algum caso ficou mais lento que a linha de base
+por mais de `threshold` (fração da taxa).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from . import __version__
+
+__all__ = [
+    "CASES",
+    "DEFAULT_N_GRID",
+    "run_benchmarks",
+    "save_results",
+    "load_results",
+    "compare_results",
+    "unmatched_results",
+    "main",
+]
+
+DEFAULT_N_GRID = (256, 4_096, 65_536, 1_000_000)
+QUICK_N_GRID = (256, 4_096)
+_MAX_TRACK_ELEMS = 1 << 24
+
+_MU, _EPS = 1.9, 0.3
+
+
+def _track_T(N: int, T: int) -> int:
+    return max(1, min(T, _MAX_TRACK_ELEMS // N))
+
+
+def _system(N: int):
+    from .core import Config, GloballyCoupledMaps
+
+    sys_ = GloballyCoupledMaps(Config(N=N, eps=_EPS, mu=_MU, seed=0))
+    sys_.reset(init="half_half")
+    return sys_
+
+
+# Cada preparação recebe (N, T) e devolve (função sem argumentos, T efetivo, unidades, nome da unidade).
+def _bench_bistable_map(N: int, T: int):
+    from .maps import bistable_map
+
+    x = np.random.default_rng(0).uniform(-1.0, 1.0, N)
+    out = np.empty_like(x)
+
+    def fn():
+        for _ in range(T):
+            bistable_map(x, _MU, out=out)
+
+    return fn, T, T, "calls/s"
+
+
+def _bench_step(N: int, T: int):
+    sys_ = _system(N)
+
+    def fn():
+        for _ in range(T):
+            sys_.step()
+
+    return fn, T, T, "steps/s"
+
+
+def _bench_run(N: int, T: int):
+    sys_ = _system(N)
+    return (lambda: sys_.run(T)), T, T, "steps/s"
+
+
+def _bench_run_tracked(N: int, T: int):
+    sys_ = _system(N)
+    T = _track_T(N, T)
+    return (lambda: sys_.run(T, track=True)), T, T, "steps/s"
+
+
+def _bench_scan_eps(N: int, T: int):
+    from .analysis import scan_eps
+
+    grid = np.linspace(0.2, 1.1, 4)
+    T_half = max(1, T // 2)
+
+    def fn():
+        scan_eps(_MU, grid, N, T_burn=T_half, T_meas=T_half, seed_base=0)
+
+    return fn, T, grid.size * 2 * T_half, "steps/s"
+
+
+def _bench_spins(N: int, T: int):
+    from .metrics import spins
+
+    x = _system(N).x
+
+    def fn():
+        for _ in range(T):
+            spins(x)
+
+    return fn, T, T, "calls/s"
+
+
+def _bench_magnetization(N: int, T: int):
+    from .metrics import magnetization
+
+    x = _system(N).x
+
+    def fn():
+        for _ in range(T):
+            magnetization(x)
+
+    return fn, T, T, "calls/s"
+
+
+def _bench_persistence_curve(N: int, T: int):
+    from .metrics import persistence_curve, spins
+
+    T = _track_T(N, T)
+    S = spins(_system(N).run(T, track=True)).astype(np.int8)
+    return (lambda: persistence_curve(S)), T, T, "rows/s"
+
+
+CASES: Dict[str, Callable[[int, int], Tuple[Callable[[], Any], int, int, str]]] = {
+    "bistable_map": _bench_bistable_map,
+    "step": _bench_step,
+    "run": _bench_run,
+    "run_tracked": _bench_run_tracked,
+    "scan_eps": _bench_scan_eps,
+    "spins": _bench_spins,
+    "magnetization": _bench_magnetization,
+    "persistence_curve": _bench_persistence_curve,
+}
+
+
+def _measure(setup, N: int, T: int, repeats: int) -> Dict[str, Any]:
+    fn, T_eff, units, unit = setup(N, T)
+    fn()  # aquecimento (compilação, caches, páginas)
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return dict(
+        N=int(N), T=int(T_eff), seconds=best, rate=units / best if best > 0 else float("inf"),
+        unit=unit, peak_mb=peak / 2**20,
+    )
+
+
+def run_benchmarks(
+    N_grid: Sequence[int] = DEFAULT_N_GRID,
+    T: int = 200,
+    *,
+    cases: Sequence[str] | None = None,
+    repeats: int = 3,
+    progress: Callable[[str], None] | None = None,
+) -> Dict[str, Any]:
+    """Roda os casos de `CASES` para cada N e devolve um dict serializável em JSON.
+
+    Parâmetros
+    ----------
+    N_grid : sequência de int, padrão (256, 4096, 65536, 10**6)
+    T : int, padrão 200
+        Passos (ou chamadas) por medição.
+    cases : sequência de str | None
+        Subconjunto de `CASES` (None = todos).
+    repeats : int, padrão 3
+        Repetições cronometradas (vale a melhor).
+    progress : callable | None
+        Recebe uma linha de texto por caso concluído.
+
+    Retorna
+    -------
+    dict
+        {"meta": {...}, "results": [{"case", "N", "T", "seconds", "rate", "unit", "peak_mb"}, ...]}
+    """
+    if T <= 0 or repeats <= 0:
+        raise ValueError("T e repeats devem ser positivos.")
+    names = list(CASES) if cases is None else list(cases)
+    unknown = [c for c in names if c not in CASES]
+    if unknown:
+        raise ValueError(f"casos desconhecidos: {unknown}; disponíveis: {list(CASES)}")
+    results: List[Dict[str, Any]] = []
+    for name in names:
+        for N in N_grid:
+            rec = dict(case=name, **_measure(CASES[name], int(N), int(T), repeats))
+            results.append(rec)
+            if progress is not None:
+                progress(f"{name:>18s}  N={rec['N']:>8d}  T={rec['T']:>5d}  "
+                         f"{rec['rate']:12.1f} {rec['unit']:<8s} {rec['peak_mb']:8.1f} MB")
+    meta = dict(
+        gcm_version=__version__, numpy=np.__version__, python=platform.python_version(),
+        platform=platform.platform(), machine=platform.machine(), created=time.time(),
+        N_grid=[int(n) for n in N_grid], T=int(T), repeats=int(repeats),
+    )
+    return dict(meta=meta, results=results)
+
+
+def save_results(results: Dict[str, Any], path: str | Path) -> Path:
+    """Grava o resultado de `run_benchmarks` em JSON (cria diretórios)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return path
+
+
+def load_results(path: str | Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.2,
+) -> List[Dict[str, Any]]:
+    """Compara taxas caso a caso (pares com o mesmo caso, N e T).
+
+    Parâmetros
+    ----------
+    baseline, current : dict
+        Saídas de `run_benchmarks` (ou `load_results`).
+    threshold : float, padrão 0.2
+        Queda relativa de taxa tolerada (0.2 = até 20% mais lento).
+
+    Retorna
+    -------
+    list[dict]
+        Um registro por par comparável: case, N, T, base_rate, rate, ratio
+        (rate/base_rate), regression (bool) e peak_mb/base_peak_mb.
+    """
+    base = {(r["case"], r["N"], r["T"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        b = base.get((r["case"], r["N"], r["T"]))
+        if b is None:
+            continue
+        ratio = r["rate"] / b["rate"] if b["rate"] > 0 else float("inf")
+        rows.append(dict(
+            case=r["case"], N=r["N"], T=r["T"], base_rate=b["rate"], rate=r["rate"], ratio=ratio,
+            regression=bool(ratio < 1.0 - threshold), peak_mb=r["peak_mb"], base_peak_mb=b["peak_mb"],
+        ))
+    return rows
+
+
+def unmatched_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, List[tuple]]:
+    """Pares (caso, N, T) sem correspondente, ignorados por `compare_results`.
+
+    Retorna
+    -------
+    dict
+        "missing": da linha de base, ausentes na execução atual (p.ex. `--quick`
+        contra uma base completa); "new": só na execução atual.
+    """
+    base = {(r["case"], r["N"], r["T"]) for r in baseline["results"]}
+    cur = {(r["case"], r["N"], r["T"]) for r in current["results"]}
+    return dict(missing=sorted(base - cur), new=sorted(cur - base))
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI: `python -m gcm.bench {run,compare} ...`."""
+    parser = argparse.ArgumentParser(prog="python -m gcm.bench", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_run = sub.add_parser("run", help="roda os benchmarks e grava JSON")
+    p_run.add_argument("-o", "--out", required=True, help="arquivo JSON de saída")
+    p_run.add_argument("--N", type=int, nargs="+", default=None, help="tamanhos (padrão: 256 ... 1e6)")
+    p_run.add_argument("--T", type=int, default=200)
+    p_run.add_argument("--repeats", type=int, default=3)
+    p_run.add_argument("--cases", nargs="+", default=None, choices=list(CASES))
+    p_run.add_argument("--quick", action="store_true", help="N ∈ {256, 4096}, T=50")
+
+    p_cmp = sub.add_parser("compare", help="compara com uma linha de base")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "run":
+        N_grid = args.N or (QUICK_N_GRID if args.quick else DEFAULT_N_GRID)
+        T = 50 if args.quick and args.T == 200 else args.T
+        res = run_benchmarks(N_grid, T, cases=args.cases, repeats=args.repeats, progress=print)
+        print(f"gravado em {save_results(res, args.out)}")
+        return 0
+
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    rows = compare_results(baseline, current, args.threshold)
+    for r in rows:
+        flag = "REGRESSÃO" if r["regression"] else "ok"
+        print(f"{r['case']:>18s}  N={r['N']:>8d}  T={r['T']:>5d}  {r['ratio']:6.2f}x  {flag}")
+    unmatched = unmatched_results(baseline, current)
+    for label, keys in (("AUSENTE", unmatched["missing"]), ("sem base", unmatched["new"])):
+        for case, N, T in keys:
+            print(f"{case:>18s}  N={N:>8d}  T={T:>5d}  {'':>7s}  {label}")
+    n_reg = sum(r["regression"] for r in rows)
+    print(
+        f"{len(rows)} casos comparados, {n_reg} regressões (limiar {args.threshold:.0%}), "
+        f"{len(unmatched['missing'])} ausentes da execução atual."
+    )
+    if not rows:
+        print("nenhum caso em comum com a linha de base (mesmos caso, N e T?).")
+    return 1 if n_reg or not rows or unmatched["missing"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
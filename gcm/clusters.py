@@ -0,0 +1,235 @@
+"""
+gcm.clusters
+============
+Representação comprimida por clusters para estados (parcialmente) sincronizados.
+
+Em vez de N valores, guarda K clusters com valor representativo `v_k` e
+multiplicidade `n_k`. Membros agrupados com tolerância `tol` guardam o desvio
+δ_i em relação ao representativo; como f é afim em cada ramo (quebras em ±1/3),
+o desvio evolui exatamente como δ ← (1 - ε) f'(v_k) δ enquanto o membro estiver no
+mesmo ramo que v_k. Assim cada passo custa O(K), não O(N):
+
+    Σ_i f(x_i) = Σ_k [n_k f(v_k) + f'(v_k) g_k S_k],
+
+com g_k o ganho acumulado do cluster e S_k = Σ δ_i (desvios de referência).
+
+- `compress()` reagrupa (O(N log N)): valores ligados por lacunas <= `tol`, sem
+  atravessar 0 ou ±1/3 e com largura total <= `tol`, viram um cluster;
+- a cada `merge_every` passos, clusters cujos representativos se aproximaram
+  (≤ tol) disparam `compress()` (teste O(K log K));
+- um cluster "se desfaz" quando seu maior desvio passa de `tol` ou pode cruzar
+  uma quebra (0, ±1/3); então o estado é expandido e reagrupado automaticamente.
+
+Com estados dessincronizados (K ≈ N) o custo é o de `GloballyCoupledMaps`; um
+estado de dois clusters custa O(1) por passo, qualquer que seja N.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Literal
+
+import numpy as np
+
+from .core import Config, GloballyCoupledMaps, _initial_state
+from .maps import _bistable_map_into
+
+__all__ = ["ClusteredMaps"]
+
+# quebras de f (ramos afins) e do sinal (spins)
+_BREAKS = np.array([-1.0 / 3.0, 0.0, 1.0 / 3.0])
+
+
+class ClusteredMaps:
+    """Mapas globalmente acoplados com estado comprimido em clusters.
+
+    Parâmetros
+    ----------
+    cfg : Config
+        Só `dtype="float64"` (os ganhos e desvios acumulados exigem precisão dupla).
+    tol : float, padrão 1e-12
+        Tolerância de agrupamento (maior largura de um cluster). Com `tol=0`, só
+        valores idênticos são agrupados.
+    merge_every : int, padrão 10
+        Intervalo (em passos) do teste de fusão de clusters.
+
+    Atributos
+    ---------
+    cfg : Config
+    rng : np.random.Generator
+    values : np.ndarray, shape (K,)
+        Valores representativos.
+    counts : np.ndarray[int64], shape (K,)
+        Multiplicidades (somam N).
+    labels : np.ndarray[int64], shape (N,)
+        Cluster de cada elemento.
+    n_compress : int
+        Número de reagrupamentos feitos (fusões + expansões).
+    last_escaped_count : int
+        Elementos com |x| > 1 após o último passo (pelo representativo).
+    """
+
+    def __init__(self, cfg: Config, *, tol: float = 1e-12, merge_every: int = 10):
+        if tol < 0:
+            raise ValueError("tol deve ser >= 0.")
+        if merge_every <= 0:
+            raise ValueError("merge_every deve ser positivo.")
+        if cfg.dtype != "float64":
+            raise ValueError("ClusteredMaps só suporta dtype='float64'.")
+        self.cfg = cfg
+        self.tol = float(tol)
+        self.merge_every = int(merge_every)
+        self.rng = np.random.default_rng(cfg.seed)
+        self.n_compress = 0
+        self.last_escaped_count = 0
+        self._t = 0
+        self._load(np.zeros(cfg.N, dtype=float))
+
+    @classmethod
+    def from_system(cls, sys: GloballyCoupledMaps, **kwargs) -> "ClusteredMaps":
+        """Comprime o estado atual de um `GloballyCoupledMaps` (mesmo `Config` e RNG)."""
+        obj = cls(sys.cfg, **kwargs)
+        obj.rng = sys.rng
+        obj._load(sys.x)
+        return obj
+
+    # ------------------------------------------------------------------ #
+
+    def _load(self, x: np.ndarray) -> None:
+        """Agrupa `x` (N,) em clusters; zera os ganhos."""
+        x = np.asarray(x, dtype=float)
+        if x.shape != (self.cfg.N,):
+            raise ValueError(f"x deve ter shape ({self.cfg.N},).")
+        order = np.argsort(x, kind="stable")
+        xs = x[order]
+        piece = np.searchsorted(_BREAKS, xs, side="right")
+        # grupos ligados por lacunas <= tol, sem atravessar 0/±1/3 ...
+        new = np.empty(xs.size, dtype=bool)
+        new[0] = True
+        new[1:] = (piece[1:] != piece[:-1]) | (np.diff(xs) > self.tol)
+        # ... e grupos mais largos que tol são quebrados em valores exatos
+        starts = np.flatnonzero(new)
+        ends = np.r_[starts[1:], xs.size] - 1
+        wide = np.repeat(xs[ends] - xs[starts] > self.tol, ends - starts + 1)
+        new[1:] |= wide[1:] & (xs[1:] != xs[:-1])
+        gid = np.cumsum(new) - 1
+        K = int(gid[-1]) + 1
+        counts = np.bincount(gid, minlength=K).astype(np.int64)
+        # representativo = menor valor do grupo (valores idênticos → desvios exatamente 0)
+        values = xs[np.flatnonzero(new)]
+        labels = np.empty_like(gid)
+        labels[order] = gid
+        offsets = x - values[labels]
+        self.values = values
+        self.counts = counts
+        self.labels = labels
+        self._offsets = offsets
+        self._gain = np.ones(K)
+        self._offsum = np.bincount(labels, weights=offsets, minlength=K)
+        self._offsq = np.bincount(labels, weights=offsets * offsets, minlength=K)
+        self._offmax = np.zeros(K)
+        np.maximum.at(self._offmax, labels, np.abs(offsets))
+
+    def compress(self) -> None:
+        """Expande o estado e reagrupa (fusões e quebras de clusters)."""
+        self._load(self.x)
+        self.n_compress += 1
+
+    # ------------------------------------------------------------------ #
+
+    @property
+    def x(self) -> np.ndarray:
+        """Estado expandido (N,) (nova cópia, custo O(N))."""
+        return self.values[self.labels] + self._offsets * self._gain[self.labels]
+
+    @property
+    def n_clusters(self) -> int:
+        return int(self.values.size)
+
+    def reset(
+        self,
+        init: Literal["half_half", "uniform"] = "half_half",
+        rng: np.random.Generator | None = None,
+    ) -> None:
+        """Mesmos modos e sorteios de `GloballyCoupledMaps.reset`, seguido de `compress`."""
+        self._load(_initial_state(self.cfg, init, self.rng if rng is None else rng))
+        self.last_escaped_count = 0
+
+    def set_eps(self, eps: float) -> None:
+        """Troca ε mantendo o estado (os desvios seguem exatos para qualquer ε)."""
+        self.cfg = replace(self.cfg, eps=float(eps))
+
+    # ------------------------------------------------------------------ #
+
+    @property
+    def mean(self) -> float:
+        """<x> em O(K)."""
+        g = self._gain
+        return float((self.counts @ self.values + g @ self._offsum) / self.cfg.N)
+
+    @property
+    def sigma(self) -> float:
+        """std(x) em O(K) (inclui os desvios dentro dos clusters)."""
+        N = self.cfg.N
+        g = self._gain
+        mean = (self.counts @ self.values + g @ self._offsum) / N
+        d = self.values - mean
+        ss = self.counts @ (d * d) + 2.0 * (d * g) @ self._offsum + (g * g) @ self._offsq
+        return float(np.sqrt(max(ss / N, 0.0)))
+
+    @property
+    def magnetization(self) -> float:
+        """M = (1/N) Σ s_i em O(K) (clusters nunca atravessam 0)."""
+        s = np.where(self.values < 0.0, -1, 1)
+        return float(self.counts @ s / self.cfg.N)
+
+    def _broken(self) -> bool:
+        """Algum cluster se desfez (desvio > tol ou pode cruzar 0/±1/3)?"""
+        dev = self._offmax * np.abs(self._gain)
+        if not np.any(dev > 0.0):
+            return False
+        if np.any(dev > max(self.tol, 0.0) * (1.0 + 1e-9)):
+            return True
+        dist = np.min(np.abs(self.values[:, None] - _BREAKS[None, :]), axis=1)
+        return bool(np.any((dev > 0.0) & (dist <= dev)))
+
+    def _should_merge(self) -> bool:
+        """Há clusters (no mesmo ramo) que caberiam juntos em largura <= tol?"""
+        K = self.values.size
+        if K < 2:
+            return False
+        order = np.argsort(self.values)
+        v = self.values[order]
+        dev = (self._offmax * np.abs(self._gain))[order]
+        piece = np.searchsorted(_BREAKS, v, side="right")
+        link = (np.diff(v) <= self.tol) & (piece[1:] == piece[:-1])
+        if not link.any():
+            return False
+        starts = np.flatnonzero(np.r_[True, ~link])
+        ends = np.r_[starts[1:], K] - 1
+        span = v[ends] - v[starts] + 2.0 * np.maximum.reduceat(dev, starts)
+        return bool(np.any((ends > starts) & (span <= self.tol)))
+
+    def step(self) -> None:
+        """Um passo em O(K): representativos, ganhos e média de f corrigida pelos desvios."""
+        eps, mu = self.cfg.eps, self.cfg.mu
+        v = self.values
+        fv = _bistable_map_into(v, mu, np.empty_like(v))
+        slope = np.where(np.abs(v) < 1.0 / 3.0, mu, -mu)
+        sum_f = self.counts @ fv + (slope * self._gain) @ self._offsum
+        mean_f = sum_f / self.cfg.N
+        self.values = (1.0 - eps) * fv + eps * mean_f
+        self._gain = (1.0 - eps) * slope * self._gain
+        self.last_escaped_count = int(self.counts[~(np.abs(self.values) <= 1.0)].sum())
+        self._t += 1
+        if self._broken():
+            self.compress()
+        elif self._t % self.merge_every == 0 and self._should_merge():
+            self.compress()
+
+    def run(self, T: int) -> None:
+        """Roda T passos (sem registro; use `x`, `sigma`, `magnetization` entre blocos)."""
+        if T <= 0:
+            raise ValueError("T deve ser positivo.")
+        for _ in range(T):
+            self.step()
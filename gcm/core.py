@@ -8,21 +8,48 @@ Atualização:
 
 Escolhas de projeto:
 - API clara com `Config` imutável (dataclass frozen).
-- Estado `x` em float64 para estabilidade numérica.
+- Estado `x` em float64 para estabilidade numérica; `Config(dtype="float32")` roda
+  estado, trajetórias e buffers das métricas em float32 (metade da banda de memória).
 - `reset` com modos de ICs (meio-a-meio em I_± ou uniforme em [-1,1]).
 - `step` e `run` vetorizados. `run` pode retornar a trajetória (track=True).
+- `step` atualiza `x` in-place com buffers pré-alocados (nenhuma alocação de
+  tamanho N por passo); a detecção de escape pode ser desligada.
+- O laço sem registro de `run` pode ser delegado a um backend (`gcm.backends`),
+  p.ex. o laço compilado "numba".
+- `run(..., observers=[...])` atualiza métricas online (`gcm.observers`) com
+  memória O(N), sem materializar a trajetória.
+- `set_eps`/`set_mu` trocam parâmetros in-place, preservando o estado (rampas de
+  histerese sem recriar o sistema).
+- `run(..., stop=StopCriteria(...))` interrompe a simulação ao sincronizar, ao
+  atingir um estado estacionário ou ao escapar (razão em `last_stop_reason`).
+- `run(..., recorder=...)` grava a trajetória direto em disco (`gcm.recorders`),
+  em `.npy` memory-mapped ou em blocos comprimidos.
+- `state_dict`/`load_state_dict` e `save`/`load` serializam o estado completo
+  (x, máscara de escape e estado do bit generator), para retomar execuções
+  longas com resultado idêntico bit a bit.
+- Instrumentação opcional (`gcm.profiling.profiling()`): tempos por fase de `step`
+  e de `run`; desligada, custa alguns testes `is not None` por passo (~0,1 µs).
+- `GloballyCoupledMapsBatch` evolui R realizações independentes (ε, μ, seed por
+  linha) como um único estado (R, N), com a média de f reduzida por linha.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Literal, Optional
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Literal, Optional, Sequence
 
 import numpy as np
 
-from .maps import bistable_map, bistable_intervals, _validate_mu
+from . import profiling as _profiling
+from .maps import _bistable_map_into, bistable_intervals, _validate_mu
+from .observers import Observer, StopCriteria, StopMonitor, notify_start, notify_update
+from .recorders import TrajectoryRecorder
 
-__all__ = ["Config", "GloballyCoupledMaps"]
+__all__ = ["Config", "GloballyCoupledMaps", "GloballyCoupledMapsBatch"]
 
 
 @dataclass(frozen=True)
@@ -39,12 +66,17 @@ class Config:
         Parâmetro local do mapa.
     seed : int | None, padrão None
         Semente para reprodutibilidade (usada em `reset`).
+    dtype : {"float64", "float32"}, padrão "float64"
+        Precisão do estado (e das trajetórias/buffers derivados). Normalizado para
+        o nome canônico (`np.float32` → "float32"). Os sorteios de `reset` são os
+        mesmos; só o arredondamento difere.
     """
 
     N: int
     eps: float
     mu: float
     seed: Optional[int] = None
+    dtype: str = "float64"
 
     def __post_init__(self) -> None:
         if self.N <= 0:
@@ -52,6 +84,35 @@ class Config:
         if not np.isfinite(self.eps):
             raise ValueError("eps deve ser finito.")
         _validate_mu(self.mu)
+        object.__setattr__(self, "dtype", _validate_dtype(self.dtype))
+
+
+def _validate_dtype(dtype) -> str:
+    """Nome canônico do dtype de estado ("float64" ou "float32")."""
+    name = np.dtype(dtype).name
+    if name not in ("float64", "float32"):
+        raise ValueError('dtype deve ser "float64" ou "float32".')
+    return name
+
+
+def _initial_state(cfg: Config, init: str, rng: np.random.Generator) -> np.ndarray:
+    """Estado inicial (N,) de `GloballyCoupledMaps.reset` (mesmos sorteios de `rng`)."""
+    N = cfg.N
+    if init == "uniform":
+        return rng.uniform(-1.0, 1.0, size=N).astype(cfg.dtype, copy=False)
+    if init != "half_half":
+        raise ValueError('init deve ser "half_half" ou "uniform".')
+
+    # I_± apenas no regime biestável
+    i_minus, i_plus = bistable_intervals(cfg.mu)  # pode levantar ValueError se fora do regime
+    half = N // 2
+    rest = N - half
+
+    x_plus = rng.uniform(i_plus[0], i_plus[1], size=half)
+    x_minus = rng.uniform(i_minus[0], i_minus[1], size=rest)
+    x = np.concatenate([x_plus, x_minus])
+    rng.shuffle(x)
+    return x.astype(cfg.dtype, copy=False)
 
 
 class GloballyCoupledMaps:
@@ -62,6 +123,8 @@ class GloballyCoupledMaps:
     - reset(init): inicializa o estado `x`.
     - step(): executa 1 passo de tempo.
     - run(T, discard, track): executa T passos, com descarte opcional do transiente.
+    - set_eps(eps) / set_mu(mu): altera parâmetros mantendo o estado.
+    - save(path) / load(path): checkpoint completo (inclui o estado do RNG).
 
     Atributos
     ---------
@@ -70,16 +133,40 @@ class GloballyCoupledMaps:
     rng : np.random.Generator
         Gerador pseudoaleatório para ICs.
     x : np.ndarray, shape (N,)
-        Estado atual do sistema.
+        Estado atual do sistema. É atualizado in-place por `step`; atribuir um novo
+        array a `x` é permitido (ele é copiado para o buffer interno no próximo passo).
     last_escaped_mask : np.ndarray[bool] | None
-        Máscara de escape detectada no último `step` (|x| > 1). None antes do primeiro passo.
+        Máscara de escape detectada no último `step` (|x| > 1). None antes do primeiro
+        passo ou se o último passo foi feito com `check_escape=False`. O buffer é
+        reutilizado entre passos (copie-o se precisar guardar).
+    last_stop_reason : str | None
+        Razão da parada antecipada do último `run` ("synced", "stationary",
+        "escaped") ou None se ele rodou todos os passos.
+    last_run_steps : int
+        Passos efetivamente executados no último `run`.
     """
 
     def __init__(self, cfg: Config):
         self.cfg = cfg
         self.rng = np.random.default_rng(cfg.seed)
-        self.x = np.zeros(cfg.N, dtype=float)
+        self.x = np.zeros(cfg.N, dtype=cfg.dtype)
         self.last_escaped_mask: np.ndarray | None = None
+        self.last_stop_reason: str | None = None
+        self.last_run_steps = 0
+        # buffers de trabalho do passo (ver `_ensure_buffers`)
+        self._x_buf: np.ndarray | None = None
+        self._y = np.empty(cfg.N, dtype=cfg.dtype)
+        self._esc = np.empty(cfg.N, dtype=bool)
+
+    def _ensure_buffers(self) -> np.ndarray:
+        """Garante que `x` é o buffer interno contíguo de `cfg.dtype` (copia se foi reatribuído)."""
+        x = self.x
+        if x is not self._x_buf:
+            x = np.array(x, dtype=self.cfg.dtype, order="C", copy=True)
+            if x.shape != (self.cfg.N,):
+                raise ValueError(f"x deve ter shape ({self.cfg.N},).")
+            self.x = self._x_buf = x
+        return x
 
     # ------------------------ inicialização / ICs ------------------------ #
 
@@ -100,44 +187,148 @@ class GloballyCoupledMaps:
         rng : np.random.Generator, opcional
             Gerador a ser usado; por padrão utiliza `self.rng`.
         """
-        _rng = self.rng if rng is None else rng
-        N = self.cfg.N
-        mu = self.cfg.mu
+        self.x = _initial_state(self.cfg, init, self.rng if rng is None else rng)
+        self.last_escaped_mask = None
 
-        if init == "uniform":
-            self.x = _rng.uniform(-1.0, 1.0, size=N)
-            self.last_escaped_mask = None
-            return
+    # --------------------------- checkpoint --------------------------- #
 
-        if init != "half_half":
-            raise ValueError('init deve ser "half_half" ou "uniform".')
+    def state_dict(self) -> Dict[str, Any]:
+        """Estado completo do sistema (cópias), suficiente para retomar a execução.
+
+        Chaves: "config" (dict de `Config`), "x", "last_escaped_mask" (ou None),
+        "rng_state" (`rng.bit_generator.state`), "last_stop_reason", "last_run_steps".
+        """
+        mask = self.last_escaped_mask
+        return dict(
+            config=asdict(self.cfg),
+            x=np.array(self.x, dtype=self.cfg.dtype, copy=True),
+            last_escaped_mask=None if mask is None else mask.copy(),
+            rng_state=self.rng.bit_generator.state,
+            last_stop_reason=self.last_stop_reason,
+            last_run_steps=self.last_run_steps,
+        )
+
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        """Restaura um estado de `state_dict` (o `Config` também é restaurado).
+
+        Levanta
+        -------
+        ValueError
+            Se o bit generator do estado for de outro tipo que o de `rng`.
+        """
+        cfg = Config(**state["config"])
+        rng_state = state["rng_state"]
+        if rng_state["bit_generator"] != type(self.rng.bit_generator).__name__:
+            raise ValueError("bit generator do checkpoint difere do de `rng`.")
+        if cfg.N != self.cfg.N or cfg.dtype != self.cfg.dtype:
+            self._y = np.empty(cfg.N, dtype=cfg.dtype)
+            self._esc = np.empty(cfg.N, dtype=bool)
+        self.cfg = cfg
+        self.rng.bit_generator.state = rng_state
+        self.x = np.array(state["x"], dtype=cfg.dtype, copy=True)
+        self._x_buf = None
+        mask = state["last_escaped_mask"]
+        if mask is None:
+            self.last_escaped_mask = None
+        else:
+            self._esc[...] = mask
+            self.last_escaped_mask = self._esc
+        self.last_stop_reason = state["last_stop_reason"]
+        self.last_run_steps = int(state["last_run_steps"])
 
-        # I_± apenas no regime biestável
-        i_minus, i_plus = bistable_intervals(mu)  # pode levantar ValueError se fora do regime
-        half = N // 2
-        rest = N - half
+    def save(self, path: str | Path) -> Path:
+        """Grava `state_dict()` em um `.npz` (escrita atômica: arquivo temporário + rename).
 
-        x_plus = _rng.uniform(i_plus[0], i_plus[1], size=half)
-        x_minus = _rng.uniform(i_minus[0], i_minus[1], size=rest)
-        x = np.concatenate([x_plus, x_minus])
-        _rng.shuffle(x)
-        self.x = x.astype(float, copy=False)
-        self.last_escaped_mask = None
+        Retorna
+        -------
+        Path
+            Caminho gravado.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = self.state_dict()
+        mask = state.pop("last_escaped_mask")
+        x = state.pop("x")
+        arrays = dict(x=x, meta=np.array(json.dumps(state)))
+        if mask is not None:
+            arrays["last_escaped_mask"] = mask
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "GloballyCoupledMaps":
+        """Recria um sistema a partir de um checkpoint de `save`."""
+        with np.load(Path(path), allow_pickle=False) as z:
+            state = json.loads(str(z["meta"]))
+            state["x"] = z["x"]
+            state["last_escaped_mask"] = z["last_escaped_mask"] if "last_escaped_mask" in z.files else None
+        sys = cls(Config(**state["config"]))
+        sys.load_state_dict(state)
+        return sys
+
+    # --------------------------- parâmetros --------------------------- #
+
+    def set_eps(self, eps: float) -> None:
+        """Troca ε in-place (nova `cfg` validada), preservando `x`, `rng` e buffers."""
+        self.cfg = replace(self.cfg, eps=float(eps))
+
+    def set_mu(self, mu: float) -> None:
+        """Troca μ in-place (nova `cfg` validada), preservando `x`, `rng` e buffers."""
+        self.cfg = replace(self.cfg, mu=float(mu))
 
     # ----------------------------- dinâmica ----------------------------- #
 
-    def step(self) -> None:
-        """Executa um passo de tempo.
+    def step(self, *, check_escape: bool = True) -> None:
+        """Executa um passo de tempo (in-place, sem alocações de tamanho N).
 
         Aplica y = f(x; mu) de forma vetorizada, calcula a média e atualiza:
             x <- (1 - eps) * y + eps * mean(y)
 
-        Também atualiza `last_escaped_mask` (True onde |x| > 1 após o passo).
+        Parâmetros
+        ----------
+        check_escape : bool, padrão True
+            Se True, atualiza `last_escaped_mask` (True onde |x| > 1 após o passo).
+            Se False, pula essa etapa e deixa `last_escaped_mask = None`.
+
+        Com `gcm.profiling.profiling()` ativo, cronometra cada fase (ver `gcm.profiling`).
         """
-        y = bistable_map(self.x, self.cfg.mu)
+        prof = _profiling._ACTIVE
+        if prof is not None:
+            t0 = time.perf_counter()
+        x = self._ensure_buffers()
+        y = self._y
+        eps = self.cfg.eps
+        _bistable_map_into(x, self.cfg.mu, y)
+        if prof is not None:
+            t1 = time.perf_counter()
         mean_y = float(y.mean())
-        self.x = (1.0 - self.cfg.eps) * y + self.cfg.eps * mean_y
-        self.last_escaped_mask = np.abs(self.x) > 1.0
+        if prof is not None:
+            t2 = time.perf_counter()
+        np.multiply(y, 1.0 - eps, out=x)
+        x += eps * mean_y
+        if prof is not None:
+            t3 = time.perf_counter()
+        if check_escape:
+            # ~(|x| <= 1): NaN (overflow após escape, rápido em float32) conta como escape
+            np.abs(x, out=y)
+            np.less_equal(y, 1.0, out=self._esc)
+            np.logical_not(self._esc, out=self._esc)
+            self.last_escaped_mask = self._esc
+        else:
+            self.last_escaped_mask = None
+        if prof is not None:
+            t4 = time.perf_counter()
+            prof.add_time("step.map", t1 - t0)
+            prof.add_time("step.mean", t2 - t1)
+            prof.add_time("step.update", t3 - t2)
+            if check_escape:
+                prof.add_time("step.escape", t4 - t3)
+            prof.add_time("step", t4 - t0)
+            prof.count("steps")
+            prof.count("site_updates", self.cfg.N)
 
     def run(
         self,
@@ -145,7 +336,12 @@ class GloballyCoupledMaps:
         discard: int = 0,
         *,
         track: bool = False,
-    ) -> np.ndarray | None:
+        check_escape: bool = True,
+        backend: str | None = None,
+        observers: Sequence[Observer] | None = None,
+        stop: StopCriteria | None = None,
+        recorder: TrajectoryRecorder | None = None,
+    ):
         """Roda T passos de tempo.
 
         Parâmetros
@@ -153,34 +349,333 @@ class GloballyCoupledMaps:
         T : int
             Número total de passos.
         discard : int, padrão 0
-            Número de passos iniciais a descartar (transiente), caso `track=True`.
+            Número de passos iniciais a descartar (transiente), caso `track=True`
+            ou haja observadores (eles só observam os passos t >= discard).
         track : bool, padrão False
             Se True, retorna a trajetória como array (T - discard, N). Caso False, retorna None.
+        check_escape : bool, padrão True
+            Repassado a `step`. Com False, a máscara de escape não é calculada.
+        backend : str | None, padrão None
+            Backend do laço quando `track=False` (ver `gcm.backends.get_backend`);
+            None usa o laço de referência em Python/NumPy.
+        observers : sequência de `gcm.observers.Observer`, opcional
+            Recebem `start(x)` no início da janela observada e `update(x, escaped)`
+            após cada passo. Com observadores o laço é sempre o de referência.
+        stop : gcm.observers.StopCriteria | None, padrão None
+            Critérios de parada antecipada, avaliados em todos os passos (inclusive
+            os descartados). Ao parar, `last_stop_reason` recebe a razão e
+            `last_run_steps` o nº de passos feitos; a trajetória sai truncada.
+        recorder : gcm.recorders.TrajectoryRecorder | None, padrão None
+            Grava os passos t >= discard direto em disco (ver `gcm.recorders`),
+            sem manter a trajetória na RAM. Incompatível com `track=True`.
 
         Retorna
         -------
-        np.ndarray | None
-            Trajetória (T - discard, N) se `track=True`; caso contrário None.
+        np.ndarray | np.memmap | ChunkedTrajectory | None
+            Trajetória (T - discard, N) se `track=True` (menos linhas se houve
+            parada antecipada); com `recorder`, a trajetória gravada reaberta de
+            forma preguiçosa (`recorder.close()`); caso contrário None.
 
         Notas
         -----
-        - Mesmo com track=False, `last_escaped_mask` é atualizado a cada `step`.
-        - Este método não calcula métricas; use `gcm.metrics` para isso.
+        - Mesmo com track=False, `last_escaped_mask` é atualizado a cada `step`
+          (a menos que `check_escape=False`).
+        - Métricas online ficam a cargo dos `observers`; para séries completas use
+          `track=True` e `gcm.metrics`.
+        - Com `gcm.profiling.profiling()` ativo, o tempo total vai para "run" (e
+          "run.backend" nos laços de backend).
         """
+        prof = _profiling._ACTIVE
+        if prof is None:
+            return self._run(T, discard, track, check_escape, backend, observers, stop, recorder)
+        with prof.timer("run"):
+            return self._run(T, discard, track, check_escape, backend, observers, stop, recorder)
+
+    def _run(self, T, discard, track, check_escape, backend, observers, stop, recorder):
         if T <= 0:
             raise ValueError("T deve ser positivo.")
+        observers = list(observers) if observers else []
+        if track and recorder is not None:
+            raise ValueError("use track=True ou recorder, não ambos.")
         if discard < 0 or discard >= T:
-            if track:
-                raise ValueError("discard deve estar em [0, T-1] quando track=True.")
-
-        if track:
-            traj = np.empty((T, self.cfg.N), dtype=float)
+            if track or observers or recorder is not None:
+                raise ValueError("discard deve estar em [0, T-1] quando track=True, com recorder ou com observadores.")
+
+        self.last_stop_reason = None
+        self.last_run_steps = T
+        if track or observers or stop is not None or recorder is not None:
+            # só as T - discard linhas mantidas são alocadas
+            traj = np.empty((T - discard, self.cfg.N), dtype=self.cfg.dtype) if track else None
+            if recorder is not None:
+                recorder.open(T - discard, (self.cfg.N,), np.dtype(self.cfg.dtype))
+            monitor = StopMonitor(stop) if stop is not None else None
+            if monitor is not None:
+                monitor.start(self.x)
             for t in range(T):
-                self.step()
-                traj[t] = self.x
-            return traj[discard:]
+                if observers and t == discard:
+                    notify_start(observers, self.x)
+                self.step(check_escape=check_escape)
+                if t >= discard:
+                    if track:
+                        traj[t - discard] = self.x
+                    if recorder is not None:
+                        recorder.write(self.x)
+                    if observers:
+                        notify_update(observers, self.x, self.last_escaped_mask)
+                if monitor is not None:
+                    monitor.update(self.x, self.last_escaped_mask)
+                    if monitor.reason is not None:
+                        self.last_stop_reason = monitor.reason
+                        self.last_run_steps = t + 1
+                        break
+            if observers and self.last_run_steps <= discard:
+                # parou antes da janela observada: observadores ficam com 0 passos
+                notify_start(observers, self.x)
+            if recorder is not None:
+                return recorder.close()
+            return traj[: max(self.last_run_steps - discard, 0)] if track else None
+        elif backend is not None:
+            from .backends import get_backend
+
+            prof = _profiling._ACTIVE
+            if prof is None:
+                get_backend(backend).advance(self, T, check_escape)
+            else:
+                with prof.timer("run.backend"):
+                    get_backend(backend).advance(self, T, check_escape)
+                prof.count("steps", T)
+                prof.count("site_updates", T * self.cfg.N)
+            return None
         else:
             for _ in range(T):
-                self.step()
+                self.step(check_escape=check_escape)
             return None
 
+
+class GloballyCoupledMapsBatch:
+    """Conjunto de R sistemas globalmente acoplados evoluídos em bloco.
+
+    Cada linha r do estado `x` (shape (R, N)) é uma realização independente com
+    seus próprios `eps[r]`, `mu[r]` e semente. A atualização é a mesma de
+    `GloballyCoupledMaps`, com a média de f(x) tomada por linha:
+
+        x[r] <- (1 - eps[r]) * f(x[r]; mu[r]) + eps[r] * mean(f(x[r]; mu[r]))
+
+    Cada linha usa um gerador próprio (`default_rng(seeds[r])`), de modo que a
+    linha r reproduz `GloballyCoupledMaps(Config(N, eps[r], mu[r], seeds[r]))`.
+
+    Atributos
+    ---------
+    N : int
+        Número de mapas por realização.
+    R : int
+        Número de realizações (linhas).
+    eps, mu : np.ndarray, shape (R,)
+        Parâmetros por linha.
+    seeds : list[int | None]
+        Sementes por linha.
+    rngs : list[np.random.Generator]
+        Geradores por linha (usados em `reset`).
+    x : np.ndarray, shape (R, N)
+        Estado atual.
+    last_escaped_mask : np.ndarray[bool] | None, shape (R, N)
+        Máscara de escape do último `step`. None antes do primeiro passo.
+    """
+
+    def __init__(
+        self,
+        N: int,
+        eps: float | Sequence[float] | np.ndarray,
+        mu: float | Sequence[float] | np.ndarray,
+        seeds: Sequence[int | None] | None = None,
+        dtype: str = "float64",
+    ):
+        if N <= 0:
+            raise ValueError("N deve ser positivo.")
+        eps_arr = np.atleast_1d(np.asarray(eps, dtype=float))
+        mu_arr = np.atleast_1d(np.asarray(mu, dtype=float))
+        if eps_arr.ndim != 1 or mu_arr.ndim != 1:
+            raise ValueError("eps e mu devem ser escalares ou vetores 1D.")
+        R = max(eps_arr.size, mu_arr.size, 0 if seeds is None else len(seeds))
+        try:
+            eps_arr = np.broadcast_to(eps_arr, (R,)).copy()
+            mu_arr = np.broadcast_to(mu_arr, (R,)).copy()
+        except ValueError as exc:
+            raise ValueError("eps, mu e seeds devem ter o mesmo comprimento R (ou ser escalares).") from exc
+        if seeds is None:
+            seeds = [None] * R
+        elif len(seeds) != R:
+            raise ValueError("eps, mu e seeds devem ter o mesmo comprimento R (ou ser escalares).")
+        if not np.all(np.isfinite(eps_arr)):
+            raise ValueError("eps deve ser finito.")
+        for m in mu_arr:
+            _validate_mu(float(m))
+
+        self.N = int(N)
+        self.R = int(R)
+        self.dtype = _validate_dtype(dtype)
+        self.eps = eps_arr
+        self.mu = mu_arr
+        self.seeds = list(seeds)
+        self.rngs = [np.random.default_rng(s) for s in self.seeds]
+        self.x = np.zeros((self.R, self.N), dtype=self.dtype)
+        self.last_escaped_mask: np.ndarray | None = None
+        # buffers de trabalho (mesma estratégia de `GloballyCoupledMaps`)
+        self._x_buf: np.ndarray | None = None
+        self._y = np.empty((self.R, self.N), dtype=self.dtype)
+        self._esc = np.empty((self.R, self.N), dtype=bool)
+        self._mean = np.empty((self.R, 1), dtype=self.dtype)
+
+    def _ensure_buffers(self) -> np.ndarray:
+        """Garante que `x` é o buffer interno (R, N) contíguo de `dtype`."""
+        x = self.x
+        if x is not self._x_buf:
+            x = np.array(x, dtype=self.dtype, order="C", copy=True)
+            if x.shape != (self.R, self.N):
+                raise ValueError(f"x deve ter shape ({self.R}, {self.N}).")
+            self.x = self._x_buf = x
+        return x
+
+    @classmethod
+    def from_configs(cls, cfgs: Sequence[Config]) -> "GloballyCoupledMapsBatch":
+        """Constrói o lote a partir de uma sequência de `Config` (todas com o mesmo N e dtype)."""
+        cfgs = list(cfgs)
+        if not cfgs:
+            raise ValueError("cfgs não pode ser vazio.")
+        if len({c.N for c in cfgs}) != 1:
+            raise ValueError("Todas as Configs do lote devem ter o mesmo N.")
+        if len({c.dtype for c in cfgs}) != 1:
+            raise ValueError("Todas as Configs do lote devem ter o mesmo dtype.")
+        return cls(
+            N=cfgs[0].N,
+            eps=[c.eps for c in cfgs],
+            mu=[c.mu for c in cfgs],
+            seeds=[c.seed for c in cfgs],
+            dtype=cfgs[0].dtype,
+        )
+
+    def config(self, r: int) -> Config:
+        """`Config` equivalente à linha r."""
+        return Config(N=self.N, eps=float(self.eps[r]), mu=float(self.mu[r]), seed=self.seeds[r],
+                      dtype=self.dtype)
+
+    # ------------------------ inicialização / ICs ------------------------ #
+
+    def reset(self, init: Literal["half_half", "uniform"] = "half_half") -> None:
+        """Reinicializa todas as linhas (mesmos modos de `GloballyCoupledMaps.reset`).
+
+        Cada linha consome apenas o seu próprio gerador `rngs[r]`.
+        """
+        if init not in ("half_half", "uniform"):
+            raise ValueError('init deve ser "half_half" ou "uniform".')
+        N = self.N
+        for r in range(self.R):
+            _rng = self.rngs[r]
+            if init == "uniform":
+                self.x[r] = _rng.uniform(-1.0, 1.0, size=N)
+                continue
+            i_minus, i_plus = bistable_intervals(float(self.mu[r]))
+            half = N // 2
+            rest = N - half
+            x_plus = _rng.uniform(i_plus[0], i_plus[1], size=half)
+            x_minus = _rng.uniform(i_minus[0], i_minus[1], size=rest)
+            x = np.concatenate([x_plus, x_minus])
+            _rng.shuffle(x)
+            self.x[r] = x
+        self.last_escaped_mask = None
+
+    # --------------------------- parâmetros --------------------------- #
+
+    def set_eps(self, eps: float | Sequence[float] | np.ndarray, rows: Sequence[int] | None = None) -> None:
+        """Troca ε in-place para todas as linhas ou só para `rows` (escalar ou vetor)."""
+        eps = np.asarray(eps, dtype=float)
+        if not np.all(np.isfinite(eps)):
+            raise ValueError("eps deve ser finito.")
+        if rows is None:
+            self.eps[:] = eps
+        else:
+            self.eps[np.asarray(rows)] = eps
+
+    def set_mu(self, mu: float | Sequence[float] | np.ndarray, rows: Sequence[int] | None = None) -> None:
+        """Troca μ in-place para todas as linhas ou só para `rows` (escalar ou vetor)."""
+        mu = np.atleast_1d(np.asarray(mu, dtype=float))
+        for m in mu:
+            _validate_mu(float(m))
+        if rows is None:
+            self.mu[:] = mu
+        else:
+            self.mu[np.asarray(rows)] = mu
+
+    # ----------------------------- dinâmica ----------------------------- #
+
+    def step(self, *, check_escape: bool = True) -> None:
+        """Executa um passo de tempo em todas as realizações (in-place).
+
+        A média de f é calculada em uma única redução ao longo do eixo N.
+        `check_escape` tem o mesmo papel que em `GloballyCoupledMaps.step`.
+        """
+        x = self._ensure_buffers()
+        y = self._y
+        m = self._mean
+        eps = self.eps[:, None].astype(x.dtype, copy=False)
+        _bistable_map_into(x, self.mu[:, None].astype(x.dtype, copy=False), y)
+        np.mean(y, axis=1, keepdims=True, out=m)
+        np.multiply(y, 1.0 - eps, out=x)
+        m *= eps
+        x += m
+        if check_escape:
+            # ~(|x| <= 1): NaN (overflow após escape, rápido em float32) conta como escape
+            np.abs(x, out=y)
+            np.less_equal(y, 1.0, out=self._esc)
+            np.logical_not(self._esc, out=self._esc)
+            self.last_escaped_mask = self._esc
+        else:
+            self.last_escaped_mask = None
+
+    def run(
+        self,
+        T: int,
+        discard: int = 0,
+        *,
+        track: bool = False,
+        check_escape: bool = True,
+        observers: Sequence[Observer] | None = None,
+        recorder: TrajectoryRecorder | None = None,
+    ):
+        """Roda T passos em todas as realizações.
+
+        Mesma semântica de `GloballyCoupledMaps.run`; com `track=True` (ou
+        `recorder`) a trajetória tem shape (T - discard, R, N) e os observadores
+        recebem o estado (R, N) inteiro (resultados por linha).
+        """
+        if T <= 0:
+            raise ValueError("T deve ser positivo.")
+        observers = list(observers) if observers else []
+        if track and recorder is not None:
+            raise ValueError("use track=True ou recorder, não ambos.")
+        if discard < 0 or discard >= T:
+            if track or observers or recorder is not None:
+                raise ValueError("discard deve estar em [0, T-1] quando track=True, com recorder ou com observadores.")
+
+        if track or observers or recorder is not None:
+            traj = np.empty((T - discard, self.R, self.N), dtype=self.dtype) if track else None
+            if recorder is not None:
+                recorder.open(T - discard, (self.R, self.N), np.dtype(self.dtype))
+            for t in range(T):
+                if observers and t == discard:
+                    notify_start(observers, self.x)
+                self.step(check_escape=check_escape)
+                if t >= discard:
+                    if track:
+                        traj[t - discard] = self.x
+                    if recorder is not None:
+                        recorder.write(self.x)
+                    if observers:
+                        notify_update(observers, self.x, self.last_escaped_mask)
+            if recorder is not None:
+                return recorder.close()
+            return traj
+        else:
+            for _ in range(T):
+                self.step(check_escape=check_escape)
+            return None
@@ -49,6 +49,10 @@ def bistable_map(x: np.ndarray, mu: float, *, out: np.ndarray | None = None) ->
             mu*x,            se x ∈ (-1/3,  1/3)
             2*mu/3 - mu*x,   se x ∈ [ 1/3,  1]
 
+    Como o mapa é contínuo em x = ±1/3, as três faixas cabem em uma forma fechada
+    sem máscaras nem indexação:
+        f(x; mu) = mu * (2 * clip(x, -1/3, 1/3) - x)
+
     Observações
     ----------
     - O mapa é ímpar: f(-x; mu) = -f(x; mu).
@@ -63,29 +67,36 @@ def bistable_map(x: np.ndarray, mu: float, *, out: np.ndarray | None = None) ->
     mu : float
         Parâmetro do mapa.
     out : np.ndarray, opcional
-        Buffer de saída (mesmo shape de x), se desejado.
+        Buffer de saída (mesmo shape de x, float64). Pode ser o próprio `x`
+        (atualização in-place; neste caso um buffer temporário é alocado).
 
     Retorna
     -------
     np.ndarray
-        f(x; mu) com mesmo shape que `x`.
+        f(x; mu) com mesmo shape que `x` (o próprio `out`, se fornecido).
     """
     _validate_mu(mu)
     x = np.asarray(x, dtype=float)
-    y = x if out is None else out  # pode sobrescrever em buffer externo
-
-    # Máscaras das faixas
-    m_left = x <= -1.0 / 3.0
-    m_mid = (x > -1.0 / 3.0) & (x < 1.0 / 3.0)
-    m_right = x >= 1.0 / 3.0
-
-    # Aplicação por partes (vetorizada)
-    if y is x:
-        y = np.empty_like(x, dtype=float)
-    y[m_left] = -2.0 * mu / 3.0 - mu * x[m_left]
-    y[m_mid] = mu * x[m_mid]
-    y[m_right] = 2.0 * mu / 3.0 - mu * x[m_right]
-    return y
+    if out is None:
+        return _bistable_map_into(x, mu, np.empty_like(x, dtype=float))
+    if np.shares_memory(out, x):
+        # a forma fechada precisa de x intacto até o fim: passa por um temporário
+        out[...] = _bistable_map_into(x, mu, np.empty_like(x, dtype=float))
+        return out
+    return _bistable_map_into(x, mu, out)
+
+
+def _bistable_map_into(x: np.ndarray, mu, out: np.ndarray) -> np.ndarray:
+    """Núcleo sem validação nem alocação: escreve f(x; mu) em `out` e o retorna.
+
+    `out` não pode compartilhar memória com `x`. `mu` pode ser escalar ou um array
+    que faça broadcast com `x` (p.ex. shape (R, 1) para estados (R, N)).
+    """
+    np.clip(x, -1.0 / 3.0, 1.0 / 3.0, out=out)
+    out *= 2.0
+    out -= x
+    out *= mu
+    return out
 
 
 def bistable_intervals(mu: float) -> Tuple[Tuple[float, float], Tuple[float, float]]:
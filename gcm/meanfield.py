@@ -0,0 +1,243 @@
+"""
+gcm.meanfield
+=============
+Limite termodinâmico (N → ∞) do acoplamento global: em vez de N partículas,
+evolui uma densidade ρ em [-1, 1] sob o operador de transferência do mapa
+
+    x ↦ g(x) = (1 - ε) f(x; μ) + ε m,     m = ∫ f(x) ρ(x) dx.
+
+Discretização:
+- ρ é constante por partes em `n_bins` bins de largura h = 2/n_bins; n_bins é
+  múltiplo de 6, então 0 e ±1/3 (quebras de f) são bordas de bin e g é afim em
+  cada bin;
+- a imagem de um bin é um intervalo, e sua massa é redistribuída uniformemente
+  nos bins de destino pela CDF (função rampa acumulada), em O(n_bins log n_bins)
+  por passo, independente de N;
+- massa mapeada para fora de [-1, 1] é contada como massa de escape e removida;
+  m usa a densidade condicional (massa restante renormalizada).
+
+Observáveis: média, σ (com a variância h²/12 interna aos bins, logo σ ≥ h/√12 —
+`sigma_floor`), magnetização M = P(x ≥ 0) - P(x < 0) e massa de escape.
+
+Nota: sem flutuações de tamanho finito, uma densidade inicial simétrica (p.ex.
+"half_half") permanece simétrica (M = 0) mesmo onde o sistema finito se ordena
+espontaneamente; a curva de campo médio é a do ramo simétrico.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Literal
+
+import numpy as np
+
+from .maps import _validate_mu, bistable_intervals
+
+__all__ = ["MeanFieldDensity"]
+
+
+def _validate_eps(eps: float) -> None:
+    if not np.isfinite(eps):
+        raise ValueError("eps deve ser finito.")
+
+
+class MeanFieldDensity:
+    """Motor de densidade (campo médio) para os mapas globalmente acoplados.
+
+    Parâmetros
+    ----------
+    eps : float
+        Acoplamento ε (finito, como em `Config`; ε > 1 inverte (1 - ε) e a imagem
+        de cada bin é tomada por min/max).
+    mu : float
+        Parâmetro do mapa local.
+    n_bins : int, padrão 3000
+        Número de bins em [-1, 1] (arredondado para cima até múltiplo de 6).
+
+    Atributos
+    ---------
+    edges : np.ndarray, shape (n_bins + 1,)
+    centers : np.ndarray, shape (n_bins,)
+    rho : np.ndarray, shape (n_bins,)
+        Massa por bin (soma = massa restante, 1 - escape_mass).
+    escape_mass : float
+        Massa total que saiu de [-1, 1] desde `reset`.
+    last_escape_mass : float
+        Massa que saiu no último passo.
+    """
+
+    def __init__(self, eps: float, mu: float, n_bins: int = 3000):
+        _validate_mu(mu)
+        _validate_eps(eps)
+        if n_bins < 6:
+            raise ValueError("n_bins deve ser >= 6.")
+        n_bins = int(-(-n_bins // 6) * 6)
+        self.eps = float(eps)
+        self.mu = float(mu)
+        self.n_bins = n_bins
+        self.edges = np.linspace(-1.0, 1.0, n_bins + 1)
+        self.centers = 0.5 * (self.edges[:-1] + self.edges[1:])
+        self.h = 2.0 / n_bins
+        # f(x) = a_j x + b_j em cada bin (bins não atravessam ±1/3)
+        c = self.centers
+        self._slope = np.where(np.abs(c) < 1.0 / 3.0, self.mu, -self.mu)
+        self._icpt = np.where(np.abs(c) < 1.0 / 3.0, 0.0, np.sign(c) * 2.0 * self.mu / 3.0)
+        self._f_centers = self._slope * c + self._icpt
+        self.rho = np.zeros(n_bins, dtype=float)
+        self.escape_mass = 0.0
+        self.last_escape_mass = 0.0
+
+    # ------------------------------------------------------------------ #
+
+    def _deposit(self, lo: np.ndarray, hi: np.ndarray, w: np.ndarray) -> tuple[np.ndarray, float]:
+        """Espalha as massas `w` uniformemente em [lo, hi].
+
+        Retorna (massa por bin, massa que caiu fora de [-1, 1]).
+        """
+        edges = self.edges
+        out = np.zeros(self.n_bins, dtype=float)
+        lost = 0.0
+        width = hi - lo
+        point = width <= 1e-14 * self.h
+        if point.any():
+            # imagens degeneradas (p.ex. ε = 1): massa pontual
+            lp, wp = lo[point], w[point]
+            inside = (lp >= -1.0) & (lp <= 1.0)
+            idx = np.clip(np.searchsorted(edges, lp[inside], side="right") - 1, 0, self.n_bins - 1)
+            out += np.bincount(idx, weights=wp[inside], minlength=self.n_bins)
+            lost += float(wp[~inside].sum())
+            lo, hi, w, width = lo[~point], hi[~point], w[~point], width[~point]
+        if lo.size:
+            # CDF G(e) = Σ s_k [(e - lo_k)_+ - (e - hi_k)_+], com s_k = w_k / largura_k
+            s = w / width
+            p = np.concatenate([lo, hi])
+            coef = np.concatenate([s, -s])
+            idx = np.searchsorted(edges, p, side="right")
+            c1 = np.cumsum(np.bincount(idx, weights=coef, minlength=edges.size + 1))[: edges.size]
+            c2 = np.cumsum(np.bincount(idx, weights=coef * p, minlength=edges.size + 1))[: edges.size]
+            out += np.maximum(np.diff(edges * c1 - c2), 0.0)
+            outside = np.maximum(np.minimum(hi, -1.0) - lo, 0.0) + np.maximum(hi - np.maximum(lo, 1.0), 0.0)
+            lost += float(s @ outside)
+        return out, lost
+
+    def _spread(self, lo: np.ndarray, hi: np.ndarray, w: np.ndarray) -> float:
+        """Substitui `rho` pela redistribuição de `w` em [lo, hi]; retorna a massa que escapou.
+
+        A massa restante é renormalizada para w.sum() - escape (sem deriva de arredondamento).
+        """
+        rho, lost = self._deposit(lo, hi, w)
+        lost = min(lost, float(w.sum()))
+        kept = float(w.sum()) - lost
+        total = float(rho.sum())
+        self.rho = rho * (kept / total) if total > 0 else rho
+        return lost
+
+    def reset(self, init: Literal["half_half", "uniform"] = "half_half") -> None:
+        """Densidade inicial: uniforme em [-1, 1] ou metade em I_+ e metade em I_- (1 < |μ| < 2)."""
+        if init == "uniform":
+            lo, hi, w = np.array([-1.0]), np.array([1.0]), np.array([1.0])
+        elif init == "half_half":
+            i_minus, i_plus = bistable_intervals(self.mu)
+            lo = np.array([i_plus[0], i_minus[0]], dtype=float)
+            hi = np.array([i_plus[1], i_minus[1]], dtype=float)
+            w = np.array([0.5, 0.5])
+        else:
+            raise ValueError('init deve ser "half_half" ou "uniform".')
+        self._spread(lo, hi, w)
+        self.escape_mass = 0.0
+        self.last_escape_mass = 0.0
+
+    def set_eps(self, eps: float) -> None:
+        """Troca ε mantendo a densidade (rampas)."""
+        _validate_eps(eps)
+        self.eps = float(eps)
+
+    # ------------------------------------------------------------------ #
+
+    @property
+    def mass(self) -> float:
+        """Massa restante em [-1, 1]."""
+        return float(self.rho.sum())
+
+    @property
+    def mean(self) -> float:
+        """<x> condicional à massa restante."""
+        m = self.mass
+        return float(self.rho @ self.centers / m) if m > 0 else float("nan")
+
+    @property
+    def sigma(self) -> float:
+        """Desvio-padrão de ρ (condicional), inclusa a variância h²/12 de cada bin."""
+        m = self.mass
+        if m <= 0:
+            return float("nan")
+        mean = self.rho @ self.centers / m
+        var = self.rho @ (self.centers - mean) ** 2 / m + self.h ** 2 / 12.0
+        return float(np.sqrt(max(var, 0.0)))
+
+    @property
+    def sigma_floor(self) -> float:
+        """Menor σ representável (massa em um único bin): h/√12."""
+        return self.h / np.sqrt(12.0)
+
+    @property
+    def magnetization(self) -> float:
+        """M = P(x ≥ 0) - P(x < 0) (condicional); 0 é borda de bin."""
+        m = self.mass
+        if m <= 0:
+            return float("nan")
+        return float(np.sign(self.centers) @ self.rho / m)
+
+    def mean_f(self) -> float:
+        """m = ∫ f ρ (condicional); exato, pois f é afim em cada bin."""
+        m = self.mass
+        return float(self._f_centers @ self.rho / m) if m > 0 else float("nan")
+
+    # ------------------------------------------------------------------ #
+
+    def step(self) -> None:
+        """Aplica o operador de transferência uma vez (massa que sai de [-1, 1] escapa)."""
+        if self.mass <= 0:
+            self.last_escape_mass = 0.0
+            return
+        a = (1.0 - self.eps) * self._slope
+        b = (1.0 - self.eps) * self._icpt + self.eps * self.mean_f()
+        ya = a * self.edges[:-1] + b
+        yb = a * self.edges[1:] + b
+        live = self.rho > 0
+        lo = np.minimum(ya, yb)[live]
+        hi = np.maximum(ya, yb)[live]
+        lost = self._spread(lo, hi, self.rho[live])
+        self.last_escape_mass = lost
+        self.escape_mass += lost
+
+    def run(self, T: int, discard: int = 0, *, track: bool = False) -> Dict[str, np.ndarray] | None:
+        """Roda T passos.
+
+        Parâmetros
+        ----------
+        T : int
+        discard : int, padrão 0
+            Passos iniciais fora das séries (com `track=True`).
+        track : bool, padrão False
+            Se True, retorna séries por passo (t >= discard): "sigma", "M",
+            "mean" e "escape_mass" (massa que saiu no passo).
+
+        Retorna
+        -------
+        dict[str, np.ndarray] | None
+        """
+        if T <= 0:
+            raise ValueError("T deve ser positivo.")
+        if track and not (0 <= discard < T):
+            raise ValueError("discard deve estar em [0, T-1] quando track=True.")
+        keys = ("sigma", "M", "mean", "escape_mass")
+        series = {k: np.empty(T - discard, dtype=float) for k in keys} if track else None
+        for t in range(T):
+            self.step()
+            if track and t >= discard:
+                i = t - discard
+                series["sigma"][i] = self.sigma
+                series["M"][i] = self.magnetization
+                series["mean"][i] = self.mean
+                series["escape_mass"][i] = self.last_escape_mass
+        return series
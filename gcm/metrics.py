@@ -3,18 +3,31 @@ gcm.metrics
 ===========
 Métricas e estatísticas: sigma (sincronização), spins, magnetização,
 parâmetro de ordem |<M>| e curva de persistência p_t.
+
+Spins podem ser guardados compactados (`PackedSpins`, 1 bit por sítio, via
+`np.packbits` ao longo de N); magnetização, flips e persistência são então
+calculados por popcount, sem desempacotar.
+
+Estados float32 (`Config(dtype="float32")`) são usados como estão, sem promoção.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from statistics import NormalDist
+
 import numpy as np
 
 __all__ = [
     "sigma",
     "spins",
+    "PackedSpins",
+    "pack_spins",
     "magnetization",
     "order_param_M",
     "persistence_curve",
+    "PersistenceAccumulator",
+    "RunningStats",
     "sigma_mean",
 ]
 
@@ -32,25 +45,122 @@ def sigma(x: np.ndarray) -> float:
     float
         σ_t = std(x).
     """
-    x = np.asarray(x, dtype=float)
-    return float(np.std(x))
+    return float(np.std(_as_float(x)))
+
+
+def _as_float(x: np.ndarray) -> np.ndarray:
+    """Array de ponto flutuante sem cópia (float32 é mantido; inteiros viram float64)."""
+    x = np.asarray(x)
+    return x if x.dtype.kind == "f" else x.astype(float)
+
+
+# popcount de cada byte (fallback para NumPy < 2.0, sem np.bitwise_count)
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(bits: np.ndarray) -> np.ndarray:
+    """Nº de bits 1 ao longo do último eixo de um array uint8."""
+    if hasattr(np, "bitwise_count"):
+        counts = np.bitwise_count(bits)
+    else:
+        counts = _POPCOUNT8[bits]
+    return counts.sum(axis=-1, dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class PackedSpins:
+    """Spins s ∈ {-1, +1} compactados em bits ao longo do eixo dos sítios.
+
+    Bit 1 ↔ s = +1 (x >= 0) e bit 0 ↔ s = -1; os bits de preenchimento do
+    último byte são 0. Um raster (T, N) ocupa T·ceil(N/8) bytes (64× menos que
+    o int64 de `spins`).
+
+    Atributos
+    ---------
+    bits : np.ndarray, dtype=uint8, shape (..., ceil(N/8))
+    N : int
+        Número de sítios.
+    """
 
+    bits: np.ndarray
+    N: int
+
+    @property
+    def shape(self) -> tuple:
+        """Shape lógico (..., N), como o de `spins`."""
+        return (*self.bits.shape[:-1], self.N)
+
+    @property
+    def ndim(self) -> int:
+        return self.bits.ndim
+
+    def __len__(self) -> int:
+        return len(self.bits)
+
+    def __getitem__(self, idx) -> "PackedSpins":
+        """Indexa os eixos de tempo/realização (nunca o eixo dos sítios)."""
+        bits = self.bits[idx]
+        if bits.ndim == 0 or bits.shape[-1] != self.bits.shape[-1]:
+            raise IndexError("PackedSpins só indexa os eixos anteriores ao de sítios.")
+        return PackedSpins(bits, self.N)
+
+    def unpack(self) -> np.ndarray:
+        """Spins ±1 (int8) de shape (..., N)."""
+        b = np.unpackbits(self.bits, axis=-1, count=self.N)
+        return (2 * b.astype(np.int8) - 1).astype(np.int8, copy=False)
+
+    def n_up(self) -> np.ndarray:
+        """Nº de spins +1 por linha (popcount), shape (...)."""
+        return _popcount_rows(self.bits)
+
+    def magnetization(self) -> np.ndarray:
+        """Magnetização M = (1/N) Σ s_i por linha, shape (...)."""
+        return 2.0 * self.n_up() / self.N - 1.0
+
+    def flips(self, other: "PackedSpins") -> np.ndarray:
+        """Nº de sítios com sinal diferente de `other` (XOR + popcount), por linha."""
+        return _popcount_rows(np.bitwise_xor(self.bits, other.bits))
+
+
+def pack_spins(x: np.ndarray) -> PackedSpins:
+    """Compacta estados (ou spins ±1) em `PackedSpins` ao longo do último eixo.
+
+    Mesma convenção de `spins`: x < 0 → -1, demais (inclusive 0) → +1.
+
+    Parâmetros
+    ----------
+    x : np.ndarray, shape (..., N)
 
-def spins(x: np.ndarray) -> np.ndarray:
+    Retorna
+    -------
+    PackedSpins
+    """
+    x = np.asarray(x)
+    return PackedSpins(np.packbits(~(x < 0), axis=-1), int(x.shape[-1]))
+
+
+def spins(x: np.ndarray, *, packed: bool = False) -> np.ndarray | PackedSpins:
     """Converte estado em spins s_i ∈ {-1, +1}.
 
     Convenção: valores exatamente 0 recebem +1.
 
     Parâmetros
     ----------
-    x : np.ndarray, shape (N,)
+    x : np.ndarray, shape (N,) ou (T, N), ou PackedSpins
+        Um `PackedSpins` é desempacotado (spins ±1).
+    packed : bool, padrão False
+        Se True, retorna `PackedSpins` (1 bit por sítio).
 
     Retorna
     -------
     np.ndarray, shape (N,), dtype=int
-        Vetor de spins.
+        Vetor de spins (ou `PackedSpins` se `packed=True`).
     """
-    x = np.asarray(x, dtype=float)
+    if isinstance(x, PackedSpins):
+        return x if packed else x.unpack().astype(int)
+    if packed:
+        return pack_spins(x)
+    x = _as_float(x)
     s = np.ones_like(x, dtype=int)
     s[x < 0.0] = -1
     return s
@@ -61,13 +171,16 @@ def magnetization(x: np.ndarray) -> float:
 
     Parâmetros
     ----------
-    x : np.ndarray, shape (N,)
+    x : np.ndarray, shape (N,), ou PackedSpins
+        Com `PackedSpins` a soma é feita por popcount (média sobre todas as linhas).
 
     Retorna
     -------
     float
         Magnetização no instante.
     """
+    if isinstance(x, PackedSpins):
+        return float(np.mean(x.magnetization()))
     s = spins(x)
     return float(np.mean(s))
 
@@ -89,38 +202,119 @@ def order_param_M(series_M: np.ndarray) -> float:
     return float(abs(series_M.mean()))
 
 
+class PersistenceAccumulator:
+    """Persistência incremental a partir de blocos de spins ou estados.
+
+    Guarda, por sítio, o instante da primeira troca de sinal em relação a t=0
+    (`first_flip`, -1 se ainda não trocou). Cada bloco só é comparado nos sítios
+    que ainda não trocaram; p_t sai de um histograma cumulativo desses instantes.
+    Memória O(N) além do bloco corrente, logo serve durante a simulação (p.ex.
+    alimentado por blocos de `run(track=True)` ou de `ChunkedTrajectory.iter_chunks()`).
+
+    Convenção de sinal igual a `spins` (x < 0 → -1), então blocos de estados x,
+    de spins ±1 ou `PackedSpins` dão o mesmo resultado.
+
+    Atributos
+    ---------
+    n_steps : int
+        Linhas consumidas até agora (T).
+    first_flip : np.ndarray[int64] | None
+        Instante da primeira troca por sítio, shape (N,).
+    """
+
+    _BLOCK_ELEMS = 1 << 20
+
+    def __init__(self):
+        self.n_steps = 0
+        self.first_flip: np.ndarray | None = None
+        self._neg0: np.ndarray | None = None
+
+    def update(self, chunk: np.ndarray | PackedSpins) -> None:
+        """Consome um bloco (k, N) (ou uma única linha (N,)) de spins/estados."""
+        packed = isinstance(chunk, PackedSpins)
+        rows = chunk.bits if packed else np.asarray(chunk)
+        if rows.ndim == 1:
+            rows = rows[None, :]
+        if rows.ndim != 2:
+            raise ValueError("bloco deve ter shape (k, N) ou (N,).")
+        N = chunk.N if packed else rows.shape[1]
+
+        def neg_rows(a: int, b: int, cols) -> np.ndarray:
+            if packed:
+                return np.unpackbits(rows[a:b], axis=-1, count=N)[:, cols] == 0
+            return rows[a:b, cols] < 0
+
+        k = rows.shape[0]
+        if k == 0:
+            return
+        if self._neg0 is None:
+            self._neg0 = neg_rows(0, 1, slice(None))[0]
+            self.first_flip = np.full(N, -1, dtype=np.int64)
+        elif N != self._neg0.shape[0]:
+            raise ValueError("N do bloco difere do primeiro bloco.")
+
+        # sub-blocos de linhas: só os sítios que ainda não trocaram são lidos
+        alive = np.flatnonzero(self.first_flip < 0)
+        a = 0
+        while a < k and alive.size:
+            b = min(k, a + max(16, self._BLOCK_ELEMS // alive.size))
+            d = neg_rows(a, b, alive) != self._neg0[alive]
+            hit = d.any(axis=0)
+            if hit.any():
+                self.first_flip[alive[hit]] = self.n_steps + a + d[:, hit].argmax(axis=0)
+                alive = alive[~hit]
+            a = b
+        self.n_steps += k
+
+    def curve(self) -> np.ndarray:
+        """p_t para t = 0..n_steps-1 (p_0 = 1)."""
+        if self.first_flip is None:
+            return np.empty(0, dtype=float)
+        flipped = self.first_flip[self.first_flip >= 0]
+        counts = np.bincount(flipped, minlength=self.n_steps)
+        return 1.0 - np.cumsum(counts) / self.first_flip.shape[0]
+
+
 def persistence_curve(spin_series: np.ndarray) -> np.ndarray:
     """Curva de persistência p_t: fração que nunca mudou de sinal desde t=0.
 
-    Implementação eficiente sem alocar matrizes gigantes:
-    - Mantém um booleano `changed` por sítio.
-    - Em cada t, atualiza `changed |= (s_t != s_0)` e computa p_t = mean(~changed).
+    Implementação sem laço em t: o instante da primeira troca de cada sítio é
+    obtido uma vez (`PersistenceAccumulator`) e p_t = 1 - (nº de sítios com
+    primeira troca <= t)/N vem de um histograma cumulativo.
 
     Parâmetros
     ----------
-    spin_series : np.ndarray, shape (T, N), dtype=int
-        Série de spins no tempo.
+    spin_series : np.ndarray, shape (T, N), dtype=int, ou PackedSpins (T, N)
+        Série de spins no tempo. Com `PackedSpins`, `changed` é o OR acumulado
+        de s_t XOR s_0 em bytes e p_t vem do popcount. Objetos com
+        `iter_chunks()` (p.ex. `gcm.recorders.ChunkedTrajectory`, de estados)
+        são consumidos bloco a bloco.
 
     Retorna
     -------
     np.ndarray, shape (T,)
         Vetor p_t.
     """
+    if isinstance(spin_series, PackedSpins):
+        if spin_series.ndim != 2:
+            raise ValueError("spin_series deve ter shape (T, N).")
+        bits = spin_series.bits
+        changed = np.bitwise_or.accumulate(np.bitwise_xor(bits, bits[0]), axis=0)
+        return 1.0 - _popcount_rows(changed) / spin_series.N
+
+    acc = PersistenceAccumulator()
+    if hasattr(spin_series, "iter_chunks"):
+        if len(spin_series.shape) != 2:
+            raise ValueError("spin_series deve ter shape (T, N).")
+        for chunk in spin_series.iter_chunks():
+            acc.update(chunk)
+        return acc.curve()
+
     S = np.asarray(spin_series)
     if S.ndim != 2:
         raise ValueError("spin_series deve ter shape (T, N).")
-
-    T, N = S.shape
-    s0 = S[0]
-    changed = np.zeros(N, dtype=bool)
-    p = np.empty(T, dtype=float)
-    p[0] = 1.0  # no t=0 ninguém mudou
-
-    for t in range(1, T):
-        changed |= (S[t] != s0)
-        p[t] = 1.0 - changed.mean()
-
-    return p
+    acc.update(S)
+    return acc.curve()
 
 
 def sigma_mean(sigmas: np.ndarray) -> float:
@@ -138,3 +332,78 @@ def sigma_mean(sigmas: np.ndarray) -> float:
     sigmas = np.asarray(sigmas, dtype=float)
     return float(sigmas.mean())
 
+
+def _t_quantile(q: float, dof: np.ndarray) -> np.ndarray:
+    """Quantil q da t de Student (expansão de Cornish-Fisher em 1/ν; erro < 1% para ν >= 3)."""
+    z = NormalDist().inv_cdf(q)
+    nu = np.asarray(dof, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (z + (z**3 + z) / (4 * nu) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * nu**2)
+             + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * nu**3))
+    return np.where(nu >= 1, t, np.inf)
+
+
+class RunningStats:
+    """Média e variância online (Welford, com fusão de blocos de Chan et al.).
+
+    Vetorizado: mantém estatísticas independentes para cada posição de `shape`
+    (p.ex. um valor por ponto ε). Amostras não finitas (NaN/inf, p.ex. de
+    realizações que escaparam) são ignoradas e não contam em `n`.
+
+    Parâmetros
+    ----------
+    shape : int | tuple, padrão ()
+
+    Atributos
+    ---------
+    n : np.ndarray[int64]
+        Amostras finitas por posição.
+    mean : np.ndarray
+    var : np.ndarray
+        Variância amostral (ddof=1; NaN com n < 2).
+    sem : np.ndarray
+        Erro padrão da média, sqrt(var / n).
+    """
+
+    def __init__(self, shape: int | tuple = ()):
+        self.n = np.zeros(shape, dtype=np.int64)
+        self.mean = np.zeros(shape, dtype=float)
+        self._m2 = np.zeros(shape, dtype=float)
+
+    def update(self, samples: np.ndarray) -> None:
+        """Acrescenta um bloco de amostras, shape (B, *shape) (ou `shape`, uma amostra)."""
+        x = np.asarray(samples, dtype=float)
+        if x.shape == self.mean.shape:
+            x = x[None]
+        if x.shape[1:] != self.mean.shape:
+            raise ValueError(f"amostras devem ter shape (B, *{self.mean.shape}).")
+        ok = np.isfinite(x)
+        nb = ok.sum(axis=0)
+        xb = np.where(ok, x, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mb = np.where(nb > 0, xb.sum(axis=0) / nb, 0.0)
+        m2b = np.where(ok, (xb - mb) ** 2, 0.0).sum(axis=0)
+        n = self.n + nb
+        delta = mb - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.where(n > 0, nb / np.maximum(n, 1), 0.0)
+        self.mean = self.mean + delta * frac
+        self._m2 = self._m2 + m2b + delta**2 * self.n * frac
+        self.n = n
+
+    @property
+    def var(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.n > 1, self._m2 / (self.n - 1), np.nan)
+
+    @property
+    def sem(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(self.var / self.n)
+
+    def ci_halfwidth(self, confidence: float = 0.95) -> np.ndarray:
+        """Meia-largura do intervalo de confiança da média (t de Student; inf com n < 2)."""
+        if not 0.0 < confidence < 1.0:
+            raise ValueError("confidence deve estar em (0, 1).")
+        h = _t_quantile(0.5 + confidence / 2.0, self.n - 1) * self.sem
+        return np.where(self.n > 1, h, np.inf)
@@ -0,0 +1,624 @@
+"""
+gcm.observers
+=============
+Observadores "streaming" para `run(..., observers=[...])`: métricas atualizadas a
+cada passo, com memória O(N), sem materializar a trajetória (T, N).
+
+Protocolo (ver `Observer`):
+- `start(x)`: chamado uma vez, com o estado no início da janela observada;
+- `update(x, escaped)`: chamado após cada passo, com o novo estado e a máscara de
+  escape do passo (ou None, se o passo foi feito com `check_escape=False`).
+
+Todos os observadores aceitam estados (N,) de `GloballyCoupledMaps` e (R, N) de
+`GloballyCoupledMapsBatch`; as reduções são feitas no último eixo e os resultados
+são escalares (float) ou vetores (R,), respectivamente.
+
+Convenção de spins igual a `gcm.metrics.spins`: s_i = -1 se x_i < 0, senão +1.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+from .maps import bistable_intervals
+
+__all__ = [
+    "Observer",
+    "SigmaObserver",
+    "MagnetizationObserver",
+    "EscapeObserver",
+    "PersistenceObserver",
+    "CallbackObserver",
+    "LyapunovObserver",
+    "HistogramObserver",
+    "StopCriteria",
+    "StopMonitor",
+    "notify_start",
+    "notify_update",
+]
+
+
+def _squeeze(a: np.ndarray):
+    """(1,) -> float; (R, 1) -> (R,)."""
+    a = np.asarray(a)
+    if a.ndim <= 1:
+        return float(a.reshape(-1)[0])
+    return a[..., 0].copy()
+
+
+class Observer:
+    """Base dos observadores. Subclasses sobrescrevem `start` e `update`.
+
+    Atributos
+    ---------
+    n_steps : int
+        Número de passos observados desde o último `start`.
+    """
+
+    n_steps: int = 0
+
+    def start(self, x: np.ndarray) -> None:
+        self.n_steps = 0
+
+    def update(self, x: np.ndarray, escaped: np.ndarray | None) -> None:
+        self.n_steps += 1
+
+
+def notify_start(observers: Sequence[Observer], x: np.ndarray) -> None:
+    for obs in observers:
+        obs.start(x)
+
+
+def notify_update(observers: Sequence[Observer], x: np.ndarray, escaped: np.ndarray | None) -> None:
+    for obs in observers:
+        obs.update(x, escaped)
+
+
+class SigmaObserver(Observer):
+    """Acumula σ_t = std(x_t) ao longo da janela observada.
+
+    Parâmetros
+    ----------
+    keep_series : bool, padrão False
+        Se True, guarda também a série σ_t (memória O(T) por realização).
+
+    Atributos
+    ---------
+    mean : float | np.ndarray
+        σ̄ = média temporal de σ_t.
+    series : np.ndarray | None
+        Série σ_t, shape (T,) ou (T, R), se `keep_series=True`.
+    """
+
+    def __init__(self, keep_series: bool = False):
+        self.keep_series = keep_series
+        self._series: List[np.ndarray] = []
+
+    def start(self, x: np.ndarray) -> None:
+        super().start(x)
+        shape = x.shape[:-1] + (1,)
+        self._buf = np.empty(x.shape, dtype=x.dtype)
+        self._m = np.empty(shape, dtype=x.dtype)
+        self._sum = np.zeros(shape, dtype=float)
+        self._series = []
+
+    def update(self, x: np.ndarray, escaped: np.ndarray | None) -> None:
+        super().update(x, escaped)
+        m = self._m
+        np.mean(x, axis=-1, keepdims=True, out=m)
+        np.subtract(x, m, out=self._buf)
+        np.multiply(self._buf, self._buf, out=self._buf)
+        np.mean(self._buf, axis=-1, keepdims=True, out=m)
+        np.sqrt(m, out=m)
+        self._sum += m
+        if self.keep_series:
+            self._series.append(_squeeze(m))
+
+    @property
+    def mean(self):
+        return _squeeze(self._sum / max(self.n_steps, 1))
+
+    @property
+    def series(self) -> np.ndarray | None:
+        return np.asarray(self._series, dtype=float) if self.keep_series else None
+
+
+class MagnetizationObserver(Observer):
+    """Acumula M_t = (1/N) Σ s_i e devolve |<M>| (como `order_param_M`).
+
+    Parâmetros
+    ----------
+    keep_series : bool, padrão False
+        Se True, guarda a série M_t.
+
+    Atributos
+    ---------
+    mean : float | np.ndarray
+        <M> (média temporal com sinal).
+    order_param : float | np.ndarray
+        |<M>|.
+    mean_abs : float | np.ndarray
+        <|M|>.
+    """
+
+    def __init__(self, keep_series: bool = False):
+        self.keep_series = keep_series
+        self._series: List[np.ndarray] = []
+
+    def start(self, x: np.ndarray) -> None:
+        super().start(x)
+        shape = x.shape[:-1] + (1,)
+        self._neg = np.empty(x.shape, dtype=bool)
+        self._N = x.shape[-1]
+        self._sum = np.zeros(shape, dtype=float)
+        self._sum_abs = np.zeros(shape, dtype=float)
+        self._series = []
+
+    def update(self, x: np.ndarray, escaped: np.ndarray | None) -> None:
+        super().update(x, escaped)
+        np.less(x, 0.0, out=self._neg)
+        n_neg = np.count_nonzero(self._neg, axis=-1).reshape(self._sum.shape)
+        M = 1.0 - 2.0 * n_neg / self._N
+        self._sum += M
+        self._sum_abs += np.abs(M)
+        if self.keep_series:
+            self._series.append(_squeeze(M))
+
+    @property
+    def mean(self):
+        return _squeeze(self._sum / max(self.n_steps, 1))
+
+    @property
+    def order_param(self):
+        return _squeeze(np.abs(self._sum) / max(self.n_steps, 1))
+
+    @property
+    def mean_abs(self):
+        return _squeeze(self._sum_abs / max(self.n_steps, 1))
+
+    @property
+    def series(self) -> np.ndarray | None:
+        return np.asarray(self._series, dtype=float) if self.keep_series else None
+
+
+class EscapeObserver(Observer):
+    """Conta passos com escape (algum |x_i| > 1).
+
+    Usa a máscara de escape do passo; se ela não existir (`check_escape=False`),
+    calcula |x| > 1 em um buffer próprio.
+
+    Atributos
+    ---------
+    escaped_steps : int | np.ndarray
+        Nº de passos com escape.
+    frac : float | np.ndarray
+        Fração de passos com escape (mesma definição de `ScanResult.escaped_frac`).
+    """
+
+    def start(self, x: np.ndarray) -> None:
+        super().start(x)
+        self._mask = np.empty(x.shape, dtype=bool)
+        self._abs = np.empty(x.shape, dtype=x.dtype)
+        self._count = np.zeros(x.shape[:-1], dtype=np.int64)
+
+    def update(self, x: np.ndarray, escaped: np.ndarray | None) -> None:
+        super().update(x, escaped)
+        if escaped is None:
+            np.abs(x, out=self._abs)
+            np.less_equal(self._abs, 1.0, out=self._mask)
+            np.logical_not(self._mask, out=self._mask)
+            escaped = self._mask
+        self._count += np.any(escaped, axis=-1)
+
+    @property
+    def escaped_steps(self):
+        c = self._count
+        return int(c) if c.ndim == 0 else c.copy()
+
+    @property
+    def frac(self):
+        f = self._count / float(max(self.n_steps, 1))
+        return float(f) if f.ndim == 0 else f
+
+
+class PersistenceObserver(Observer):
+    """Persistência online: bitset `changed` de quem já trocou de sinal desde `start`.
+
+    p(t) = 1 - mean(changed), com o spin de referência tomado no início da janela
+    (mesma definição de `persistence_curve`, cujo p_0 = 1).
+
+    Parâmetros
+    ----------
+    keep_curve : bool, padrão False
+        Se True, guarda p_t a cada passo (memória O(T)).
+
+    Atributos
+    ---------
+    changed : np.ndarray[bool]
+        Bitset (N,) ou (R, N).
+    p : float | np.ndarray
+        Persistência no último passo observado.
+    curve : np.ndarray | None
+        [1, p_1, ..., p_T] se `keep_curve=True`.
+    """
+
+    def __init__(self, keep_curve: bool = False):
+        self.keep_curve = keep_curve
+        self._curve: List = []
+
+    def start(self, x: np.ndarray) -> None:
+        super().start(x)
+        self._s0 = np.less(x, 0.0)
+        self.changed = np.zeros(x.shape, dtype=bool)
+        self._buf = np.empty(x.shape, dtype=bool)
+        self._curve = [self.p] if self.keep_curve else []
+
+    def update(self, x: np.ndarray, escaped: np.ndarray | None) -> None:
+        super().update(x, escaped)
+        np.less(x, 0.0, out=self._buf)
+        np.not_equal(self._buf, self._s0, out=self._buf)
+        np.logical_or(self.changed, self._buf, out=self.changed)
+        if self.keep_curve:
+            self._curve.append(self.p)
+
+    @property
+    def p(self):
+        frac = np.count_nonzero(self.changed, axis=-1) / self.changed.shape[-1]
+        p = 1.0 - frac
+        return float(p) if np.ndim(p) == 0 else p
+
+    @property
+    def curve(self) -> np.ndarray | None:
+        return np.asarray(self._curve, dtype=float) if self.keep_curve else None
+
+
+class CallbackObserver(Observer):
+    """Chama `fn(t, x, escaped)` a cada `every` passos (t conta a partir de 1).
+
+    `x` é o buffer de estado do sistema: copie-o se precisar guardá-lo.
+    """
+
+    def __init__(self, fn: Callable[[int, np.ndarray, np.ndarray | None], None], every: int = 1):
+        if every <= 0:
+            raise ValueError("every deve ser positivo.")
+        self.fn = fn
+        self.every = int(every)
+
+    def update(self, x: np.ndarray, escaped: np.ndarray | None) -> None:
+        super().update(x, escaped)
+        if self.n_steps % self.every == 0:
+            self.fn(self.n_steps, x, escaped)
+
+
+class LyapunovObserver(Observer):
+    """Expoentes de Lyapunov estimados online pelo espaço tangente (sem guardar a trajetória).
+
+    O jacobiano do passo é J = (1 - ε) D + (ε/N) 1 f'ᵀ, com D = diag(f'(x_i)) e
+    f' = μ em |x| < 1/3, -μ fora. Com o ramo de cada sítio antes do passo, acumula:
+
+    - local: <ln|f'(x_i)|>; como |f'| = |μ| em todos os ramos, acumula ln|μ| por passo;
+    - transverse: taxa de crescimento de um vetor tangente w com Σ w_i = 0 sob
+      w ← (1 - ε) P D w (P remove a média; a parte do acoplamento cai na projeção),
+      renormalizado a cada passo. É o λ⊥ verdadeiro só sobre a variedade
+      sincronizada (D ∝ I, span(1) invariante): no estado sincronizado vale
+      ln|1 - ε| + ln|μ|. Se em algum passo medido a largura max(x) - min(x)
+      passou de `sync_tol`, o valor é NaN (a projeção não mede λ⊥ fora da
+      sincronização; `synced_frac` dá a fração de passos sincronizados);
+    - collective: <ln|mean_i f'(x_i)|> = <ln|μ (2 n_in/N - 1)|>, com n_in os sítios
+      em |x| < 1/3: modo uniforme (x_i → x_i + δ), ln|μ| no estado sincronizado.
+
+    Custo por passo: ~9 passagens de tamanho N (máscara de ramo, vetor w e largura),
+    sem alocações.
+
+    Parâmetros
+    ----------
+    eps, mu : float | np.ndarray
+        Parâmetros do sistema observado; com lote (R, N), vetores (R,). Arrays são
+        lidos a cada passo, logo `GloballyCoupledMapsBatch.eps`/`mu` podem ser
+        passados diretamente (e seguem `set_eps`/`set_mu`).
+    seed : int | None, padrão 0
+        Semente do vetor tangente inicial.
+    sync_tol : float, padrão 1e-6
+        Largura máxima max(x) - min(x) para um passo contar como sincronizado.
+
+    Atributos
+    ---------
+    local, transverse, collective : float | np.ndarray
+        Médias temporais (escalares ou (R,)). `transverse` é -inf se ε = 1 e NaN
+        fora da sincronização.
+    synced_frac : float | np.ndarray
+        Fração dos passos medidos com largura <= `sync_tol`.
+    """
+
+    def __init__(self, eps, mu, *, seed: int | None = 0, sync_tol: float = 1e-6):
+        self.eps = eps
+        self.mu = mu
+        self.seed = seed
+        self.sync_tol = float(sync_tol)
+
+    def _col(self, a, x: np.ndarray) -> np.ndarray:
+        return np.reshape(np.asarray(a, dtype=float), x.shape[:-1] + (1,))
+
+    def start(self, x: np.ndarray) -> None:
+        super().start(x)
+        shape = x.shape[:-1] + (1,)
+        self._in = np.empty(x.shape, dtype=bool)
+        self._d = np.empty(x.shape, dtype=x.dtype)
+        self._branch(x)
+        w = np.random.default_rng(self.seed).standard_normal(x.shape).astype(x.dtype)
+        w -= w.mean(axis=-1, keepdims=True)
+        w /= np.sqrt(np.mean(w * w, axis=-1, keepdims=True))
+        self._w = w
+        self._m = np.empty(shape, dtype=x.dtype)
+        self._sum_local = np.zeros(shape, dtype=float)
+        self._sum_trans = np.zeros(shape, dtype=float)
+        self._sum_coll = np.zeros(shape, dtype=float)
+        self._lo = np.empty(shape, dtype=x.dtype)
+        self._hi = np.empty(shape, dtype=x.dtype)
+        self._n_synced = np.zeros(shape, dtype=np.int64)
+
+    def update(self, x: np.ndarray, escaped: np.ndarray | None) -> None:
+        super().update(x, escaped)
+        mu = self._col(self.mu, x)
+        w, m, inner = self._w, self._m, self._in
+        N = x.shape[-1]
+        # `inner` guarda o ramo de x_{t-1}: f' = μ dentro de |x| < 1/3, -μ fora
+        frac_in = np.count_nonzero(inner, axis=-1).reshape(m.shape) / N
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._sum_local += np.log(np.abs(mu))
+            self._sum_coll += np.log(np.abs(mu * (2.0 * frac_in - 1.0)))
+            # vetor transverso: w ← (1 - ε) P D w, com D = μ (2·inner - 1)
+            g = ((1.0 - self._col(self.eps, x)) * mu).astype(w.dtype)
+            np.multiply(inner, 2.0 * g, out=self._d)
+            self._d -= g
+            w *= self._d
+            np.mean(w, axis=-1, keepdims=True, out=m)
+            w -= m
+            norm = np.sqrt(np.einsum("...i,...i->...", w, w) / N)[..., None]
+            self._sum_trans += np.log(norm)
+            w /= np.where(norm > 0, norm, 1.0).astype(w.dtype)
+        np.min(x, axis=-1, keepdims=True, out=self._lo)
+        np.max(x, axis=-1, keepdims=True, out=self._hi)
+        self._hi -= self._lo
+        self._n_synced += self._hi <= self.sync_tol
+        self._branch(x)
+
+    def _branch(self, x: np.ndarray) -> None:
+        np.abs(x, out=self._d)
+        np.less(self._d, 1.0 / 3.0, out=self._in)
+
+    def _avg(self, total: np.ndarray):
+        return _squeeze(total / max(self.n_steps, 1))
+
+    @property
+    def local(self):
+        return self._avg(self._sum_local)
+
+    @property
+    def transverse(self):
+        synced = self._n_synced == self.n_steps
+        return self._avg(np.where(synced, self._sum_trans, np.nan))
+
+    @property
+    def synced_frac(self):
+        return self._avg(self._n_synced.astype(float))
+
+    @property
+    def collective(self):
+        return self._avg(self._sum_coll)
+
+
+class HistogramObserver(Observer):
+    """Histograma acumulado de x em bins fixos (densidade invariante média no tempo).
+
+    Cada passo soma as N contagens do estado: índice do bin por aritmética
+    ((x - lo)/h, piso e corte) em buffers próprios e um único `np.add.at` na
+    tabela de contagens; em lotes (R, N) os índices recebem o deslocamento
+    r·(n_bins + 2), então todas as linhas saem da mesma chamada. Custo O(N) por
+    passo, sem alocações por passo.
+
+    Bins semiabertos [e_k, e_{k+1}); valores < lo vão para `underflow` e valores
+    >= hi (inclusive NaN/inf após escape), para `overflow`.
+
+    Parâmetros
+    ----------
+    n_bins : int, padrão 200
+    bounds : (float, float), padrão (-1.0, 1.0)
+    mu : float | np.ndarray | None, padrão None
+        Se dado (1 < |μ| < 2; vetor (R,) em lotes), acumula também a ocupação dos
+        intervalos biestáveis I₊ e I₋ (`gcm.maps.bistable_intervals`).
+
+    Atributos
+    ---------
+    edges, centers : np.ndarray, shape (n_bins + 1,) e (n_bins,)
+    counts : np.ndarray[int64], shape (n_bins,) ou (R, n_bins)
+    underflow, overflow : int | np.ndarray
+    density : np.ndarray
+        counts / (n_steps · N · h): integra à fração de amostras dentro de `bounds`.
+    occupancy_plus, occupancy_minus : float | np.ndarray
+        Fração média de sítios em I₊ / I₋ (com `mu`).
+    """
+
+    def __init__(self, n_bins: int = 200, *, bounds: tuple = (-1.0, 1.0), mu=None):
+        lo, hi = map(float, bounds)
+        if n_bins <= 0 or not hi > lo:
+            raise ValueError("exige n_bins > 0 e bounds = (lo, hi) com lo < hi.")
+        self.n_bins = int(n_bins)
+        self.bounds = (lo, hi)
+        self.mu = mu
+        self.edges = np.linspace(lo, hi, self.n_bins + 1)
+        self.centers = 0.5 * (self.edges[:-1] + self.edges[1:])
+
+    def start(self, x: np.ndarray) -> None:
+        super().start(x)
+        R = int(np.prod(x.shape[:-1], dtype=np.int64))
+        nb = self.n_bins + 2  # underflow, n_bins, overflow
+        self._N = x.shape[-1]
+        self._f = np.empty(x.shape, dtype=x.dtype)
+        self._i = np.empty(x.shape, dtype=np.intp)
+        self._offset = (np.arange(R, dtype=np.intp) * nb).reshape(x.shape[:-1] + (1,))
+        self._counts = np.zeros(R * nb, dtype=np.int64)
+        if self.mu is not None:
+            mus = np.broadcast_to(np.asarray(self.mu, dtype=float), x.shape[:-1]).reshape(-1)
+            lim = np.array([[*i_minus, *i_plus] for i_minus, i_plus in map(bistable_intervals, mus)])
+            self._lim = lim.reshape(x.shape[:-1] + (1, 4)).astype(x.dtype)
+            self._b = np.empty(x.shape, dtype=bool)
+            self._c = np.empty(x.shape, dtype=bool)
+            self._occ = np.zeros((2,) + x.shape[:-1], dtype=np.int64)
+
+    def update(self, x: np.ndarray, escaped: np.ndarray | None) -> None:
+        super().update(x, escaped)
+        lo, hi = self.bounds
+        f, i = self._f, self._i
+        # f = (x - lo)/h + 1: bin k (0-based) → k + 1; < lo → 0; >= hi (e NaN) → n_bins + 1
+        scale = self.n_bins / (hi - lo)
+        np.multiply(x, scale, out=f)
+        f += 1.0 - lo * scale
+        np.fmin(f, self.n_bins + 1, out=f)
+        np.fmax(f, 0.0, out=f)
+        np.copyto(i, f, casting="unsafe")  # truncar = piso, pois f >= 0
+        i += self._offset
+        np.add.at(self._counts, i.reshape(-1), 1)
+        if self.mu is not None:
+            b, c, lim = self._b, self._c, self._lim
+            for k, (a, z) in enumerate(((2, 3), (0, 1))):  # I₊, I₋
+                np.greater_equal(x, lim[..., a], out=b)
+                np.less_equal(x, lim[..., z], out=c)
+                b &= c
+                # por linha: count_nonzero(axis=-1) aloca um buffer temporário
+                occ = self._occ.reshape(2, -1)[k]
+                for r, row in enumerate(b.reshape(-1, b.shape[-1])):
+                    occ[r] += np.count_nonzero(row)
+
+    def _table(self) -> np.ndarray:
+        return self._counts.reshape(self._offset.shape[:-1] + (self.n_bins + 2,))
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._table()[..., 1:-1].copy()
+
+    @property
+    def underflow(self):
+        u = self._table()[..., 0]
+        return int(u) if u.ndim == 0 else u.copy()
+
+    @property
+    def overflow(self):
+        o = self._table()[..., -1]
+        return int(o) if o.ndim == 0 else o.copy()
+
+    @property
+    def density(self) -> np.ndarray:
+        h = (self.bounds[1] - self.bounds[0]) / self.n_bins
+        return self.counts / (max(self.n_steps, 1) * self._N * h)
+
+    def _occupancy(self, k: int):
+        if self.mu is None:
+            raise AttributeError("ocupação de I± exige HistogramObserver(mu=...).")
+        occ = self._occ[k] / (max(self.n_steps, 1) * self._N)
+        return float(occ) if occ.ndim == 0 else occ
+
+    @property
+    def occupancy_plus(self):
+        return self._occupancy(0)
+
+    @property
+    def occupancy_minus(self):
+        return self._occupancy(1)
+
+
+# ------------------------------ parada antecipada ------------------------------ #
+
+STOP_SYNCED = "synced"
+STOP_STATIONARY = "stationary"
+STOP_ESCAPED = "escaped"
+
+
+@dataclass(frozen=True)
+class StopCriteria:
+    """Critérios de parada antecipada para `run(..., stop=...)` e varreduras.
+
+    Parâmetros
+    ----------
+    sigma_tol : float | None, padrão 1e-12
+        Para com razão "synced" se σ_t < sigma_tol por `patience` passos seguidos.
+        None desliga.
+    stationary_tol : float | None, padrão 1e-12
+        Para com razão "stationary" se max|x_t - x_{t-1}| < stationary_tol por
+        `patience` passos seguidos (ponto fixo, p.ex. x = 0). None desliga.
+    on_escape : bool, padrão True
+        Para com razão "escaped" assim que algum |x_i| > 1 (ou não finito).
+    patience : int, padrão 10
+        Passos consecutivos exigidos pelos critérios de σ e estacionariedade.
+
+    Observação
+    ----------
+    Estado estacionário tem precedência sobre "synced" (x = 0 satisfaz ambos).
+    """
+
+    sigma_tol: Optional[float] = 1e-12
+    stationary_tol: Optional[float] = 1e-12
+    on_escape: bool = True
+    patience: int = 10
+
+    def __post_init__(self) -> None:
+        if self.patience <= 0:
+            raise ValueError("patience deve ser positivo.")
+
+
+class StopMonitor(Observer):
+    """Avalia `StopCriteria` a cada passo (estado (N,)); `reason` deixa de ser None ao parar.
+
+    Atributos
+    ---------
+    reason : str | None
+        "synced", "stationary", "escaped" ou None.
+    last_sigma : float
+        σ_t do último passo (NaN se o critério de σ estiver desligado).
+    """
+
+    def __init__(self, criteria: StopCriteria):
+        self.criteria = criteria
+        self.reason: str | None = None
+        self.last_sigma = float("nan")
+
+    def start(self, x: np.ndarray) -> None:
+        super().start(x)
+        self.reason = None
+        self.last_sigma = float("nan")
+        self._buf = np.empty(x.shape, dtype=x.dtype)
+        self._mask = np.empty(x.shape, dtype=bool) if self.criteria.on_escape else None
+        self._prev = np.array(x, copy=True) if self.criteria.stationary_tol is not None else None
+        self._n_sync = 0
+        self._n_stat = 0
+
+    def update(self, x: np.ndarray, escaped: np.ndarray | None) -> None:
+        super().update(x, escaped)
+        c = self.criteria
+        buf = self._buf
+        if c.on_escape:
+            np.abs(x, out=buf)
+            # NaN também conta como escape (|x| <= 1 é falso)
+            np.less_equal(buf, 1.0, out=self._mask)
+            if not self._mask.all():
+                self.reason = STOP_ESCAPED
+                return
+        if c.stationary_tol is not None:
+            np.subtract(x, self._prev, out=buf)
+            np.abs(buf, out=buf)
+            self._n_stat = self._n_stat + 1 if buf.max() < c.stationary_tol else 0
+            self._prev[...] = x
+            if self._n_stat >= c.patience:
+                self.reason = STOP_STATIONARY
+                return
+        if c.sigma_tol is not None:
+            m = x.mean()
+            np.subtract(x, m, out=buf)
+            np.multiply(buf, buf, out=buf)
+            self.last_sigma = float(np.sqrt(buf.mean()))
+            self._n_sync = self._n_sync + 1 if self.last_sigma < c.sigma_tol else 0
+            if self._n_sync >= c.patience:
+                self.reason = STOP_SYNCED
@@ -0,0 +1,194 @@
+"""
+gcm.plotting
+============
+Figuras das varreduras (σ̄(ε), diagrama de fases (μ, ε) e raster de spins).
+
+Separado de `gcm.analysis` para que importar o pacote (processos de varredura,
+CLIs curtas) não carregue `matplotlib`: este módulo só é importado quando uma
+função de gráfico é usada. `gcm.analysis.plot_*` continua funcionando (import
+sob demanda via `__getattr__` do módulo).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from .analysis import (
+    PHASE_COLORS,
+    PHASE_LABELS,
+    PhaseDiagramResult,
+    ScanResult,
+    _ensure_parent,
+    theory_boundaries,
+)
+from .metrics import PackedSpins
+
+__all__ = ["plot_sigma_vs_eps", "plot_phase_diagram", "plot_spin_raster"]
+
+
+def plot_sigma_vs_eps(
+    result: ScanResult,
+    *,
+    outpath: str | Path | None = None,
+    show: bool = False,
+) -> Path | None:
+    """Gera o gráfico σ̄(ε) com linhas verticais nas fronteiras teóricas.
+
+    Parâmetros
+    ----------
+    result : ScanResult
+    outpath : str | Path | None, padrão None
+        Se fornecido, salva a figura em `outpath`. Diretórios pais serão criados.
+    show : bool, padrão False
+        Se True, exibe a figura (bloqueante em alguns ambientes locais).
+
+    Retorna
+    -------
+    Path | None
+        Caminho salvo, se `outpath` não for None.
+    """
+    bounds = theory_boundaries(result.mu)
+    eps_sync_inf, eps_sync_sup = bounds["eps_sync"]
+    eps_esc_low, eps_esc_high = bounds["eps_escape"]
+
+    fig, ax = plt.subplots(figsize=(7.5, 4.5))
+    ax.plot(result.eps_grid, result.sigma_mean, marker="o", lw=1.5, ms=4, label=r"$\overline{\sigma}$")
+    ax.set_xlabel(r"$\varepsilon$")
+    ax.set_ylabel(r"$\overline{\sigma}$")
+    ax.grid(True, alpha=0.25)
+
+    # Linhas de referência (sincronização e escape)
+    for x, ls, lab in [
+        (eps_sync_inf, "--", "sync (inf)"),
+        (eps_sync_sup, "--", "sync (sup)"),
+        (eps_esc_low, ":", "escape (low)"),
+        (eps_esc_high, ":", "escape (high)"),
+    ]:
+        if np.isfinite(x):
+            ax.axvline(x, linestyle=ls, alpha=0.7, label=lab)
+
+    ax.legend(loc="best", frameon=True)
+
+    saved_path: Path | None = None
+    if outpath is not None:
+        saved_path = Path(outpath)
+        _ensure_parent(saved_path)
+        fig.tight_layout()
+        fig.savefig(saved_path, dpi=200)
+    if show:
+        plt.show()
+    plt.close(fig)
+    return saved_path
+
+
+def plot_phase_diagram(
+    result: PhaseDiagramResult,
+    *,
+    outpath: str | Path | None = None,
+    show: bool = False,
+) -> Path | None:
+    """Pontos classificados no plano (μ, ε) sobrepostos às fronteiras teóricas.
+
+    As curvas vêm de `theory_boundaries(μ)` em uma grade fina de μ:
+    sincronização (1 - ε)|μ| = 1 (tracejado) e escape (1 - ε)μ = ±3 (pontilhado).
+
+    Parâmetros
+    ----------
+    result : PhaseDiagramResult
+    outpath : str | Path | None, padrão None
+    show : bool, padrão False
+
+    Retorna
+    -------
+    Path | None
+        Caminho salvo, se `outpath` não for None.
+    """
+    fig, ax = plt.subplots(figsize=(7.5, 5.0))
+    MU, EPS = np.meshgrid(result.mu_grid, result.eps_grid, indexing="ij")
+    for lab in PHASE_LABELS:
+        sel = result.labels == lab
+        if sel.any():
+            ax.scatter(MU[sel], EPS[sel], s=14, color=PHASE_COLORS[lab], label=lab)
+
+    # curvas teóricas, separadas em μ<0 e μ>0 (singularidade em μ=0)
+    mus = np.linspace(float(result.mu_grid.min()), float(result.mu_grid.max()), 400)
+    mus = mus[np.abs(mus) > 1e-3]
+    curves = np.array([[*b["eps_sync"], *b["eps_escape"]] for b in map(theory_boundaries, mus)]).reshape(-1, 4)
+    labeled = False
+    for side in (mus < 0, mus > 0):
+        if not side.any():
+            continue
+        for j, (ls, lab) in enumerate([("--", "sync"), ("--", None), (":", "escape"), (":", None)]):
+            ax.plot(mus[side], curves[side, j], ls=ls, color="k", lw=1.0, alpha=0.7,
+                    label=None if labeled else lab)
+        labeled = True
+
+    eps_min, eps_max = float(result.eps_grid.min()), float(result.eps_grid.max())
+    pad = 0.05 * max(eps_max - eps_min, 1e-9)
+    ax.set_ylim(eps_min - pad, eps_max + pad)
+    ax.set_xlabel(r"$\mu$")
+    ax.set_ylabel(r"$\varepsilon$")
+    ax.grid(True, alpha=0.25)
+    ax.legend(loc="best", frameon=True, fontsize=8)
+
+    saved_path: Path | None = None
+    if outpath is not None:
+        saved_path = Path(outpath)
+        _ensure_parent(saved_path)
+        fig.tight_layout()
+        fig.savefig(saved_path, dpi=200)
+    if show:
+        plt.show()
+    plt.close(fig)
+    return saved_path
+
+
+def plot_spin_raster(
+    spin_series: np.ndarray | PackedSpins,
+    *,
+    title: str | None = None,
+    outpath: str | Path | None = None,
+    show: bool = False,
+) -> Path | None:
+    """Raster de spins (tempo × índice do sítio).
+
+    Parâmetros
+    ----------
+    spin_series : np.ndarray (T, N) de spins ±1, ou PackedSpins (T, N)
+        `PackedSpins` é expandido só para bits 0/1 em uint8 (1 byte por sítio).
+    title : str | None, padrão None
+    outpath : str | Path | None, padrão None
+    show : bool, padrão False
+
+    Retorna
+    -------
+    Path | None
+        Caminho salvo, se `outpath` não for None.
+    """
+    if isinstance(spin_series, PackedSpins):
+        img = np.unpackbits(spin_series.bits, axis=-1, count=spin_series.N)
+    else:
+        img = np.asarray(spin_series) > 0
+    if img.ndim != 2:
+        raise ValueError("spin_series deve ter shape (T, N).")
+
+    fig, ax = plt.subplots(figsize=(7.2, 3.2))
+    ax.imshow(img.T, aspect="auto", origin="lower", interpolation="nearest", cmap="gray_r", vmin=0, vmax=1)
+    ax.set_xlabel("t")
+    ax.set_ylabel("índice i")
+    if title:
+        ax.set_title(title)
+
+    saved_path: Path | None = None
+    if outpath is not None:
+        saved_path = Path(outpath)
+        _ensure_parent(saved_path)
+        fig.tight_layout()
+        fig.savefig(saved_path, dpi=160)
+    if show:
+        plt.show()
+    plt.close(fig)
+    return saved_path
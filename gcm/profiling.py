@@ -0,0 +1,196 @@
+"""
+gcm.profiling
+=============
+Instrumentação opcional do laço quente: cronômetros por fase, contadores, taxa de
+passos e estatísticas de alocação.
+
+Desligada (padrão), o custo é uma leitura de `_ACTIVE` por chamada de `step`/`run`
+mais um teste `prof is not None` por fronteira de fase em `step` (cinco, ~0,1 µs
+por passo no total). Ligada com o gerenciador de contexto `profiling()`:
+
+- `GloballyCoupledMaps.step` mede as fases "step.map" (f(x)), "step.mean"
+  (redução), "step.update" ((1-ε)y + εm) e "step.escape" (máscara |x| > 1), e
+  conta "steps" e "site_updates" (N por passo);
+- `run` mede "run" (inteiro) e "run.backend" (laços de backend, p.ex. numba, onde
+  não há fases);
+- `scan_eps`/`scan_eps_adaptive` medem "scan_eps.point" (por ponto, inclusive em
+  processos filhos), "scan_eps.measure" (burn-in + medição no backend),
+  "scan_eps.store" e "scan_eps.checkpoint", e anexam o relatório da varredura em
+  `ScanResult.meta["profile"]`.
+
+O relatório (`Profiler.report()`) é um dict JSON-serializável; "run.other" (tempo
+de `run` fora de `step`: observadores, gravadores, parada, despacho Python) é
+derivado. `format_report` dá uma tabela de texto.
+
+Exemplo
+-------
+>>> with profiling(track_alloc=True) as prof:
+...     res = scan_eps(1.9, eps_grid, N=4096)
+>>> print(format_report(res.meta["profile"]))
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping
+
+__all__ = ["Profiler", "profiling", "active", "format_report"]
+
+# Profiler ativo (None = instrumentação desligada). Lido diretamente pelo laço quente.
+_ACTIVE: "Profiler | None" = None
+# Blocos `profiling(track_alloc=True)` abertos: [profiler, pico absoluto visto antes de cada reset_peak]
+_ALLOC_STACK: list = []
+
+
+class Profiler:
+    """Acumulador de tempos (por nome) e contadores.
+
+    Parâmetros
+    ----------
+    track_alloc : bool, padrão False
+        Se True, `profiling()` liga `tracemalloc` (alocações do NumPy incluídas) e
+        o relatório traz o pico e o saldo de memória.
+
+    Atributos
+    ---------
+    timers : dict[str, list[float, int]]
+        nome → [tempo total (s), nº de chamadas].
+    counters : dict[str, float]
+    alloc : dict[str, float]
+        "peak_mb" e "net_mb" (com `track_alloc`).
+    """
+
+    def __init__(self, track_alloc: bool = False):
+        self.track_alloc = track_alloc
+        self.timers: Dict[str, list] = {}
+        self.counters: Dict[str, float] = {}
+        self.alloc: Dict[str, float] = {}
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        entry = self.timers.get(name)
+        if entry is None:
+            self.timers[name] = [seconds, calls]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+
+    def count(self, name: str, n: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - t0)
+
+    def merge(self, other: "Profiler | Mapping[str, Any]") -> None:
+        """Soma tempos e contadores de outro `Profiler` ou de um `report()`."""
+        rep = other.report() if isinstance(other, Profiler) else other
+        for name, t in rep.get("timers", {}).items():
+            if name in _DERIVED:
+                continue
+            self.add_time(name, t["total_s"], t["calls"])
+        for name, n in rep.get("counters", {}).items():
+            self.count(name, n)
+        if rep.get("alloc"):
+            self.alloc["peak_mb"] = max(self.alloc.get("peak_mb", 0.0), rep["alloc"].get("peak_mb", 0.0))
+            self.alloc["net_mb"] = self.alloc.get("net_mb", 0.0) + rep["alloc"].get("net_mb", 0.0)
+
+    def report(self) -> Dict[str, Any]:
+        """Relatório JSON-serializável.
+
+        Retorna
+        -------
+        dict
+            "timers": {nome: {"total_s", "calls", "mean_us"}} (inclui "run.other"
+            derivado), "counters", "steps_per_s" (passos / tempo em `run`; sem
+            `run`, em "scan_eps.measure" ou `step`) e "alloc".
+        """
+        timers = {k: [v[0], v[1]] for k, v in self.timers.items()}
+        if "run" in timers and "step" in timers:
+            timers["run.other"] = [max(timers["run"][0] - timers["step"][0], 0.0), timers["run"][1]]
+        steps = self.counters.get("steps", 0)
+        wall = next((timers[k][0] for k in ("run", "scan_eps.measure", "step") if k in timers), 0.0)
+        return dict(
+            timers={
+                k: dict(total_s=t, calls=int(c), mean_us=1e6 * t / c if c else 0.0)
+                for k, (t, c) in sorted(timers.items())
+            },
+            counters=dict(self.counters),
+            steps_per_s=steps / wall if wall > 0 else None,
+            alloc=dict(self.alloc),
+        )
+
+    def save(self, path: str | Path) -> Path:
+        """Grava `report()` em JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        return path
+
+
+_DERIVED = ("run.other",)
+
+
+def active() -> Profiler | None:
+    """Profiler ativo (ou None, se a instrumentação está desligada)."""
+    return _ACTIVE
+
+
+@contextmanager
+def profiling(track_alloc: bool = False) -> Iterator[Profiler]:
+    """Liga a instrumentação dentro do bloco e devolve o `Profiler`.
+
+    Blocos aninhados usam um `Profiler` próprio; o anterior é restaurado na saída
+    (sem somar automaticamente: use `Profiler.merge`). Com `track_alloc`, o pico de
+    um bloco externo inclui o dos blocos internos: o `reset_peak` de um bloco
+    interno guarda antes o pico já visto pelos externos.
+    """
+    global _ACTIVE
+    prof = Profiler(track_alloc=track_alloc)
+    prev = _ACTIVE
+    started = False
+    if track_alloc:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started = True
+        seen = tracemalloc.get_traced_memory()[1]
+        for entry in _ALLOC_STACK:
+            entry[1] = max(entry[1], seen)
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        entry = [prof, base]
+        _ALLOC_STACK.append(entry)
+    _ACTIVE = prof
+    try:
+        yield prof
+    finally:
+        _ACTIVE = prev
+        if track_alloc:
+            _ALLOC_STACK.remove(entry)
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, entry[1])
+            prof.alloc = dict(peak_mb=(peak - base) / 2**20, net_mb=(current - base) / 2**20)
+            if started:
+                tracemalloc.stop()
+
+
+def format_report(report: Profiler | Mapping[str, Any]) -> str:
+    """Tabela de texto (tempos ordenados do maior para o menor)."""
+    rep = report.report() if isinstance(report, Profiler) else report
+    lines = [f"{'fase':<22s} {'total (s)':>11s} {'chamadas':>10s} {'média (µs)':>12s}"]
+    for name, t in sorted(rep["timers"].items(), key=lambda kv: -kv[1]["total_s"]):
+        lines.append(f"{name:<22s} {t['total_s']:11.4f} {t['calls']:10d} {t['mean_us']:12.2f}")
+    for name, n in sorted(rep["counters"].items()):
+        lines.append(f"{name:<22s} {n:>11g}")
+    if rep.get("steps_per_s"):
+        lines.append(f"{'passos/s':<22s} {rep['steps_per_s']:11.1f}")
+    if rep.get("alloc"):
+        lines.append(f"{'memória (MB)':<22s} pico {rep['alloc']['peak_mb']:.2f}, saldo {rep['alloc']['net_mb']:.2f}")
+    return "\n".join(lines)
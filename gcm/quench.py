@@ -0,0 +1,349 @@
+"""
+gcm.quench
+==========
+Quenches a partir de uma biblioteca de estados preparados (snapshots).
+
+Em vez de refazer a preparação (rampa até ε_prep) a cada quench, como o
+`prepare_state_to_eps` do notebook 03, cada estado é preparado uma vez por
+(μ, ε_prep, protocolo, semente, N, dtype) e guardado em `SnapshotLibrary`:
+
+- em memória (dict chave → `state_dict`), e
+- opcionalmente em disco, num `gcm.store.ResultsStore` (protocolo
+  "quench_snapshot": estado x em blob, RNG e `Config` em JSON; chave de conteúdo
+  `result_key` e consultas por μ, ε, N, semente e parâmetros da preparação).
+
+`quench(...)` leva cada snapshot a muitos ε alvo de uma vez: um lote
+`GloballyCoupledMapsBatch` (K alvos, N) por snapshot, medido por observadores.
+O custo cresce com o nº de alvos, não com alvos × comprimento da preparação.
+
+Exemplo
+-------
+>>> lib = SnapshotLibrary("data/snapshots.sqlite")
+>>> up = Preparation(eps_start=0.05)                  # ε↑: rampa desde 0,05
+>>> res = quench(lib, 1.9, 0.47, np.linspace(0.40, 0.55, 16), 4096, prep=up, seeds=[1, 2, 3])
+>>> res.M_bar.shape                                    # (sementes, alvos)
+(3, 16)
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+
+import numpy as np
+
+from .analysis import _map_points
+from .core import Config, GloballyCoupledMaps, GloballyCoupledMapsBatch
+from .observers import EscapeObserver, MagnetizationObserver, PersistenceObserver, SigmaObserver
+from .store import ResultsStore, open_store, result_key
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+__all__ = ["Preparation", "SnapshotLibrary", "QuenchResult", "quench"]
+
+_PROTOCOL = "quench_snapshot"
+
+
+@dataclass(frozen=True)
+class Preparation:
+    """Protocolo de preparação de um estado em ε_prep.
+
+    O estado parte de `reset(init)` em `eps_start` e percorre
+    `np.linspace(eps_start, eps_prep, n_stages)`, rodando `T_stage` passos em cada
+    degrau após o primeiro (mesmo esquema do notebook 03). Com `eps_start=None`
+    a preparação é direta: (n_stages - 1)·T_stage passos no próprio ε_prep.
+
+    Atributos
+    ---------
+    eps_start : float | None, padrão None
+        Início da rampa (p.ex. ε mínimo para o ramo ε↑, máximo para ε↓).
+    n_stages : int, padrão 8
+    T_stage : int, padrão 400
+    init : {"half_half", "uniform"}, padrão "half_half"
+    """
+
+    eps_start: float | None = None
+    n_stages: int = 8
+    T_stage: int = 400
+    init: str = "half_half"
+
+    def __post_init__(self) -> None:
+        if self.n_stages < 2 or self.T_stage <= 0:
+            raise ValueError("exige n_stages >= 2 e T_stage > 0.")
+        if self.init not in ("half_half", "uniform"):
+            raise ValueError('init deve ser "half_half" ou "uniform".')
+
+    def path(self, eps_prep: float) -> np.ndarray:
+        """Cronograma de ε da preparação (último valor = `eps_prep`)."""
+        start = eps_prep if self.eps_start is None else self.eps_start
+        return np.linspace(float(start), float(eps_prep), self.n_stages)
+
+
+def _prepare_states(task: tuple) -> List[Dict[str, Any]]:
+    """Prepara as sementes de um (μ, ε_prep) juntas num lote; devolve um `state_dict` por semente."""
+    mu, eps_prep, N, seeds, prep, dtype = task
+    path = prep.path(eps_prep)
+    batch = GloballyCoupledMapsBatch(N=N, eps=path[0], mu=mu, seeds=seeds, dtype=dtype)
+    batch.reset(init=prep.init)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for e in path[1:]:
+            batch.set_eps(e)
+            batch.run(prep.T_stage)
+    states = []
+    for r, seed in enumerate(seeds):
+        sys = GloballyCoupledMaps(Config(N=N, eps=float(eps_prep), mu=float(mu), seed=seed, dtype=dtype))
+        sys.rng = batch.rngs[r]
+        sys.x = batch.x[r].copy()
+        sys.last_run_steps = (len(path) - 1) * prep.T_stage
+        states.append(sys.state_dict())
+    return states
+
+
+class SnapshotLibrary:
+    """Estados preparados, indexados por (μ, ε_prep, `Preparation`, semente, N, dtype).
+
+    Parâmetros
+    ----------
+    store : gcm.store.ResultsStore | str | Path | None, padrão None
+        Persistência em disco (objeto ou caminho do SQLite). None = só memória.
+
+    Atributos
+    ---------
+    n_prepared : int
+        Estados simulados por esta biblioteca.
+    n_loaded : int
+        Estados lidos do disco (ausentes da memória).
+    """
+
+    def __init__(self, store: ResultsStore | str | Path | None = None):
+        self._store = open_store(store)
+        self._owns_store = self._store is not None and self._store is not store
+        self._mem: Dict[str, Dict[str, Any]] = {}
+        self.n_prepared = 0
+        self.n_loaded = 0
+
+    @staticmethod
+    def key(mu: float, eps_prep: float, N: int, prep: Preparation, seed: int, dtype: str = "float64") -> str:
+        """Chave de conteúdo do snapshot (`result_key` do protocolo "quench_snapshot")."""
+        cfg = Config(N=N, eps=float(eps_prep), mu=float(mu), seed=seed, dtype=dtype)
+        return result_key(_PROTOCOL, cfg, asdict(prep))
+
+    def prepare(
+        self,
+        mu: float,
+        eps_prep: float,
+        N: int,
+        *,
+        prep: Preparation = Preparation(),
+        seeds: Sequence[int],
+        dtype: str = "float64",
+        n_workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> List[str]:
+        """Garante os snapshots das `seeds` (memória → disco → simulação) e devolve as chaves.
+
+        As sementes ausentes são preparadas juntas (um lote); com `n_workers`/`executor`,
+        divididas em lotes paralelos.
+        """
+        if any(s is None for s in seeds):
+            raise ValueError("snapshots exigem sementes explícitas (não None).")
+        dtype = np.dtype(dtype).name
+        keys = [self.key(mu, eps_prep, N, prep, s, dtype) for s in seeds]
+        missing = [i for i, k in enumerate(keys) if k not in self._mem]
+        if missing and self._store is not None:
+            found = self._store.get_many(keys[i] for i in missing)
+            for i in missing:
+                if keys[i] in found:
+                    self._mem[keys[i]] = _from_record(found[keys[i]])
+                    self.n_loaded += 1
+            missing = [i for i in missing if keys[i] not in self._mem]
+        if missing:
+            n_tasks = max(1, min(len(missing), n_workers or 1))
+            groups = [g.tolist() for g in np.array_split(missing, n_tasks)]
+            tasks = [(float(mu), float(eps_prep), N, [seeds[i] for i in g], prep, dtype) for g in groups]
+            for g, states in zip(groups, _map_points(_prepare_states, tasks, n_workers, executor)):
+                for i, state in zip(g, states):
+                    self._mem[keys[i]] = state
+                    if self._store is not None:
+                        _put(self._store, state, prep)
+                self.n_prepared += len(g)
+        return keys
+
+    def state(self, key: str) -> Dict[str, Any]:
+        """`state_dict` do snapshot (KeyError se não estiver em memória nem em disco)."""
+        state = self._mem.get(key)
+        if state is None and self._store is not None:
+            rec = self._store.get(key)
+            if rec is not None:
+                state = self._mem[key] = _from_record(rec)
+                self.n_loaded += 1
+        if state is None:
+            raise KeyError(f"snapshot {key} ausente (use prepare).")
+        return state
+
+    def system(self, key: str) -> GloballyCoupledMaps:
+        """Novo `GloballyCoupledMaps` no estado do snapshot (cópia; o snapshot não muda)."""
+        state = self.state(key)
+        sys = GloballyCoupledMaps(Config(**state["config"]))
+        sys.load_state_dict(state)
+        return sys
+
+    def query(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Snapshots em disco (filtros de `ResultsStore.query`: mu, eps, N, seed, eps_start, T_stage, ...)."""
+        if self._store is None:
+            raise ValueError("query exige uma biblioteca com store em disco.")
+        return self._store.query(_PROTOCOL, **filters)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._mem or (self._store is not None and self._store.get(key) is not None)
+
+    def __len__(self) -> int:
+        return len(self._mem)
+
+    def close(self) -> None:
+        if self._owns_store:
+            self._store.close()
+
+    def __enter__(self) -> "SnapshotLibrary":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _put(store: ResultsStore, state: Dict[str, Any], prep: Preparation) -> None:
+    values = {k: v for k, v in state.items() if k not in ("x", "last_escaped_mask", "config")}
+    arrays = dict(x=state["x"])
+    if state["last_escaped_mask"] is not None:
+        arrays["last_escaped_mask"] = state["last_escaped_mask"]
+    store.put(_PROTOCOL, Config(**state["config"]), asdict(prep), values, arrays)
+
+
+def _from_record(rec: Dict[str, Any]) -> Dict[str, Any]:
+    arrays = rec["arrays"]
+    cfg = Config(N=rec["N"], eps=rec["eps"], mu=rec["mu"], seed=rec["seed"], dtype=arrays["x"].dtype.name)
+    return dict(
+        rec["values"],
+        config=asdict(cfg),
+        x=arrays["x"],
+        last_escaped_mask=arrays.get("last_escaped_mask"),
+    )
+
+
+@dataclass
+class QuenchResult:
+    """Quenches de vários snapshots para vários ε alvo.
+
+    Atributos
+    ---------
+    mu, eps_prep : float
+    eps_targets : np.ndarray, shape (K,)
+    seeds : list[int]
+        Semente de cada snapshot (linhas dos arrays).
+    sigma_bar, M_bar, M_mean, persistence, escaped_frac : np.ndarray, shape (S, K)
+        Na janela de medição (após T_burn passos no alvo): σ̄, |<M>|, <M> com sinal
+        (bacia ocupada), persistência desde o início da janela e fração de passos
+        com escape.
+    meta : dict
+        Metadados (N, T_burn, T_meas, preparation, dtype, keys, n_prepared, n_loaded).
+    """
+
+    mu: float
+    eps_prep: float
+    eps_targets: np.ndarray
+    seeds: List[int]
+    sigma_bar: np.ndarray
+    M_bar: np.ndarray
+    M_mean: np.ndarray
+    persistence: np.ndarray
+    escaped_frac: np.ndarray
+    meta: Dict[str, Any]
+
+
+def _quench_block(task: tuple) -> np.ndarray:
+    """Leva um snapshot x (N,) a todos os alvos num lote (K, N); devolve (5, K)."""
+    x, mu, targets, T_burn, T_meas, dtype = task
+    batch = GloballyCoupledMapsBatch(N=x.size, eps=targets, mu=mu, dtype=dtype)
+    batch.x = np.repeat(x[None, :], targets.size, axis=0)
+    sig, mag, per, esc = SigmaObserver(), MagnetizationObserver(), PersistenceObserver(), EscapeObserver()
+    with np.errstate(over="ignore", invalid="ignore"):
+        batch.run(T_burn + T_meas, discard=T_burn, observers=[sig, mag, per, esc])
+    return np.array([np.atleast_1d(v) for v in (sig.mean, mag.order_param, mag.mean, per.p, esc.frac)], dtype=float)
+
+
+def quench(
+    library: SnapshotLibrary,
+    mu: float,
+    eps_prep: float,
+    eps_targets: Sequence[float] | np.ndarray,
+    N: int,
+    *,
+    prep: Preparation = Preparation(),
+    seeds: Sequence[int] = (0,),
+    T_burn: int = 500,
+    T_meas: int = 1_000,
+    dtype: str = "float64",
+    n_workers: int | None = None,
+    executor: Executor | None = None,
+) -> QuenchResult:
+    """Quench instantâneo ε_prep → cada ε alvo, a partir de snapshots da biblioteca.
+
+    Os snapshots ausentes são preparados (e guardados) antes; cada snapshot roda
+    todos os alvos juntos num lote, e os snapshots são distribuídos entre
+    processos (`n_workers`/`executor`). Como a dinâmica é determinística depois
+    da preparação, o resultado não depende de `n_workers`.
+
+    Parâmetros
+    ----------
+    library : SnapshotLibrary
+    mu, eps_prep : float
+    eps_targets : sequência de float, shape (K,)
+    N : int
+    prep : Preparation, padrão Preparation()
+    seeds : sequência de int, padrão (0,)
+        Uma realização (snapshot) por semente.
+    T_burn, T_meas : int, padrão 500 e 1000
+        Transiente descartado e janela de medição após o quench.
+    dtype : {"float64", "float32"}, padrão "float64"
+    n_workers, executor
+        Como em `gcm.analysis.scan_eps`.
+
+    Retorna
+    -------
+    QuenchResult
+    """
+    targets = np.atleast_1d(np.asarray(eps_targets, dtype=float))
+    if T_meas <= 0 or T_burn < 0:
+        raise ValueError("T_meas deve ser positivo e T_burn não negativo.")
+    dtype = np.dtype(dtype).name
+    seeds = list(seeds)
+    before = (library.n_prepared, library.n_loaded)
+    keys = library.prepare(mu, eps_prep, N, prep=prep, seeds=seeds, dtype=dtype,
+                           n_workers=n_workers, executor=executor)
+    tasks = [(library.state(k)["x"], float(mu), targets, T_burn, T_meas, dtype) for k in keys]
+    out = np.stack(_map_points(_quench_block, tasks, n_workers, executor))  # (S, 5, K)
+    meta = dict(
+        N=N,
+        T_burn=T_burn,
+        T_meas=T_meas,
+        preparation=asdict(prep),
+        dtype=dtype,
+        keys=keys,
+        n_prepared=library.n_prepared - before[0],
+        n_loaded=library.n_loaded - before[1],
+        n_workers=n_workers,
+    )
+    return QuenchResult(
+        mu=float(mu),
+        eps_prep=float(eps_prep),
+        eps_targets=targets,
+        seeds=seeds,
+        sigma_bar=out[:, 0],
+        M_bar=out[:, 1],
+        M_mean=out[:, 2],
+        persistence=out[:, 3],
+        escaped_frac=out[:, 4],
+        meta=meta,
+    )
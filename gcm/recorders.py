@@ -0,0 +1,272 @@
+"""
+gcm.recorders
+=============
+Gravação da trajetória direto em disco, em blocos, para `run(..., recorder=...)`.
+
+- `NpyRecorder`: arquivo `.npy` memory-mapped (`np.lib.format.open_memmap`),
+  preenchido linha a linha; reabrir com `open_trajectory` dá um `np.memmap`.
+- `ChunkedNpzRecorder`: arquivo `.npz` (zip) com um membro `.npy` por bloco de
+  `chunk_rows` linhas, opcionalmente comprimido (deflate); reabrir dá um
+  `ChunkedTrajectory`, que lê só os blocos acessados.
+
+Ambos aceitam `dtype` (p.ex. float32 para metade do espaço; o padrão é o dtype do
+estado do sistema) e recebem apenas as linhas após `discard`. Assim, a RAM usada
+é O(N) (ou O(chunk_rows·N)) em vez de O(T·N).
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import numpy as np
+
+__all__ = [
+    "TrajectoryRecorder",
+    "NpyRecorder",
+    "ChunkedNpzRecorder",
+    "ChunkedTrajectory",
+    "open_trajectory",
+]
+
+
+class TrajectoryRecorder(ABC):
+    """Base dos gravadores.
+
+    Protocolo usado por `run`:
+    - `open(n_rows, row_shape, dtype)`: antes do primeiro passo gravado (`dtype` é o
+      do estado, usado quando o gravador foi criado com `dtype=None`);
+    - `write(x)`: uma vez por passo após `discard` (x é copiado/convertido);
+    - `close()`: ao fim; devolve a trajetória reaberta de forma preguiçosa.
+
+    Atributos
+    ---------
+    path : Path
+    dtype : np.dtype | None
+        None até `open` quando o gravador segue o dtype do estado.
+    n_written : int
+        Linhas gravadas (pode ser < n_rows se houve parada antecipada).
+    """
+
+    def __init__(self, path: str | Path, dtype=None):
+        self.path = Path(path)
+        self._dtype_arg = None if dtype is None else np.dtype(dtype)
+        self.dtype = self._dtype_arg
+        self.n_written = 0
+
+    def _resolve_dtype(self, dtype) -> np.dtype:
+        self.dtype = self._dtype_arg if self._dtype_arg is not None else np.dtype(dtype)
+        return self.dtype
+
+    @abstractmethod
+    def open(self, n_rows: int, row_shape: Tuple[int, ...], dtype=np.float64) -> None:
+        ...
+
+    @abstractmethod
+    def write(self, x: np.ndarray) -> None:
+        ...
+
+    @abstractmethod
+    def close(self):
+        ...
+
+
+class NpyRecorder(TrajectoryRecorder):
+    """Grava em um `.npy` memory-mapped de shape (n_rows, *row_shape).
+
+    Se a execução parar antes (`stop`), `close` trunca o arquivo para as
+    `n_written` linhas gravadas (cabeçalho reescrito no lugar), de modo que
+    `np.load` não devolve linhas vazias.
+    """
+
+    def open(self, n_rows: int, row_shape: Tuple[int, ...], dtype=np.float64) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        dtype = self._resolve_dtype(dtype)
+        self._mm = np.lib.format.open_memmap(self.path, mode="w+", dtype=dtype, shape=(n_rows, *row_shape))
+        self.n_written = 0
+
+    def write(self, x: np.ndarray) -> None:
+        self._mm[self.n_written] = x
+        self.n_written += 1
+
+    def close(self) -> np.memmap:
+        self._mm.flush()
+        n_rows = self._mm.shape[0]
+        del self._mm
+        if self.n_written < n_rows:
+            _truncate_npy(self.path, self.n_written)
+        return open_trajectory(self.path)
+
+
+def _truncate_npy(path: Path, n_rows: int) -> None:
+    """Reduz o eixo 0 de um `.npy` C-contíguo para `n_rows`, sem copiar os dados.
+
+    O novo cabeçalho ocupa o mesmo espaço do antigo (o shape só encolhe), então o
+    offset dos dados não muda; o excedente é cortado com `truncate`.
+    """
+    fmt = np.lib.format
+    with open(path, "r+b") as f:
+        version = fmt.read_magic(f)
+        read_header = fmt.read_array_header_1_0 if version == (1, 0) else fmt.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        offset = f.tell()
+        new_shape = (int(n_rows), *shape[1:])
+        header = repr(dict(descr=fmt.dtype_to_descr(dtype), fortran_order=fortran_order, shape=new_shape))
+        len_fmt = "<H" if version == (1, 0) else "<I"
+        prefix = fmt.magic(*version) + struct.pack(len_fmt, offset - fmt.MAGIC_LEN - struct.calcsize(len_fmt))
+        body = header.encode("latin1").ljust(offset - len(prefix) - 1) + b"\n"
+        f.seek(0)
+        f.write(prefix + body)
+        f.truncate(offset + int(np.prod(new_shape)) * dtype.itemsize)
+
+
+class ChunkedNpzRecorder(TrajectoryRecorder):
+    """Grava blocos de `chunk_rows` linhas como membros de um `.npz` (zip).
+
+    Parâmetros
+    ----------
+    path : str | Path
+    dtype : padrão None (o do estado)
+    chunk_rows : int, padrão 1024
+        Linhas por bloco (buffer em RAM de chunk_rows × N).
+    compress : bool, padrão True
+        Usa deflate (ZIP_DEFLATED); False grava sem compressão.
+    """
+
+    def __init__(self, path: str | Path, dtype=None, *, chunk_rows: int = 1024, compress: bool = True):
+        super().__init__(path, dtype)
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows deve ser positivo.")
+        self.chunk_rows = int(chunk_rows)
+        self.compress = compress
+
+    def open(self, n_rows: int, row_shape: Tuple[int, ...], dtype=np.float64) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._resolve_dtype(dtype)
+        compression = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+        self._zip = zipfile.ZipFile(self.path, mode="w", compression=compression, allowZip64=True)
+        self._row_shape = tuple(row_shape)
+        self._buf = np.empty((min(self.chunk_rows, max(n_rows, 1)), *row_shape), dtype=self.dtype)
+        self._fill = 0
+        self._n_chunks = 0
+        self.n_written = 0
+
+    def _flush(self) -> None:
+        if self._fill == 0:
+            return
+        with self._zip.open(f"chunk_{self._n_chunks:06d}.npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, self._buf[: self._fill], allow_pickle=False)
+        self._n_chunks += 1
+        self._fill = 0
+
+    def write(self, x: np.ndarray) -> None:
+        self._buf[self._fill] = x
+        self._fill += 1
+        self.n_written += 1
+        if self._fill == self._buf.shape[0]:
+            self._flush()
+
+    def close(self) -> "ChunkedTrajectory":
+        self._flush()
+        meta = dict(
+            n_rows=self.n_written,
+            row_shape=list(self._row_shape),
+            dtype=self.dtype.str,
+            chunk_rows=int(self._buf.shape[0]),
+            n_chunks=self._n_chunks,
+        )
+        self._zip.writestr("meta.json", json.dumps(meta))
+        self._zip.close()
+        del self._buf
+        return ChunkedTrajectory(self.path)
+
+
+class ChunkedTrajectory:
+    """Leitura preguiçosa de um `.npz` escrito por `ChunkedNpzRecorder`.
+
+    Suporta `len`, `shape`, `dtype`, indexação por linha/fatia (`traj[t]`,
+    `traj[a:b]`, `traj[a:b, i]`), `iter_chunks()` e `np.asarray(traj)` (carrega tudo).
+    Só os blocos tocados são descomprimidos.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path, mode="r")
+        meta = json.loads(self._zip.read("meta.json"))
+        self.shape = (int(meta["n_rows"]), *[int(v) for v in meta["row_shape"]])
+        self.dtype = np.dtype(meta["dtype"])
+        self.chunk_rows = int(meta["chunk_rows"])
+        self.n_chunks = int(meta["n_chunks"])
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def chunk(self, i: int) -> np.ndarray:
+        """Bloco i, shape (≤ chunk_rows, *row_shape)."""
+        with self._zip.open(f"chunk_{i:06d}.npy") as f:
+            return np.lib.format.read_array(f, allow_pickle=False)
+
+    def iter_chunks(self) -> Iterator[np.ndarray]:
+        for i in range(self.n_chunks):
+            yield self.chunk(i)
+
+    def _rows(self, start: int, stop: int) -> np.ndarray:
+        if stop <= start:
+            return np.empty((0, *self.shape[1:]), dtype=self.dtype)
+        c0, c1 = start // self.chunk_rows, (stop - 1) // self.chunk_rows
+        parts = [self.chunk(i) for i in range(c0, c1 + 1)]
+        block = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        off = c0 * self.chunk_rows
+        return block[start - off: stop - off]
+
+    def __getitem__(self, idx):
+        rest: tuple = ()
+        if isinstance(idx, tuple):
+            idx, rest = idx[0], idx[1:]
+        if isinstance(idx, (int, np.integer)):
+            t = int(idx) + (len(self) if idx < 0 else 0)
+            if not 0 <= t < len(self):
+                raise IndexError("índice de linha fora do intervalo.")
+            return self._rows(t, t + 1)[0][rest]
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            out = self._rows(start, stop)[::step] if step > 0 else np.asarray(self)[idx]
+        else:
+            out = np.asarray(self)[idx]
+        return out[(slice(None), *rest)]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        arr = self._rows(0, len(self))
+        return arr if dtype is None else arr.astype(dtype, copy=False)
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self) -> "ChunkedTrajectory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_trajectory(path: str | Path):
+    """Reabre uma trajetória gravada, sem carregá-la na RAM.
+
+    Retorna
+    -------
+    np.memmap (para `.npy`, modo somente leitura) ou `ChunkedTrajectory` (para `.npz`).
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    if path.suffix == ".npz":
+        return ChunkedTrajectory(path)
+    raise ValueError("extensão não suportada (use .npy ou .npz).")
@@ -0,0 +1,253 @@
+"""
+gcm.scanfile
+============
+Formato binário colunar para resultados de varredura (`ScanResult`).
+
+Um resultado é um diretório com "partes" `.npz` (sem compressão); cada parte
+guarda uma coluna por membro `.npy` (dtype preservado) e os metadados escalares
+em JSON (membro `__meta__`):
+
+    scan_mu1.9.scan/
+        part-<tempo_ns>-<pid>-<n>.npz    # colunas mu, eps, sigma_mean, escaped_frac,
+        ...                              # is_synced, seeds, stop_reason, steps_run
+
+- `save_scan(res, path, append=True)` só cria uma parte nova (arquivo temporário +
+  `os.replace`), sem índice compartilhado: processos paralelos podem anexar blocos
+  ε/μ ao mesmo diretório sem coordenação.
+- `read_scan_columns` / `load_scan` leem só as colunas pedidas, direto do offset
+  do membro no zip (sem descompressão nem CRC); 10^6 linhas carregam em
+  milissegundos.
+- Listas por ponto de `meta` ("seeds", "stop_reason", "steps_run") viram colunas
+  (texto como códigos uint8 + categorias no JSON) e voltam para `meta` ao carregar.
+
+Exemplo
+-------
+>>> save_scan(res, "data/scan_mu1.9.scan")
+>>> save_scan(res_more, "data/scan_mu1.9.scan", append=True)
+>>> res_all = load_scan("data/scan_mu1.9.scan", columns=["sigma_mean"])
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import struct
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .analysis import ScanResult
+from .store import _canonical
+
+__all__ = ["save_scan", "load_scan", "read_scan_columns"]
+
+_PART_GLOB = "part-*.npz"
+_META_KEY = "__meta__"
+_CATEGORIES = "__categories__"
+# listas de `meta` com um valor por ponto ε (guardadas como colunas)
+_ROW_META = ("seeds", "stop_reason", "steps_run")
+_COUNTER = itertools.count()
+
+
+def _parts(path: Path) -> List[Path]:
+    parts = sorted(path.glob(_PART_GLOB))
+    if not parts:
+        raise FileNotFoundError(f"nenhuma parte de varredura em {path}")
+    return parts
+
+
+def _row_array(values: list) -> np.ndarray:
+    """Lista por ponto → array; inteiros não negativos (sementes de 64 bits) viram uint64."""
+    if all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in values):
+        ints = [int(v) for v in values]
+        return np.asarray(ints, dtype=np.uint64 if min(ints, default=0) >= 0 else np.int64)
+    return np.asarray(values)
+
+
+def _concat(chunks: list) -> np.ndarray:
+    """Concatena as partes de uma coluna sem promover int64 + uint64 para float64."""
+    if len(chunks) == 1:
+        return chunks[0]
+    kinds = {c.dtype.kind for c in chunks}
+    if kinds == {"i", "u"}:
+        signed = any(c.size and c.min() < 0 for c in chunks if c.dtype.kind == "i")
+        chunks = [c.astype(np.int64 if signed else np.uint64) for c in chunks]
+    return np.concatenate(chunks)
+
+
+def save_scan(result: ScanResult, path: str | Path, *, append: bool = False) -> Path:
+    """Grava `result` como uma parte colunar em `path` (diretório).
+
+    Parâmetros
+    ----------
+    result : ScanResult
+    path : str | Path
+        Diretório do resultado (criado se necessário).
+    append : bool, padrão False
+        False substitui as partes existentes; True acrescenta uma parte (seguro
+        com vários processos gravando no mesmo diretório).
+
+    Retorna
+    -------
+    Path
+        Caminho da parte gravada.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    K = np.asarray(result.eps_grid).size
+    cols: Dict[str, np.ndarray] = dict(
+        mu=np.full(K, float(result.mu)),
+        eps=np.asarray(result.eps_grid, dtype=float),
+        sigma_mean=np.asarray(result.sigma_mean),
+        escaped_frac=np.asarray(result.escaped_frac),
+        is_synced=np.asarray(result.is_synced, dtype=bool),
+    )
+    meta: Dict = {}
+    categories: Dict[str, list] = {}
+    for key, value in result.meta.items():
+        if key in _ROW_META and value is not None and len(value) == K and None not in value:
+            arr = _row_array(value)
+            if arr.dtype.kind == "U":
+                # texto repetitivo (razões de parada): códigos uint8 + categorias no JSON
+                cats, codes = np.unique(arr, return_inverse=True)
+                if cats.size <= 255:
+                    categories[key] = cats.tolist()
+                    arr = codes.astype(np.uint8)
+            if arr.dtype != object:
+                cols[key] = arr
+                continue
+        meta[key] = value
+    meta = _canonical(meta)
+    meta[_CATEGORIES] = categories
+
+    if not append:
+        for old in path.glob(_PART_GLOB):
+            old.unlink()
+    name = f"part-{time.time_ns():020d}-{os.getpid()}-{next(_COUNTER):06d}.npz"
+    tmp = path / (name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **cols, **{_META_KEY: np.array(json.dumps(meta))})
+    os.replace(tmp, path / name)
+    return path / name
+
+
+def read_scan_columns(path: str | Path, columns: Sequence[str] | None = None) -> Dict[str, np.ndarray]:
+    """Lê colunas de todas as partes (na ordem de gravação), sem carregar as demais.
+
+    Parâmetros
+    ----------
+    path : str | Path
+    columns : sequência de str | None
+        Colunas desejadas (None = todas as da primeira parte).
+
+    Retorna
+    -------
+    dict[str, np.ndarray]
+    """
+    chunks: Dict[str, list] = {}
+    for part in _parts(Path(path)):
+        with zipfile.ZipFile(part) as zf:
+            infos = {i.filename[:-4]: i for i in zf.infolist()}
+        names = [n for n in infos if n != _META_KEY]
+        if columns is None:
+            columns = names
+        with open(part, "rb") as f:
+            categories = json.loads(str(_read_member(f, infos[_META_KEY]))).get(_CATEGORIES, {})
+            for c in columns:
+                if c not in infos:
+                    raise KeyError(f"coluna {c!r} ausente em {part.name} (disponíveis: {names})")
+                col = _read_member(f, infos[c])
+                if c in categories:
+                    col = np.asarray(categories[c])[col]
+                chunks.setdefault(c, []).append(col)
+    return {c: _concat(v) for c, v in chunks.items()}
+
+
+def _read_member(f, info: zipfile.ZipInfo) -> np.ndarray:
+    """Lê um membro `.npy` não comprimido pelo offset no arquivo (sem CRC)."""
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"membro comprimido não suportado: {info.filename}")
+    f.seek(info.header_offset + 26)
+    n_name, n_extra = struct.unpack("<HH", f.read(4))
+    f.seek(info.header_offset + 30 + n_name + n_extra)
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+    if dtype.hasobject:
+        raise ValueError(f"coluna com objetos Python não suportada: {info.filename}")
+    count = int(np.prod(shape, dtype=np.int64))
+    arr = np.fromfile(f, dtype=dtype, count=count)
+    return arr.reshape(shape, order="F" if fortran else "C")
+
+
+def _read_meta(path: Path) -> dict:
+    part = _parts(path)[0]
+    with zipfile.ZipFile(part) as zf:
+        info = zf.getinfo(_META_KEY + ".npy")
+    with open(part, "rb") as f:
+        meta = json.loads(str(_read_member(f, info)))
+    meta.pop(_CATEGORIES, None)
+    return meta
+
+
+def load_scan(
+    path: str | Path,
+    columns: Sequence[str] | None = None,
+    *,
+    mu: float | None = None,
+) -> ScanResult:
+    """Carrega um resultado colunar como `ScanResult` (pontos ordenados por ε).
+
+    Parâmetros
+    ----------
+    path : str | Path
+    columns : sequência de str | None
+        Colunas a ler além de "mu" e "eps" (None = todas). Campos de resultado não
+        lidos ("sigma_mean", "escaped_frac", "is_synced") ficam None.
+    mu : float | None
+        Seleciona as linhas deste μ; obrigatório se o diretório tiver vários μ.
+
+    Retorna
+    -------
+    ScanResult
+        `meta` é o da primeira parte, com as colunas por ponto lidas ("seeds",
+        "stop_reason", "steps_run") de volta como listas e `meta["n_parts"]`.
+    """
+    path = Path(path)
+    wanted = None if columns is None else ["mu", "eps", *(c for c in columns if c not in ("mu", "eps"))]
+    cols = read_scan_columns(path, wanted)
+    mu_col = cols["mu"]
+    single = mu_col.size > 0 and bool(np.all(mu_col == mu_col[0]))
+    if mu is None:
+        if not single:
+            raise ValueError(f"o resultado tem vários μ ({np.unique(mu_col).tolist()}); escolha um com mu=...")
+        mu = float(mu_col[0])
+    if not (single and mu_col[0] == float(mu)):
+        rows = mu_col == float(mu)
+        if not rows.any():
+            raise ValueError(f"μ={mu} ausente (disponíveis: {np.unique(mu_col).tolist()})")
+        cols = {c: v[rows] for c, v in cols.items()}
+    eps = cols["eps"]
+    if np.any(eps[1:] < eps[:-1]):
+        order = np.argsort(eps, kind="stable")
+        cols = {c: v[order] for c, v in cols.items()}
+
+    meta = _read_meta(path)
+    for key in _ROW_META:
+        if key in cols:
+            meta[key] = cols[key].tolist()
+    meta["n_parts"] = len(_parts(path))
+    return ScanResult(
+        mu=float(mu),
+        eps_grid=cols["eps"],
+        sigma_mean=cols.get("sigma_mean"),
+        escaped_frac=cols.get("escaped_frac"),
+        is_synced=cols.get("is_synced"),
+        meta=meta,
+    )
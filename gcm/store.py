@@ -0,0 +1,247 @@
+"""
+gcm.store
+=========
+Repositório persistente de resultados (SQLite + blobs de arrays), endereçado por
+conteúdo, para não recomputar simulações caras.
+
+Cada registro é identificado por `result_key(protocol, cfg, params)`: o SHA-256 de
+um JSON canônico com o nome do protocolo (p.ex. "scan_eps_point"), o `Config`
+completo (N, ε, μ, semente), os parâmetros do protocolo (T_burn, T_meas, init,
+backend, stop, ...) e a versão do pacote. Mudar qualquer um deles muda a chave.
+
+- Escalares vão em JSON (`values`); arrays, em um blob `.npz` (`arrays`).
+- N, ε, μ, semente, protocolo e versão são colunas indexáveis; os parâmetros do
+  protocolo podem ser filtrados via `json_extract`.
+- `scan_eps`, `scan_eps_adaptive`, `phase_diagram` e `ramp` aceitam `store=` e só
+  simulam os pontos ausentes.
+
+Exemplo
+-------
+>>> with ResultsStore("data/results.sqlite") as st:
+...     rows = st.query("scan_eps_point", mu=1.9, N=(1024, None))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import re
+import sqlite3
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping
+
+import numpy as np
+
+from . import __version__
+from .core import Config
+
+__all__ = ["ResultsStore", "result_key", "open_store"]
+
+_COLUMNS = ("protocol", "N", "eps", "mu", "seed", "version")
+_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key      TEXT PRIMARY KEY,
+    protocol TEXT NOT NULL,
+    N        INTEGER NOT NULL,
+    eps      REAL NOT NULL,
+    mu       REAL NOT NULL,
+    seed     TEXT,
+    version  TEXT NOT NULL,
+    params   TEXT NOT NULL,
+    "values" TEXT NOT NULL,
+    arrays   BLOB,
+    created  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_lookup ON results (protocol, mu, N, eps);
+"""
+
+
+def _canonical(obj: Any) -> Any:
+    """Converte tipos NumPy em tipos JSON nativos (para chaves estáveis)."""
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return _canonical(obj.tolist())
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    return obj
+
+
+def result_key(protocol: str, cfg: Config, params: Mapping[str, Any], version: str = __version__) -> str:
+    """Chave de conteúdo (hex SHA-256) de um resultado.
+
+    Parâmetros
+    ----------
+    protocol : str
+        Nome do protocolo de medição (p.ex. "scan_eps_point").
+    cfg : Config
+        Configuração completa do sistema (inclui a semente).
+    params : mapping
+        Parâmetros do protocolo (T_burn, T_meas, init, backend, ...).
+    version : str, padrão `gcm.__version__`
+    """
+    config = asdict(cfg)
+    if config.get("dtype") == "float64":
+        del config["dtype"]  # chaves anteriores ao modo float32 continuam válidas
+    payload = dict(protocol=protocol, config=config, params=params, version=version)
+    blob = json.dumps(_canonical(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def _pack_arrays(arrays: Mapping[str, np.ndarray] | None) -> bytes | None:
+    if not arrays:
+        return None
+    buf = io.BytesIO()
+    np.savez(buf, **{k: np.asarray(v) for k, v in arrays.items()})
+    return buf.getvalue()
+
+
+def _unpack_arrays(blob: bytes | None) -> Dict[str, np.ndarray]:
+    if blob is None:
+        return {}
+    with np.load(io.BytesIO(blob), allow_pickle=False) as z:
+        return {k: z[k] for k in z.files}
+
+
+class ResultsStore:
+    """Resultados de simulação em um arquivo SQLite.
+
+    Parâmetros
+    ----------
+    path : str | Path
+        Arquivo do banco (diretórios pais são criados). ":memory:" para testes.
+
+    Notas
+    -----
+    Escritas acontecem só no processo principal (os drivers paralelos gravam após
+    coletar os resultados dos workers).
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = path if path == ":memory:" else Path(path)
+        if isinstance(self.path, Path):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(str(self.path))
+        self._con.executescript(_SCHEMA)
+
+    # ----------------------------------------------------------------- escrita
+    def put(
+        self,
+        protocol: str,
+        cfg: Config,
+        params: Mapping[str, Any],
+        values: Mapping[str, Any],
+        arrays: Mapping[str, np.ndarray] | None = None,
+    ) -> str:
+        """Grava (ou substitui) um resultado e devolve sua chave."""
+        key = result_key(protocol, cfg, params)
+        row = (
+            key, protocol, int(cfg.N), float(cfg.eps), float(cfg.mu),
+            None if cfg.seed is None else str(int(cfg.seed)), __version__,
+            json.dumps(_canonical(dict(params)), sort_keys=True),
+            json.dumps(_canonical(dict(values)), sort_keys=True),
+            _pack_arrays(arrays), time.time(),
+        )
+        with self._con:
+            self._con.execute("INSERT OR REPLACE INTO results VALUES (?,?,?,?,?,?,?,?,?,?,?)", row)
+        return key
+
+    # ----------------------------------------------------------------- leitura
+    def _decode(self, row: tuple) -> Dict[str, Any]:
+        key, protocol, N, eps, mu, seed, version, params, values, arrays, created = row
+        return dict(
+            key=key, protocol=protocol, N=N, eps=eps, mu=mu,
+            seed=None if seed is None else int(seed), version=version,
+            params=json.loads(params), values=json.loads(values),
+            arrays=_unpack_arrays(arrays), created=created,
+        )
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        """Registro da chave (dict com params, values, arrays, ...) ou None."""
+        cur = self._con.execute("SELECT * FROM results WHERE key = ?", (key,))
+        row = cur.fetchone()
+        return None if row is None else self._decode(row)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Registros existentes entre `keys` (chaves ausentes ficam de fora)."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Dict[str, Any]] = {}
+        for a in range(0, len(keys), 500):  # limite de parâmetros do SQLite
+            part = keys[a:a + 500]
+            cur = self._con.execute(
+                f"SELECT * FROM results WHERE key IN ({','.join('?' * len(part))})", part
+            )
+            for row in cur:
+                found[row[0]] = self._decode(row)
+        return found
+
+    def query(self, protocol: str | None = None, **filters: Any) -> List[Dict[str, Any]]:
+        """Consulta por protocolo, colunas (N, eps, mu, seed, version) e parâmetros.
+
+        Cada filtro é um valor exato ou uma tupla (mín, máx) inclusiva, com None
+        para lado aberto. Nomes fora das colunas são buscados em `params`.
+
+        Exemplo: `query("scan_eps_point", mu=1.9, N=(1024, None), T_meas=2000)`.
+
+        Retorna
+        -------
+        list[dict]
+            Registros ordenados por (μ, N, ε).
+        """
+        where, args = [], []
+        if protocol is not None:
+            filters = dict(filters, protocol=protocol)
+        for name, value in filters.items():
+            if not _NAME.match(name):
+                raise ValueError(f"nome de filtro inválido: {name!r}")
+            col = name if name in _COLUMNS else f"json_extract(params, '$.{name}')"
+            if name == "seed" and isinstance(value, (int, np.integer)):
+                value = str(int(value))  # sementes de 64 bits sem sinal ficam em TEXT
+            if isinstance(value, tuple):
+                lo, hi = value
+                if lo is not None:
+                    where.append(f"{col} >= ?")
+                    args.append(lo)
+                if hi is not None:
+                    where.append(f"{col} <= ?")
+                    args.append(hi)
+            elif value is None:
+                where.append(f"{col} IS NULL")
+            else:
+                where.append(f"{col} = ?")
+                args.append(value)
+        sql = "SELECT * FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY mu, N, eps"
+        return [self._decode(row) for row in self._con.execute(sql, args)]
+
+    def __len__(self) -> int:
+        return int(self._con.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+
+    def close(self) -> None:
+        self._con.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_store(store: ResultsStore | str | Path | None) -> ResultsStore | None:
+    """Normaliza o argumento `store=` dos drivers (caminho → `ResultsStore`)."""
+    if store is None or isinstance(store, ResultsStore):
+        return store
+    return ResultsStore(store)
@@ -51,4 +51,236 @@ def test_scan_eps_and_io(tmp_path: Path):
 
 
 data_path = Path("test_analysis")
-test_scan_eps_and_io(data_path)
\ No newline at end of file
+test_scan_eps_and_io(data_path)
+
+
+def test_scan_eps_parallel_is_bit_identical():
+    from gcm.analysis import point_seeds, spawn_seeds
+    eps_grid = np.linspace(0.2, 1.2, 5)
+    kw = dict(mu=1.9, eps_grid=eps_grid, N=128, T_burn=100, T_meas=100, seed_base=7)
+    serial = scan_eps(**kw)
+    parallel = scan_eps(**kw, n_workers=2)
+    assert np.array_equal(serial.sigma_mean, parallel.sigma_mean)
+    assert np.array_equal(serial.escaped_frac, parallel.escaped_frac)
+    assert serial.meta["seeds"] == point_seeds(7, 1.9, eps_grid)
+
+    # seed_base vizinhos não compartilham sementes (ao contrário de seed_base + k)
+    assert not set(spawn_seeds(7, 5)) & set(spawn_seeds(8, 5))
+
+test_scan_eps_parallel_is_bit_identical()
+
+
+
+def test_phase_diagram_labels_and_plot(tmp_path: Path = Path("test_analysis")):
+    from gcm.analysis import PHASE_LABELS, phase_diagram, plot_phase_diagram
+    mu_grid = np.array([0.5, 1.9])
+    eps_grid = np.array([0.2, 1.0])
+    res = phase_diagram(mu_grid, eps_grid, N=128, T_burn=300, T_meas=200, seed_base=1)
+    assert res.labels.shape == (2, 2)
+    assert set(res.labels.ravel()) <= set(PHASE_LABELS)
+    # |μ|<1: ponto fixo x=0 estável; μ=1.9: ε=1.0 sincroniza, ε=0.2 não
+    assert (res.labels[0] == "sync_stat").all()
+    assert res.labels[1, 0] == "nonsync" and res.labels[1, 1] == "sync_chaos"
+
+    out_fig = plot_phase_diagram(res, outpath=tmp_path / "figs" / "phase_diagram_quick.png")
+    assert out_fig.exists()
+
+test_phase_diagram_labels_and_plot()
+
+
+
+def test_scan_eps_adaptive_brackets_sync_transition():
+    from gcm.analysis import scan_eps_adaptive
+    mu = 1.9
+    res = scan_eps_adaptive(mu, 0.1, 1.0, N=128, n_initial=5, eps_tol=5e-3,
+                            T_burn=300, T_meas=200, seed_base=3)
+    assert np.all(np.diff(res.eps_grid) > 0)
+    assert res.meta["n_points"] == res.eps_grid.size < 60
+
+    sync_brackets = [(a, b) for a, b, kind in res.meta["transitions"] if kind == "sync"]
+    assert len(sync_brackets) == 1
+    a, b = sync_brackets[0]
+    assert b - a <= 5e-3
+    eps_inf, _ = theory_boundaries(mu)["eps_sync"]
+    assert abs(0.5 * (a + b) - eps_inf) < 0.05
+
+test_scan_eps_adaptive_brackets_sync_transition()
+
+
+
+def test_scan_eps_early_stop_records_reason():
+    from gcm.observers import StopCriteria
+    eps_grid = np.array([0.2, 1.1, 2.8])  # dessinc., sinc., escape (μ=1.9)
+    for backend in ["numpy", "auto"]:
+        res = scan_eps(1.9, eps_grid, N=128, T_burn=300, T_meas=300, seed_base=4,
+                       backend=backend, stop=StopCriteria())
+        assert res.meta["stop_reason"] == ["completed", "synced", "escaped"]
+        assert res.meta["steps_run"][0] == 600 and res.meta["steps_run"][1] < 600
+        assert res.is_synced[1] and not res.is_synced[0]
+        assert np.isnan(res.sigma_mean[2]) and res.escaped_frac[2] == 1.0
+
+test_scan_eps_early_stop_records_reason()
+
+
+
+def test_ramp_up_and_down_branches():
+    from gcm.analysis import ramp
+    from gcm.core import Config, GloballyCoupledMaps
+    eps_schedule = np.linspace(0.2, 1.2, 6)
+    res = ramp(1.9, eps_schedule, N=128, T_burn_block=50, T_meas_block=50, seed=5)
+    assert np.array_equal(res.eps_down, eps_schedule[::-1])
+    for branch in (res.up, res.down):
+        assert branch["sigma_bar"].shape == (6,)
+        assert np.all((branch["p_rampa"] >= 0) & (branch["p_rampa"] <= 1))
+    # p_rampa é acumulada: não pode crescer ao longo da rampa
+    assert np.all(np.diff(res.up["p_rampa"]) <= 0)
+
+    # ramo ε↑ equivale a um sistema único com set_eps entre degraus
+    sys = GloballyCoupledMaps(Config(N=128, eps=eps_schedule[0], mu=1.9, seed=5))
+    sys.reset(init="half_half")
+    for eps in eps_schedule:
+        sys.set_eps(eps)
+        traj = sys.run(100, discard=50, track=True)
+    assert np.isclose(res.up["sigma_bar"][-1], np.std(traj, axis=1).mean())
+
+    # ramo ε↓ continua do topo do ramo ε↑ (mesmo sistema, sem reset)
+    for eps in eps_schedule[::-1]:
+        sys.set_eps(eps)
+        traj = sys.run(100, discard=50, track=True)
+    assert np.isclose(res.down["sigma_bar"][-1], np.std(traj, axis=1).mean())
+    assert np.all(np.diff(res.down["p_rampa"]) <= 0)
+
+    # sementes em lote: cada coluna reproduz a rampa da semente isolada
+    both = ramp(1.9, eps_schedule, N=128, T_burn_block=50, T_meas_block=50, seed=[7, 5])
+    assert both.down["M_bar"].shape == (6, 2)
+    for k in res.up:
+        assert np.allclose(both.up[k][:, 1], res.up[k]) and np.allclose(both.down[k][:, 1], res.down[k])
+
+test_ramp_up_and_down_branches()
+
+
+def test_plot_spin_raster_accepts_packed(tmp_path: Path = Path("test_analysis")):
+    from gcm.analysis import plot_spin_raster
+    from gcm.metrics import spins
+
+    X = np.random.default_rng(0).uniform(-1, 1, size=(30, 20))
+    out = plot_spin_raster(spins(X, packed=True), outpath=tmp_path / "figs" / "raster_packed.png")
+    assert out is not None and out.exists()
+    assert plot_spin_raster(spins(X)) is None
+
+
+test_plot_spin_raster_accepts_packed()
+
+
+class _PreemptedExecutor:
+    """Executor que "morre" depois de `n_ok` lotes (simula um nó preemptível)."""
+
+    def __init__(self, n_ok: int):
+        self.n_ok = n_ok
+
+    def map(self, fn, tasks):
+        if self.n_ok == 0:
+            raise KeyboardInterrupt("preempted")
+        self.n_ok -= 1
+        return map(fn, tasks)
+
+
+def test_scan_eps_checkpoint_resume_is_bit_identical(tmp_path: Path = Path("test_analysis")):
+    ckpt = tmp_path / "scan_ckpt.json"
+    ckpt.unlink(missing_ok=True)
+    grid = np.linspace(0.1, 1.0, 7)
+    kw = dict(T_burn=60, T_meas=60, seed_base=99)
+    ref = scan_eps(1.9, grid, 48, **kw)
+
+    try:
+        scan_eps(1.9, grid, 48, checkpoint=ckpt, checkpoint_every=3, executor=_PreemptedExecutor(1), **kw)
+    except KeyboardInterrupt:
+        pass
+    else:
+        raise AssertionError("a execução deveria ter sido interrompida")
+
+    res = scan_eps(1.9, grid, 48, checkpoint=ckpt, checkpoint_every=3, **kw)
+    assert res.meta["resumed_points"] == 3
+    assert np.array_equal(res.sigma_mean, ref.sigma_mean)
+    assert np.array_equal(res.escaped_frac, ref.escaped_frac)
+    assert res.meta["steps_run"] == ref.meta["steps_run"]
+
+    try:
+        scan_eps(1.9, grid, 48, checkpoint=ckpt, T_burn=61, T_meas=60, seed_base=99)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("checkpoint de outra varredura deveria ser rejeitado")
+
+
+test_scan_eps_checkpoint_resume_is_bit_identical()
+
+
+def test_phase_diagram_and_adaptive_checkpoint_resume(tmp_path: Path = Path("test_analysis")):
+    from gcm.analysis import phase_diagram, scan_eps_adaptive
+
+    ckpt = tmp_path / "phase_ckpt.json"
+    ckpt.unlink(missing_ok=True)
+    mu_grid, eps_grid = [1.3, 1.6, 1.9], [0.1, 0.5, 0.9]
+    kw = dict(T_burn=40, T_meas=40, seed_base=8)
+    ref = phase_diagram(mu_grid, eps_grid, 32, **kw)
+    try:
+        phase_diagram(mu_grid, eps_grid, 32, checkpoint=ckpt, checkpoint_every=2, executor=_PreemptedExecutor(1), **kw)
+    except KeyboardInterrupt:
+        pass
+    else:
+        raise AssertionError("a execução deveria ter sido interrompida")
+    res = phase_diagram(mu_grid, eps_grid, 32, checkpoint=ckpt, checkpoint_every=2, **kw)
+    assert res.meta["resumed_rows"] == 2
+    assert np.array_equal(res.sigma_mean, ref.sigma_mean) and np.array_equal(res.codes, ref.codes)
+    try:
+        phase_diagram(mu_grid, eps_grid, 32, checkpoint=ckpt, T_burn=41, T_meas=40, seed_base=8)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("checkpoint de outro diagrama deveria ser rejeitado")
+
+    ckpt = tmp_path / "adaptive_ckpt.json"
+    ckpt.unlink(missing_ok=True)
+    kw = dict(n_initial=5, eps_tol=0.05, max_points=20, T_burn=60, T_meas=60, seed_base=3)
+    ref = scan_eps_adaptive(1.9, 0.1, 1.0, 48, **kw)
+    try:
+        scan_eps_adaptive(1.9, 0.1, 1.0, 48, checkpoint=ckpt, checkpoint_every=4, executor=_PreemptedExecutor(3), **kw)
+    except KeyboardInterrupt:
+        pass
+    else:
+        raise AssertionError("a execução deveria ter sido interrompida")
+    res = scan_eps_adaptive(1.9, 0.1, 1.0, 48, checkpoint=ckpt, checkpoint_every=4, **kw)
+    assert res.meta["resumed_points"] > 0
+    assert np.array_equal(res.eps_grid, ref.eps_grid)
+    assert np.array_equal(res.sigma_mean, ref.sigma_mean)
+    assert res.meta["transitions"] == ref.meta["transitions"]
+    try:
+        scan_eps_adaptive(1.9, 0.1, 1.0, 48, checkpoint=ckpt, **dict(kw, eps_tol=0.01))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("checkpoint de outra varredura deveria ser rejeitado")
+
+
+test_phase_diagram_and_adaptive_checkpoint_resume()
+
+
+def test_scan_eps_ensemble_spends_seeds_near_transition():
+    from gcm.analysis import scan_eps_ensemble
+
+    grid = np.array([0.2, 0.45, 0.7])  # sync_boundaries(1.9) = (0.474, 1.53)
+    kw = dict(T_burn=200, T_meas=200, seed_base=5, min_seeds=4, max_seeds=24)
+    res = scan_eps_ensemble(1.9, grid, 128, batch_size=4, **kw)
+    assert res.n_seeds[2] == 4 and res.converged[2]
+    assert res.mean["sigma_bar"][2] < 1e-7 and res.mean["M_bar"][2] == 1.0
+    assert res.n_seeds[1] > res.n_seeds[0]
+    tol = np.maximum(1e-3, 0.05 * np.abs(res.mean["sigma_bar"]))
+    assert np.all(~res.converged | (res.ci["sigma_bar"] <= tol))
+
+    # realizações não dependem do tamanho do lote nem de paralelismo
+    other = scan_eps_ensemble(1.9, grid, 128, batch_size=20, n_workers=2, **kw)
+    assert np.array_equal(other.mean["sigma_bar"][[0, 2]], res.mean["sigma_bar"][[0, 2]])
+
+
+test_scan_eps_ensemble_spends_seeds_near_transition()
@@ -0,0 +1,68 @@
+import warnings
+
+import numpy as np
+
+from gcm.backends import (
+    VALIDATION_ATOL,
+    available_backends,
+    get_backend,
+    register_backend,
+    validate_backend,
+)
+from gcm.core import Config, GloballyCoupledMaps
+
+
+
+
+def test_backends_match_reference_step():
+    # "auto" é o numba quando instalado; caso contrário, o próprio numpy
+    for name in ["numpy", "auto"]:
+        err = validate_backend(name, N=300, eps=0.3, mu=1.9, steps=20)
+        assert err <= VALIDATION_ATOL
+    assert "numpy" in available_backends()
+
+test_backends_match_reference_step()
+
+
+def test_missing_dependency_falls_back_to_numpy():
+    def _factory():
+        raise ImportError("pacote_inexistente")
+
+    register_backend("_missing", _factory)
+    with warnings.catch_warnings(record=True) as rec:
+        warnings.simplefilter("always")
+        be = get_backend("_missing")
+    assert be.name == "numpy"
+    assert any(issubclass(w.category, RuntimeWarning) for w in rec)
+
+test_missing_dependency_falls_back_to_numpy()
+
+
+def test_run_with_backend_and_burn_and_measure():
+    cfg = Config(N=256, eps=1.1, mu=1.9, seed=5)
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset(init="half_half")
+    sys.run(T=200, backend="auto")
+    assert sys.x.shape == (256,)
+    assert sys.last_escaped_mask.shape == (256,)
+
+    sig_bar, esc = get_backend("auto").burn_and_measure(sys, 100, 100)
+    assert sig_bar < 1e-7  # ε=1.1 está na banda de sincronização para μ=1.9
+    assert esc == 0.0
+
+test_run_with_backend_and_burn_and_measure()
+
+
+def test_stationary_only_stop_matches_across_backends():
+    from gcm.analysis import scan_eps
+    from gcm.observers import StopCriteria
+
+    # μ=0.5: x → 0 e a parada "stationary" acontece ainda no burn-in
+    kw = dict(T_burn=2000, T_meas=200, init="uniform", seed_base=1, stop=StopCriteria(sigma_tol=None))
+    ref = scan_eps(0.5, [0.0, 0.3], 64, backend="numpy", **kw)
+    res = scan_eps(0.5, [0.0, 0.3], 64, backend="auto", **kw)
+    assert ref.meta["stop_reason"] == res.meta["stop_reason"] == ["stationary", "stationary"]
+    assert np.all(np.isfinite(res.sigma_mean)) and np.all(res.is_synced == ref.is_synced)
+    assert np.allclose(res.sigma_mean, ref.sigma_mean, atol=1e-12)
+
+test_stationary_only_stop_matches_across_backends()
@@ -0,0 +1,34 @@
+import json
+from pathlib import Path
+
+from gcm.bench import CASES, compare_results, main, run_benchmarks
+
+
+def test_bench_json_and_regression_flag(tmp_path: Path = Path("test_analysis")):
+    res = run_benchmarks([64], T=4, repeats=1)
+    assert {r["case"] for r in res["results"]} == set(CASES)
+    for r in res["results"]:
+        assert r["rate"] > 0 and r["peak_mb"] >= 0 and r["N"] == 64
+
+    slower = json.loads(json.dumps(res))
+    for r in slower["results"]:
+        r["rate"] /= 2.0
+    rows = compare_results(res, slower, threshold=0.2)
+    assert len(rows) == len(res["results"]) and all(r["regression"] for r in rows)
+    assert not any(r["regression"] for r in compare_results(res, res))
+
+    base = tmp_path / "bench" / "base.json"
+    assert main(["run", "-o", str(base), "--N", "64", "--T", "3", "--repeats", "1", "--cases", "step", "run"]) == 0
+    assert main(["compare", str(base), str(base)]) == 0
+
+    # execução sem casos em comum (T diferente) ou com casos faltando não passa
+    other = tmp_path / "bench" / "other.json"
+    assert main(["run", "-o", str(other), "--N", "64", "--T", "2", "--repeats", "1", "--cases", "step"]) == 0
+    assert main(["compare", str(base), str(other)]) == 1
+    assert main(["run", "-o", str(other), "--N", "64", "--T", "3", "--repeats", "1", "--cases", "step"]) == 0
+    assert main(["compare", str(base), str(other)]) == 1
+    # casos extras na execução atual não reprovam (limiar folgado: T=3 é só ruído de tempo)
+    assert main(["compare", str(other), str(base), "--threshold", "0.999"]) == 0
+
+
+test_bench_json_and_regression_flag()
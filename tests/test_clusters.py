@@ -0,0 +1,68 @@
+import numpy as np
+
+from gcm.clusters import ClusteredMaps
+from gcm.core import Config, GloballyCoupledMaps
+
+
+def test_two_cluster_state_steps_exactly():
+    cfg = Config(N=10_000, eps=0.3, mu=1.9, seed=1)
+    ref = GloballyCoupledMaps(cfg)
+    ref.x = np.where(np.arange(cfg.N) % 3 == 0, 0.6, -0.55)
+    comp = ClusteredMaps.from_system(ref)
+    assert comp.n_clusters == 2 and comp.counts.sum() == cfg.N
+
+    # a dinâmica dos clusters é caótica: compara enquanto o arredondamento não amplifica
+    ref.run(20)
+    comp.run(20)
+    assert np.allclose(comp.x, ref.x, atol=1e-9)
+    assert np.isclose(comp.magnetization, np.mean(np.where(ref.x < 0, -1, 1)))
+    comp.run(2_000)
+    assert comp.n_clusters == 2 and comp.n_compress == 0
+
+test_two_cluster_state_steps_exactly()
+
+
+def test_merges_when_synchronizing_and_expands_when_unstable():
+    # ε = 0.7 (μ = 1.9): transversalmente estável → colapsa em um único cluster
+    cfg = Config(N=2_000, eps=0.7, mu=1.9, seed=5)
+    comp = ClusteredMaps(cfg)
+    comp.reset("half_half")
+    assert comp.n_clusters == cfg.N
+    comp.run(200)
+    assert comp.n_clusters == 1 and comp.sigma < 1e-12
+
+    # cluster com desvios ~1e-13 em ε = 0.2 (instável): os desvios crescem e ele se desfaz
+    cfg = Config(N=1_000, eps=0.2, mu=1.9, seed=5)
+    ref = GloballyCoupledMaps(cfg)
+    ref.x = 0.5 + 1e-13 * np.random.default_rng(0).standard_normal(cfg.N)
+    comp = ClusteredMaps.from_system(ref, tol=1e-12)
+    assert comp.n_clusters == 1
+    for _ in range(15):
+        ref.step()
+        comp.step()
+        # média de f ponderada pelos desvios: mesma trajetória enquanto linear
+        assert np.allclose(comp.x, ref.x, atol=1e-12)
+        assert np.isclose(comp.sigma, ref.x.std(), rtol=1e-6, atol=1e-15)
+    assert comp.n_clusters > 1 and comp.n_compress > 0
+
+test_merges_when_synchronizing_and_expands_when_unstable()
+
+
+def test_reset_and_set_eps_without_full_system():
+    import pytest
+
+    cfg = Config(N=500, eps=0.3, mu=1.9, seed=11)
+    comp = ClusteredMaps(cfg)
+    comp.reset("half_half")
+    ref = GloballyCoupledMaps(cfg)
+    ref.reset("half_half")
+    assert np.array_equal(np.sort(comp.x), np.sort(ref.x))
+
+    comp.set_eps(1.2)
+    assert comp.cfg.eps == 1.2 and comp.cfg.N == cfg.N
+    with pytest.raises(ValueError):
+        comp.set_eps(float("nan"))
+    with pytest.raises(ValueError):
+        ClusteredMaps(Config(N=10, eps=0.3, mu=1.9, dtype="float32"))
+
+test_reset_and_set_eps_without_full_system()
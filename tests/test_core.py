@@ -1,4 +1,5 @@
 import numpy as np
+from pathlib import Path
 from gcm.core import Config, GloballyCoupledMaps
 from gcm.maps import bistable_intervals
 
@@ -61,4 +62,166 @@ def test_run_shapes_and_escaped_mask():
     assert traj.shape == (40, N)
     assert sys.last_escaped_mask.shape == (N,)
 
-test_run_shapes_and_escaped_mask()
\ No newline at end of file
+test_run_shapes_and_escaped_mask()
+
+
+def test_batch_rows_match_single_system():
+    from gcm.core import GloballyCoupledMapsBatch
+    N = 200
+    eps_list = [0.2, 0.7, 1.1]
+    mu_list = [1.9, 1.5, 1.9]
+    seeds = [11, 12, 13]
+    batch = GloballyCoupledMapsBatch(N=N, eps=eps_list, mu=mu_list, seeds=seeds)
+    batch.reset(init="half_half")
+    traj = batch.run(T=30, discard=10, track=True)
+    assert traj.shape == (20, 3, N)
+    assert batch.last_escaped_mask.shape == (3, N)
+
+    for r in range(3):
+        sys = GloballyCoupledMaps(batch.config(r))
+        sys.reset(init="half_half")
+        sys.run(T=30)
+        assert np.allclose(batch.x[r], sys.x)
+
+test_batch_rows_match_single_system()
+
+
+
+def test_step_inplace_without_allocations():
+    import tracemalloc
+    N = 20_000
+    cfg = Config(N=N, eps=0.7, mu=1.9, seed=3)
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset(init="half_half")
+    sys.step()
+    x_buf = sys.x
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    sys.run(T=50)
+    sys.run(T=50, check_escape=False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert sys.x is x_buf
+    assert sys.last_escaped_mask is None
+    # nenhuma alocação de tamanho N (8*N bytes) no laço
+    assert peak - base < N
+
+test_step_inplace_without_allocations()
+
+
+
+def test_run_early_stop_reasons():
+    from gcm.observers import StopCriteria
+    # ε=1.1 está dentro da banda de sincronização (μ=1.9)
+    sys = GloballyCoupledMaps(Config(N=128, eps=1.1, mu=1.9, seed=1))
+    sys.reset(init="half_half")
+    traj = sys.run(T=1000, discard=5, track=True, stop=StopCriteria(patience=5))
+    assert sys.last_stop_reason == "synced"
+    assert sys.last_run_steps < 1000
+    assert traj.shape == (sys.last_run_steps - 5, 128)
+
+    # |μ|<1: ponto fixo x=0
+    sys = GloballyCoupledMaps(Config(N=64, eps=0.0, mu=0.5, seed=1))
+    sys.reset(init="uniform")
+    sys.run(T=1000, stop=StopCriteria(sigma_tol=None))
+    assert sys.last_stop_reason == "stationary"
+
+    # sem parada: roda tudo
+    sys.run(T=10, stop=StopCriteria(sigma_tol=None, stationary_tol=None))
+    assert sys.last_stop_reason is None and sys.last_run_steps == 10
+
+test_run_early_stop_reasons()
+
+
+
+def test_set_eps_and_mu_keep_state():
+    sys = GloballyCoupledMaps(Config(N=64, eps=0.2, mu=1.9, seed=9))
+    sys.reset(init="half_half")
+    sys.run(T=10)
+    x_before = sys.x.copy()
+    sys.set_eps(0.8)
+    sys.set_mu(1.7)
+    assert sys.cfg.eps == 0.8 and sys.cfg.mu == 1.7 and sys.cfg.seed == 9
+    assert np.array_equal(sys.x, x_before)
+
+    from gcm.core import GloballyCoupledMapsBatch
+    batch = GloballyCoupledMapsBatch(N=64, eps=[0.2, 0.3], mu=1.9)
+    batch.set_eps(1.1, rows=[1])
+    assert batch.eps.tolist() == [0.2, 1.1]
+    try:
+        sys.set_eps(float("nan"))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("set_eps deveria validar ε")
+
+test_set_eps_and_mu_keep_state()
+
+
+
+def test_save_load_resumes_bit_identical(tmp_path: Path = Path("test_analysis")):
+    path = tmp_path / "ckpt_core.npz"
+    sys = GloballyCoupledMaps(Config(N=100, eps=0.4, mu=1.9, seed=123))
+    sys.reset(init="half_half")
+    sys.run(T=50)
+    sys.save(path)
+
+    sys.run(T=50)
+    sys.reset(init="uniform")  # consome o RNG após o checkpoint
+    sys.run(T=10)
+    ref_x, ref_mask = sys.x.copy(), sys.last_escaped_mask.copy()
+
+    resumed = GloballyCoupledMaps.load(path)
+    assert resumed.cfg == Config(N=100, eps=0.4, mu=1.9, seed=123)
+    resumed.run(T=50)
+    resumed.reset(init="uniform")
+    resumed.run(T=10)
+    assert np.array_equal(resumed.x, ref_x)
+    assert np.array_equal(resumed.last_escaped_mask, ref_mask)
+
+test_save_load_resumes_bit_identical()
+
+
+
+def test_float32_mode_matches_float64_statistics():
+    from gcm.analysis import scan_eps
+    from gcm.core import GloballyCoupledMapsBatch
+    from gcm.observers import MagnetizationObserver
+
+    sys = GloballyCoupledMaps(Config(N=64, eps=0.3, mu=1.9, seed=1, dtype=np.float32))
+    assert sys.cfg.dtype == "float32"
+    sys.reset(init="half_half")
+    traj = sys.run(T=20, discard=10, track=True)
+    assert sys.x.dtype == np.float32 and traj.dtype == np.float32
+    batch = GloballyCoupledMapsBatch.from_configs([sys.cfg, sys.cfg])
+    assert batch.x.dtype == np.float32 and batch.config(0) == sys.cfg
+
+    grid = np.array([0.2, 0.5, 1.1, 2.8])
+    kw = dict(T_burn=300, T_meas=300, seed_base=2, tol_sync=1e-6)
+    r64 = scan_eps(1.5, grid, 256, **kw)
+    r32 = scan_eps(1.5, grid, 256, dtype="float32", **kw)
+    assert np.array_equal(r32.is_synced, r64.is_synced) and r64.is_synced[2]
+    assert np.array_equal(r32.escaped_frac > 0, r64.escaped_frac > 0)
+    ok = ~r64.is_synced & (r64.escaped_frac == 0)
+    assert np.allclose(r32.sigma_mean[ok], r64.sigma_mean[ok], rtol=1e-3)
+
+    Ms = []
+    for dtype in ("float64", "float32"):
+        s = GloballyCoupledMaps(Config(N=256, eps=0.5, mu=1.9, seed=3, dtype=dtype))
+        s.reset(init="half_half")
+        obs = MagnetizationObserver()
+        s.run(T=400, discard=200, observers=[obs])
+        Ms.append(obs.mean)
+    assert Ms[0] == Ms[1]
+
+    try:
+        Config(N=8, eps=0.1, mu=1.9, dtype="float16")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("dtype float16 deveria ser rejeitado")
+
+test_float32_mode_matches_float64_statistics()
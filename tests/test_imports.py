@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# tempo de import do pacote sem contar o numpy (s); matplotlib sozinho passa disso
+IMPORT_BUDGET_S = 0.3
+
+
+def _import_times(code: str) -> tuple[dict, str]:
+    """Roda `code` num processo novo com `-X importtime`; devolve {módulo: cumulativo (s)} e stdout."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, cwd=ROOT, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) * 1e-6
+    return times, proc.stdout
+
+
+def test_analysis_import_is_light_and_plotting_lazy():
+    times, out = _import_times(
+        "import sys, gcm.analysis\n"
+        "print('matplotlib' in sys.modules)\n"
+        "from gcm.analysis import plot_sigma_vs_eps\n"
+        "print('matplotlib' in sys.modules, plot_sigma_vs_eps.__module__)\n"
+    )
+    assert out.split() == ["False", "True", "gcm.plotting"]
+    # gcm.analysis já carrega gcm.core e gcm.metrics
+    assert {"gcm.core", "gcm.metrics"} <= set(times)
+    assert times["gcm.analysis"] - times["numpy"] < IMPORT_BUDGET_S, times
+
+
+test_analysis_import_is_light_and_plotting_lazy()
@@ -63,4 +63,22 @@ def test_lyapunov_local_and_boundaries():
     esc_lo, esc_hi = escape_boundaries(mu)
     assert esc_lo < esc_hi
 
-test_lyapunov_local_and_boundaries()
\ No newline at end of file
+test_lyapunov_local_and_boundaries()
+
+
+def test_bistable_map_out_buffer_and_inplace():
+    mu = 1.9
+    xs = np.linspace(-1.0, 1.0, 301)
+    ref = bistable_map(xs, mu)
+
+    out = np.empty_like(xs)
+    y = bistable_map(xs, mu, out=out)
+    assert y is out
+    assert np.allclose(out, ref)
+
+    xs_inplace = xs.copy()
+    y = bistable_map(xs_inplace, mu, out=xs_inplace)
+    assert y is xs_inplace
+    assert np.allclose(xs_inplace, ref)
+
+test_bistable_map_out_buffer_and_inplace()
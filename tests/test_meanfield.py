@@ -0,0 +1,56 @@
+import numpy as np
+
+from gcm.analysis import scan_eps, scan_eps_meanfield
+from gcm.meanfield import MeanFieldDensity
+
+
+def test_meanfield_conserves_mass_and_aligns_bins():
+    mf = MeanFieldDensity(eps=0.2, mu=1.9, n_bins=1000)
+    assert mf.n_bins % 6 == 0
+    for b in (-1 / 3, 0.0, 1 / 3):
+        assert np.isclose(mf.edges, b, atol=1e-12).any()
+    mf.reset("half_half")
+    assert np.isclose(mf.mass, 1.0) and abs(mf.magnetization) < 1e-12
+    mf.run(200)
+    assert np.isclose(mf.mass, 1.0) and mf.escape_mass == 0.0
+
+    # ε = 1: toda a massa vai para m em um passo (imagem degenerada)
+    mf = MeanFieldDensity(eps=1.0, mu=1.9, n_bins=600)
+    mf.reset("uniform")
+    mf.step()
+    assert np.isclose(mf.mass, 1.0) and np.isclose(mf.sigma, mf.sigma_floor)
+
+test_meanfield_conserves_mass_and_aligns_bins()
+
+
+def test_meanfield_matches_large_N_and_reports_escape():
+    mu, eps_grid = 1.9, np.array([0.1, 0.3, 0.7])
+    mf = scan_eps_meanfield(mu, eps_grid, T_burn=300, T_meas=200, n_bins=1200)
+    ref = scan_eps(mu, eps_grid, 20_000, T_burn=300, T_meas=200, seed_base=4)
+    # fase dessincronizada: σ̄ de campo médio ≈ σ̄ de N grande
+    assert np.allclose(mf.sigma_mean[:2], ref.sigma_mean[:2], atol=5e-3)
+    # fase sincronizada: σ̄ desce até a resolução da densidade
+    assert mf.is_synced.tolist() == [False, False, True]
+
+    esc = MeanFieldDensity(eps=0.05, mu=3.5, n_bins=600)
+    esc.reset("uniform")
+    esc.run(20)
+    assert esc.escape_mass > 0.5 and np.isclose(esc.mass + esc.escape_mass, 1.0)
+
+test_meanfield_matches_large_N_and_reports_escape()
+
+
+def test_meanfield_sync_band_and_eps_above_one():
+    # μ=1.9: banda de sincronização ≈ [0.474, 1.526]; ε > 1 é válido como em `Config`
+    mu, eps_grid = 1.9, np.array([0.55, 0.6, 1.0, 1.2, 1.8])
+    mf = scan_eps_meanfield(mu, eps_grid, T_burn=300, T_meas=200, n_bins=1200)
+    ref = scan_eps(mu, eps_grid, 20_000, T_burn=300, T_meas=200, seed_base=4)
+    # a difusão numérica perto de ε_c não pode desclassificar pontos sincronizados
+    assert mf.is_synced.tolist() == ref.is_synced.tolist() == [True, True, True, True, False]
+    assert np.isclose(mf.sigma_mean[-1], ref.sigma_mean[-1], atol=5e-3)
+
+    mf_density = MeanFieldDensity(eps=0.3, mu=mu, n_bins=600)
+    mf_density.set_eps(1.8)
+    assert mf_density.eps == 1.8
+
+test_meanfield_sync_band_and_eps_above_one()
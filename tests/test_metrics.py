@@ -5,6 +5,8 @@ from gcm.metrics import (
     magnetization,
     order_param_M,
     persistence_curve,
+    PersistenceAccumulator,
+    RunningStats,
 )
 
 
@@ -39,4 +41,67 @@ def test_persistence_curve_and_order_param():
     m_ord = order_param_M(Ms)
     assert np.isclose(m_ord, abs(Ms.mean()))
 
-test_persistence_curve_and_order_param()
\ No newline at end of file
+test_persistence_curve_and_order_param()
+
+
+def test_packed_spins_match_unpacked():
+    rng = np.random.default_rng(3)
+    X = rng.uniform(-1, 1, size=(40, 37))  # N não múltiplo de 8
+    X[5, 3] = 0.0
+    P = spins(X, packed=True)
+    S = spins(X)
+    assert P.shape == (40, 37) and P.bits.shape == (40, 5)
+    assert np.array_equal(spins(P), S)
+    assert np.isclose(magnetization(P), S.mean())
+    assert np.allclose(P.magnetization(), S.mean(axis=1))
+    assert np.array_equal(P[1:].flips(P[:-1]), (S[1:] != S[:-1]).sum(axis=1))
+    assert np.allclose(persistence_curve(P), persistence_curve(S))
+
+test_packed_spins_match_unpacked()
+
+
+
+def test_persistence_vectorized_and_streaming_match_loop():
+    rng = np.random.default_rng(11)
+    S = np.where(rng.random((200, 50)) < 0.02, -1, 1).cumprod(axis=0)  # trocas raras
+    S[:, :5] = 1  # sítios que nunca trocam
+
+    changed = np.zeros(S.shape[1], dtype=bool)
+    ref = [1.0]
+    for t in range(1, len(S)):
+        changed |= S[t] != S[0]
+        ref.append(1.0 - changed.mean())
+    assert np.allclose(persistence_curve(S), ref)
+
+    acc = PersistenceAccumulator()
+    for a in range(0, len(S), 37):
+        acc.update(S[a:a + 37])
+    assert acc.n_steps == len(S)
+    assert np.allclose(acc.curve(), ref)
+    assert np.all(acc.first_flip[:5] == -1)
+
+    acc = PersistenceAccumulator()
+    for a in range(0, len(S), 64):
+        acc.update(spins(S[a:a + 64], packed=True))
+    assert np.allclose(acc.curve(), ref)
+
+test_persistence_vectorized_and_streaming_match_loop()
+
+
+def test_running_stats_blocks_match_numpy_and_skip_nonfinite():
+    x = np.random.default_rng(3).normal(1.0, 2.0, size=(40, 3))
+    x[5, 1] = np.nan
+    x[9, 2] = np.inf
+    st = RunningStats(3)
+    for block in np.array_split(x, [1, 4, 20]):
+        st.update(block)
+    ok = np.where(np.isfinite(x), x, np.nan)
+    assert st.n.tolist() == [40, 39, 39]
+    assert np.allclose(st.mean, np.nanmean(ok, axis=0))
+    assert np.allclose(st.var, np.nanvar(ok, axis=0, ddof=1))
+    # t(0.975, ν=39) ≈ 2.0227
+    assert np.allclose(st.ci_halfwidth(0.95)[0], 2.0227 * st.sem[0], rtol=1e-3)
+    assert np.isinf(RunningStats().ci_halfwidth())
+
+
+test_running_stats_blocks_match_numpy_and_skip_nonfinite()
@@ -0,0 +1,166 @@
+import numpy as np
+
+from gcm.core import Config, GloballyCoupledMaps, GloballyCoupledMapsBatch
+from gcm.maps import bistable_intervals
+from gcm.metrics import magnetization, order_param_M, persistence_curve, spins
+from gcm.observers import (
+    CallbackObserver,
+    EscapeObserver,
+    HistogramObserver,
+    LyapunovObserver,
+    MagnetizationObserver,
+    PersistenceObserver,
+    SigmaObserver,
+)
+
+
+
+
+def _tracked_reference(cfg, T, discard):
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset(init="half_half")
+    sys.run(discard, track=False)
+    x0 = sys.x.copy()
+    traj = sys.run(T - discard, track=True)
+    return np.vstack([x0[None, :], traj])
+
+
+def test_observers_match_tracked_metrics():
+    cfg = Config(N=300, eps=0.7, mu=1.9, seed=21)
+    T, discard = 120, 20
+    full = _tracked_reference(cfg, T, discard)
+    traj = full[1:]
+
+    sig, mag, esc, per = SigmaObserver(keep_series=True), MagnetizationObserver(), EscapeObserver(), PersistenceObserver(keep_curve=True)
+    calls = []
+    cb = CallbackObserver(lambda t, x, e: calls.append(t), every=25)
+
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset(init="half_half")
+    out = sys.run(T, discard=discard, observers=[sig, mag, esc, per, cb])
+    assert out is None
+
+    assert np.allclose(sig.series, np.std(traj, axis=1))
+    assert np.isclose(sig.mean, np.std(traj, axis=1).mean())
+    Ms = np.array([magnetization(x) for x in traj])
+    assert np.isclose(mag.order_param, order_param_M(Ms))
+    assert esc.frac == 0.0
+    assert np.allclose(per.curve, persistence_curve(spins(full)))
+    assert calls == [25, 50, 75, 100]
+
+test_observers_match_tracked_metrics()
+
+
+def test_observers_on_batch_rows():
+    batch = GloballyCoupledMapsBatch(N=200, eps=[0.2, 1.1], mu=1.9, seeds=[1, 2])
+    batch.reset(init="half_half")
+    sig, per = SigmaObserver(), PersistenceObserver()
+    batch.run(300, discard=100, observers=[sig, per])
+    assert sig.mean.shape == (2,)
+    assert per.p.shape == (2,)
+    # ε=1.1 sincroniza (σ̄ ~ 0); ε=0.2 não
+    assert sig.mean[1] < 1e-7 < sig.mean[0]
+
+test_observers_on_batch_rows()
+
+
+
+def test_lyapunov_observer_matches_sync_band():
+    from gcm.maps import lyapunov_local, sync_boundaries
+
+    mu = 1.9
+    eps = np.linspace(0.1, 1.4, 14)
+    batch = GloballyCoupledMapsBatch(N=128, eps=eps, mu=mu, seeds=list(range(eps.size)))
+    batch.reset(init="half_half")
+    batch.run(400)
+    lyap = LyapunovObserver(batch.eps, batch.mu)
+    batch.run(400, observers=[lyap])
+    assert lyap.transverse.shape == (eps.size,)
+
+    lo, hi = sync_boundaries(mu)
+    inside = (eps > lo) & (eps < hi)
+    assert np.array_equal(lyap.transverse < 0, inside)
+    # fora da sincronização a projeção não é λ⊥: NaN
+    assert np.all(np.isnan(lyap.transverse[~inside])) and np.all(lyap.synced_frac[inside] == 1.0)
+    # estado sincronizado: λ⊥ = ln|1-ε| + ln|μ| e modo coletivo = λ_local
+    assert np.allclose(lyap.transverse[inside], np.log(np.abs(1 - eps[inside])) + lyapunov_local(mu))
+    assert np.allclose(lyap.collective[inside], lyapunov_local(mu))
+    assert np.allclose(lyap.local, lyapunov_local(mu))
+
+    # sistema único (N,) dá o mesmo que a linha correspondente do lote
+    sys = GloballyCoupledMaps(batch.config(0))
+    sys.reset(init="half_half")
+    sys.run(400)
+    single = LyapunovObserver(sys.cfg.eps, sys.cfg.mu)
+    sys.run(400, observers=[single])
+    assert np.isnan(single.transverse) and np.isclose(single.collective, lyap.collective[0], atol=0.02)
+    k = int(np.argmax(inside))
+    sys = GloballyCoupledMaps(batch.config(k))
+    sys.reset(init="half_half")
+    sys.run(400)
+    single = LyapunovObserver(sys.cfg.eps, sys.cfg.mu)
+    sys.run(400, observers=[single])
+    assert np.isclose(single.transverse, lyap.transverse[k])
+
+test_lyapunov_observer_matches_sync_band()
+
+
+def test_histogram_observer_matches_trajectory_histogram_and_batch_rows():
+    cfg = Config(N=500, eps=0.3, mu=1.9, seed=4)
+    ref = GloballyCoupledMaps(cfg)
+    ref.reset()
+    X = ref.run(120, discard=20, track=True)
+
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset()
+    hist = HistogramObserver(40, mu=1.9)
+    sys.run(120, discard=20, observers=[hist])
+    counts, _ = np.histogram(X, bins=40, range=(-1.0, 1.0))
+    assert np.array_equal(hist.counts, counts)
+    assert hist.underflow == hist.overflow == 0
+    assert np.isclose(hist.density.sum() * 2.0 / 40, 1.0)
+    (a, b), (c, d) = bistable_intervals(1.9)
+    assert np.isclose(hist.occupancy_plus, ((X >= c) & (X <= d)).mean())
+    assert np.isclose(hist.occupancy_minus, ((X >= a) & (X <= b)).mean())
+
+    # lote: cada linha tem seu próprio histograma (e I± do seu μ); estado fora de bounds vai para under/overflow
+    batch = GloballyCoupledMapsBatch(N=500, eps=[0.3, 0.6], mu=[1.9, 1.5], seeds=[4, 5])
+    batch.reset()
+    hb = HistogramObserver(40, bounds=(-0.5, 0.5), mu=batch.mu.copy())
+    batch.run(50, observers=[hb])
+    assert hb.counts.shape == (2, 40)
+    assert np.array_equal(hb.counts.sum(axis=1) + hb.underflow + hb.overflow, [50 * 500, 50 * 500])
+    single = GloballyCoupledMaps(batch.config(1))
+    single.reset()
+    h1 = HistogramObserver(40, bounds=(-0.5, 0.5), mu=1.5)
+    single.run(50, observers=[h1])
+    assert np.array_equal(hb.counts[1], h1.counts) and hb.overflow[1] == h1.overflow
+    assert np.isclose(hb.occupancy_plus[1], h1.occupancy_plus)
+
+
+test_histogram_observer_matches_trajectory_histogram_and_batch_rows()
+
+
+def test_stop_monitor_update_does_not_allocate():
+    import tracemalloc
+
+    from gcm.observers import StopCriteria, StopMonitor
+
+    N = 100_000
+    x = np.random.default_rng(0).uniform(-0.9, 0.9, size=N)
+    mon = StopMonitor(StopCriteria(stationary_tol=1e-12))
+    mon.start(x)
+    mon.update(x, None)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    for _ in range(20):
+        mon.update(x, None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # nem a máscara bool de escape (N bytes) é alocada por passo
+    assert peak - base < N // 4
+    assert mon.reason == "stationary"
+
+test_stop_monitor_update_does_not_allocate()
@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from gcm.analysis import scan_eps
+from gcm.core import Config, GloballyCoupledMaps
+from gcm.profiling import active, format_report, profiling
+
+
+def test_profiling_is_opt_in_and_attached_to_scan(tmp_path: Path = Path("test_analysis")):
+    grid = np.array([0.2, 1.1])
+    kw = dict(T_burn=30, T_meas=20, seed_base=5)
+    plain = scan_eps(1.9, grid, 64, **kw)
+    assert "profile" not in plain.meta and active() is None
+
+    with profiling(track_alloc=True) as prof:
+        res = scan_eps(1.9, grid, 64, **kw)
+        sys = GloballyCoupledMaps(Config(N=32, eps=0.3, mu=1.9, seed=0))
+        sys.reset()
+        sys.run(10, check_escape=False)
+    assert active() is None
+    assert np.array_equal(res.sigma_mean, plain.sigma_mean)
+
+    rep = res.meta["profile"]
+    assert rep["counters"]["steps"] == grid.size * 50
+    assert rep["timers"]["scan_eps.point"]["calls"] == grid.size
+    for phase in ("step.map", "step.mean", "step.update", "step.escape", "run.other"):
+        assert phase in rep["timers"]
+    # o profiler externo soma a varredura e o `run` avulso (sem fase de escape)
+    total = prof.report()
+    assert total["counters"]["steps"] == grid.size * 50 + 10
+    assert total["timers"]["step.escape"]["calls"] == grid.size * 50
+    assert total["alloc"]["peak_mb"] >= 0 and total["steps_per_s"] > 0
+    assert "step.map" in format_report(rep)
+
+    out = prof.save(tmp_path / "profile.json")
+    assert json.loads(out.read_text())["counters"]["steps"] == total["counters"]["steps"]
+
+
+test_profiling_is_opt_in_and_attached_to_scan()
+
+
+def test_nested_track_alloc_keeps_outer_peak():
+    grid = np.array([0.2, 1.1])
+    with profiling(track_alloc=True) as outer:
+        big = np.ones(4 * 2**20 // 8)  # 4 MB, liberado antes da varredura
+        del big
+        res = scan_eps(1.9, grid, 64, T_burn=30, T_meas=20, seed_base=5)
+        with profiling(track_alloc=True) as inner:
+            tmp = np.ones(2 * 2**20 // 8)  # 2 MB dentro do bloco interno
+            del tmp
+    # o reset_peak dos blocos internos (varredura e `inner`) não apaga o pico do externo
+    assert outer.alloc["peak_mb"] >= 4.0
+    assert 2.0 <= inner.alloc["peak_mb"] < 4.0
+    assert res.meta["profile"]["alloc"]["peak_mb"] < 4.0
+
+
+test_nested_track_alloc_keeps_outer_peak()
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import numpy as np
+
+from gcm.core import Config, GloballyCoupledMaps
+from gcm.observers import MagnetizationObserver, SigmaObserver
+from gcm.quench import Preparation, SnapshotLibrary, quench
+
+
+def test_quench_reuses_snapshots_and_matches_direct_preparation(tmp_path: Path = Path("test_analysis")):
+    db = tmp_path / "snapshots.sqlite"
+    db.unlink(missing_ok=True)
+    prep = Preparation(eps_start=0.05, n_stages=4, T_stage=50)
+    targets = np.linspace(0.40, 0.55, 4)
+    kw = dict(prep=prep, seeds=[3, 4], T_burn=40, T_meas=60)
+
+    with SnapshotLibrary(db) as lib:
+        res = quench(lib, 1.9, 0.47, targets, 128, **kw)
+        assert res.meta["n_prepared"] == 2 and res.sigma_bar.shape == (2, 4)
+        again = quench(lib, 1.9, 0.47, targets[::-1], 128, **kw)
+        assert again.meta["n_prepared"] == again.meta["n_loaded"] == 0
+        assert np.array_equal(again.sigma_bar, res.sigma_bar[:, ::-1])
+
+        # snapshot = preparação direta (rampa com set_eps) da mesma semente
+        sys = GloballyCoupledMaps(Config(N=128, eps=0.05, mu=1.9, seed=4))
+        sys.reset()
+        for e in prep.path(0.47)[1:]:
+            sys.set_eps(e)
+            sys.run(prep.T_stage)
+        snap = lib.system(res.meta["keys"][1])
+        assert np.array_equal(snap.x, sys.x)
+        assert snap.rng.bit_generator.state == sys.rng.bit_generator.state
+
+        sys.set_eps(targets[2])
+        sig, mag = SigmaObserver(), MagnetizationObserver()
+        sys.run(100, discard=40, observers=[sig, mag])
+        assert np.isclose(res.sigma_bar[1, 2], sig.mean) and np.isclose(res.M_mean[1, 2], mag.mean)
+
+    with SnapshotLibrary(db) as lib:  # nova sessão: lê do disco
+        res_disk = quench(lib, 1.9, 0.47, targets, 128, n_workers=2, **kw)
+        assert res_disk.meta["n_loaded"] == 2 and res_disk.meta["n_prepared"] == 0
+        assert np.array_equal(res_disk.M_bar, res.M_bar)
+        assert len(lib.query(mu=1.9, eps_start=0.05)) == 2
+
+
+test_quench_reuses_snapshots_and_matches_direct_preparation()
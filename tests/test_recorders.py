@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import numpy as np
+
+from gcm.core import Config, GloballyCoupledMaps, GloballyCoupledMapsBatch
+from gcm.metrics import persistence_curve, spins
+from gcm.recorders import ChunkedNpzRecorder, NpyRecorder, open_trajectory
+
+
+def _tracked(cfg, T, discard):
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset(init="half_half")
+    return sys.run(T, discard=discard, track=True)
+
+
+def test_npy_recorder_matches_track(tmp_path: Path = Path("test_analysis")):
+    cfg = Config(N=64, eps=0.3, mu=1.9, seed=5)
+    ref = _tracked(cfg, 200, 50)
+    assert ref.shape == (150, 64)
+
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset(init="half_half")
+    traj = sys.run(200, discard=50, recorder=NpyRecorder(tmp_path / "traj.npy"))
+    assert isinstance(traj, np.memmap) and traj.shape == ref.shape
+    assert np.array_equal(np.asarray(traj), ref)
+
+    reopened = open_trajectory(tmp_path / "traj.npy")
+    assert np.array_equal(persistence_curve(spins(reopened)), persistence_curve(spins(ref)))
+
+
+test_npy_recorder_matches_track()
+
+
+def test_chunked_recorder_dtype_and_lazy_slices(tmp_path: Path = Path("test_analysis")):
+    cfg = Config(N=32, eps=0.5, mu=1.9, seed=9)
+    ref = _tracked(cfg, 130, 7)
+
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset(init="half_half")
+    rec = ChunkedNpzRecorder(tmp_path / "traj.npz", dtype=np.float32, chunk_rows=16)
+    traj = sys.run(130, discard=7, recorder=rec)
+    assert traj.shape == (123, 32) and traj.dtype == np.float32
+    assert traj.n_chunks == 8
+    assert np.array_equal(np.asarray(traj), ref.astype(np.float32))
+    assert np.array_equal(traj[15:40], ref[15:40].astype(np.float32))
+    assert np.array_equal(traj[-1], ref[-1].astype(np.float32))
+    assert np.array_equal(traj[3:90, 4], ref[3:90, 4].astype(np.float32))
+    traj.close()
+
+    # batch: linhas (R, N) e sem compressão
+    batch = GloballyCoupledMapsBatch(16, eps=[0.2, 0.6], mu=1.9, seeds=[1, 2])
+    batch.reset("half_half")
+    rec = ChunkedNpzRecorder(tmp_path / "batch.npz", chunk_rows=10, compress=False)
+    with batch.run(25, discard=5, recorder=rec) as btraj:
+        assert btraj.shape == (20, 2, 16)
+        assert np.array_equal(btraj[-1], batch.x)
+
+
+test_chunked_recorder_dtype_and_lazy_slices()
+
+
+def test_persistence_streams_over_chunked_trajectory(tmp_path: Path = Path("test_analysis")):
+    cfg = Config(N=48, eps=0.7, mu=1.9, seed=2)
+    ref = _tracked(cfg, 300, 20)
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset(init="half_half")
+    with sys.run(300, discard=20, recorder=ChunkedNpzRecorder(tmp_path / "p.npz", chunk_rows=64)) as traj:
+        assert np.allclose(persistence_curve(traj), persistence_curve(spins(ref)))
+
+
+test_persistence_streams_over_chunked_trajectory()
+
+
+def test_npy_recorder_truncates_after_early_stop(tmp_path: Path = Path("test_analysis")):
+    import pytest
+
+    from gcm.observers import StopCriteria
+    from gcm.recorders import TrajectoryRecorder
+
+    with pytest.raises(TypeError):
+        TrajectoryRecorder(tmp_path / "x.npy")
+
+    # ε=1.1 sincroniza (μ=1.9): a parada acontece bem antes de T
+    cfg = Config(N=128, eps=1.1, mu=1.9, seed=1)
+    ref = _tracked(cfg, 1000, 5)
+    sys = GloballyCoupledMaps(cfg)
+    sys.reset(init="half_half")
+    traj = sys.run(1000, discard=5, recorder=NpyRecorder(tmp_path / "stop.npy"), stop=StopCriteria(patience=5))
+    n = sys.last_run_steps - 5
+    assert n < 995 and traj.shape == (n, 128)
+    loaded = np.load(tmp_path / "stop.npy")
+    assert loaded.shape == (n, 128) and np.array_equal(loaded, ref[:n])
+    assert (tmp_path / "stop.npy").stat().st_size < 995 * 128 * 8
+
+
+test_npy_recorder_truncates_after_early_stop()
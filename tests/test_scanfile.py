@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gcm.analysis import scan_eps
+from gcm.scanfile import load_scan, read_scan_columns, save_scan
+
+
+def test_scanfile_roundtrip_append_and_column_selection(tmp_path: Path = Path("test_analysis")):
+    path = tmp_path / "scan_mu1.9.scan"
+    kw = dict(T_burn=30, T_meas=30, seed_base=5)
+    res = scan_eps(1.9, np.linspace(0.1, 0.9, 5), 64, **kw)
+
+    save_scan(res, path)
+    back = load_scan(path)
+    assert back.mu == res.mu and back.meta["n_parts"] == 1
+    assert np.array_equal(back.eps_grid, res.eps_grid)
+    assert back.sigma_mean.dtype == res.sigma_mean.dtype
+    assert np.array_equal(back.sigma_mean, res.sigma_mean)
+    assert np.array_equal(back.escaped_frac, res.escaped_frac)
+    assert np.array_equal(back.is_synced, res.is_synced)
+    for key in ("seeds", "stop_reason", "steps_run", "N", "T_meas"):
+        assert back.meta[key] == res.meta[key]
+
+    # bloco ε intercalado do mesmo μ e um bloco de outro μ no mesmo diretório
+    more = scan_eps(1.9, np.linspace(0.2, 1.0, 5), 64, **kw)
+    other = scan_eps(1.5, np.linspace(0.1, 0.9, 5), 64, **kw)
+    save_scan(more, path, append=True)
+    save_scan(other, path, append=True)
+    with pytest.raises(ValueError):
+        load_scan(path)
+    merged = load_scan(path, columns=["sigma_mean"], mu=1.9)
+    assert merged.meta["n_parts"] == 3
+    assert np.all(np.diff(merged.eps_grid) >= 0) and merged.eps_grid.size == 10
+    assert merged.escaped_frac is None and merged.is_synced is None
+    expected = dict(zip(np.r_[res.eps_grid, more.eps_grid], np.r_[res.sigma_mean, more.sigma_mean]))
+    assert np.allclose(merged.sigma_mean, [expected[e] for e in merged.eps_grid])
+
+    cols = read_scan_columns(path, ["mu", "stop_reason"])
+    assert cols["mu"].size == 15
+    assert cols["stop_reason"].tolist() == res.meta["stop_reason"] + more.meta["stop_reason"] + other.meta["stop_reason"]
+
+    save_scan(other, path)  # sem append: substitui as partes
+    assert load_scan(path).meta["n_parts"] == 1
+
+
+test_scanfile_roundtrip_append_and_column_selection()
+
+
+def test_scanfile_seeds_stay_exact_across_parts(tmp_path: Path = Path("test_analysis")):
+    path = tmp_path / "seeds.scan"
+    kw = dict(T_burn=10, T_meas=10)
+    # sementes dos dois lados de 2**63 (antes: int64 + uint64 → float64)
+    low = scan_eps(1.9, [0.5], 32, seed_base=2, **kw)
+    high = scan_eps(1.9, [0.6], 32, seed_base=0, **kw)
+    assert low.meta["seeds"][0] < 2**63 <= high.meta["seeds"][0]
+    save_scan(low, path)
+    save_scan(high, path, append=True)
+
+    assert read_scan_columns(path, ["seeds"])["seeds"].dtype == np.uint64
+    back = load_scan(path)
+    assert back.meta["seeds"] == low.meta["seeds"] + high.meta["seeds"]
+    assert all(type(s) is int for s in back.meta["seeds"])
+
+
+test_scanfile_seeds_stay_exact_across_parts()
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import numpy as np
+
+from gcm.analysis import phase_diagram, ramp, scan_eps
+from gcm.core import Config
+from gcm.store import ResultsStore, result_key
+
+
+def test_result_key_depends_on_config_protocol_and_params():
+    cfg = Config(N=64, eps=0.3, mu=1.9, seed=1)
+    params = dict(T_burn=10, T_meas=10, init="half_half")
+    k = result_key("scan_eps_point", cfg, params)
+    assert k == result_key("scan_eps_point", Config(N=64, eps=0.3, mu=1.9, seed=1), dict(params))
+    assert k != result_key("scan_eps_point", Config(N=64, eps=0.3, mu=1.9, seed=2), params)
+    assert k != result_key("scan_eps_point", cfg, dict(params, T_meas=11))
+    assert k != result_key("phase_point", cfg, params)
+    assert k != result_key("scan_eps_point", cfg, params, version="0.0.0")
+
+
+test_result_key_depends_on_config_protocol_and_params()
+
+
+def test_scan_eps_reuses_cached_points_and_query(tmp_path: Path = Path("test_analysis")):
+    db = tmp_path / "results.sqlite"
+    db.unlink(missing_ok=True)
+    kw = dict(T_burn=50, T_meas=50, seed_base=7)
+    grid = np.linspace(0.1, 0.9, 5)
+
+    fresh = scan_eps(1.9, grid, 64, store=db, **kw)
+    assert fresh.meta["store_hits"] == 0
+    cached = scan_eps(1.9, grid, 64, store=db, **kw)
+    assert cached.meta["store_hits"] == 5
+    assert np.array_equal(cached.sigma_mean, fresh.sigma_mean)
+    assert np.array_equal(cached.escaped_frac, fresh.escaped_frac)
+    assert cached.meta["stop_reason"] == fresh.meta["stop_reason"]
+
+    with ResultsStore(db) as st:
+        scan_eps(1.9, grid, 256, store=st, **kw)
+        scan_eps(1.5, grid, 256, store=st, **kw)
+        assert len(st) == 15
+        rows = st.query("scan_eps_point", mu=1.9, N=(128, None))
+        assert len(rows) == 5 and all(r["N"] == 256 for r in rows)
+        assert len(st.query(T_meas=50, eps=(0.5, None))) == 9
+        assert st.query(T_meas=51) == []
+
+
+test_scan_eps_reuses_cached_points_and_query()
+
+
+def test_refined_grid_reuses_cached_points():
+    st = ResultsStore(":memory:")
+    kw = dict(T_burn=30, T_meas=30, seed_base=7, store=st)
+    coarse = scan_eps(1.9, np.linspace(0.1, 0.9, 5), 32, **kw)
+    fine = scan_eps(1.9, np.linspace(0.1, 0.9, 9), 32, **kw)
+    # a semente depende de (seed_base, μ, ε), não da posição na grade
+    assert fine.meta["store_hits"] == 5
+    assert np.array_equal(fine.sigma_mean[::2], coarse.sigma_mean)
+    assert fine.meta["seeds"][::2] == coarse.meta["seeds"]
+
+    rows = phase_diagram([1.5, 1.9], [0.1, 0.9], 32, **kw)
+    again = phase_diagram([1.5, 1.7, 1.9], [0.1, 0.5, 0.9], 32, **kw)
+    assert (rows.meta["store_hits"], again.meta["store_hits"]) == (0, 4)
+    st.close()
+
+
+test_refined_grid_reuses_cached_points()
+
+
+def test_phase_diagram_and_ramp_cache():
+    st = ResultsStore(":memory:")
+    kw = dict(T_burn=30, T_meas=30, seed_base=3, store=st)
+    part = phase_diagram([1.5, 1.9], [0.2, 0.8], 32, **kw)
+    full = phase_diagram([1.5, 1.9], [0.2, 0.5, 0.8], 32, seed_base=None, T_burn=30, T_meas=30)
+    assert full.meta["store_hits"] == 0
+    again = phase_diagram([1.5, 1.9], [0.2, 0.8], 32, **kw)
+    assert again.meta["store_hits"] == 4
+    assert np.array_equal(again.codes, part.codes)
+    assert np.array_equal(again.sigma_mean, part.sigma_mean)
+
+    r1 = ramp(1.9, np.linspace(0.2, 0.6, 3), 32, T_burn_block=10, T_meas_block=10, store=st)
+    r2 = ramp(1.9, np.linspace(0.2, 0.6, 3), 32, T_burn_block=10, T_meas_block=10, store=st)
+    assert (r1.meta["store_hits"], r2.meta["store_hits"]) == (0, 1)
+    for k in r1.up:
+        assert np.array_equal(r1.up[k], r2.up[k]) and np.array_equal(r1.down[k], r2.down[k])
+    st.close()
+
+
+test_phase_diagram_and_ramp_cache()